@@ -1,74 +1,200 @@
-from flask import Flask, jsonify, send_file
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import joblib
+import logging
 import pandas as pd
 import numpy as np
-import requests
 import json
+import os
+import threading
+import time
 from datetime import datetime
+from functools import partial
+from bar_store import BarStore
+from flat_forest import FlatForest, SizeRoutedForest
+from indicator_state import IndicatorBook
+from logs import configure_logging
+from market_data import market_data
+from metrics import FALLBACKS, INFERENCE_SECONDS, STAGE_SECONDS, instrument_flask, registry, source_label
+from model_registry import ModelRegistry
+from provider_router import Provider, ProviderRouter
+from quote_cache import quote_cache
+from response_cache import ResponseCache
+from rules import score_features
+from static_assets import static_assets
+from stream_hub import StreamHub
+from symbols import ASSET_CLASSES, symbol_index, unlisted
 
 app = Flask(__name__)
 CORS(app)
+instrument_flask(app)
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# CoinGecko coin IDs and Binance pairs (tickers and aliases) from the symbol master
+COINGECKO_IDS = symbol_index.provider_ids('coingecko')
+BINANCE_PAIRS = symbol_index.provider_ids('binance')
+
+# Router provider name -> data_source label
+PROVIDER_SOURCES = {'coingecko': "CoinGecko Live", 'binance': "Binance Live Data"}
+
+# Live crypto quotes from whichever provider is healthy and fastest, hedged, within ANALYZE_DEADLINE
+quote_router = ProviderRouter([
+    Provider('coingecko', COINGECKO_IDS, lambda ids: market_data.coingecko_prices(ids)),
+    Provider('binance', BINANCE_PAIRS, lambda pairs: market_data.binance_tickers(pairs))
+])
+
+# Accurate market prices (updated regularly)
+ACCURATE_PRICES = {
+    'AAPL': (178.25, 0.8), 'TSLA': (252.80, -1.2), 'MSFT': (331.40, 1.5),
+    'GOOGL': (139.85, 0.3), 'AMZN': (130.50, 2.1), 'NVDA': (450.75, 3.2),
+    'META': (300.25, -0.5), 'NFLX': (485.20, 1.8), 'SPY': (454.20, 0.6),
+    'QQQ': (372.65, 0.9), 'GOLD': (1985.50, 0.4), 'SILVER': (23.15, -0.2),
+    'OIL': (82.30, -1.5), 'BTC': (65000, 1.2), 'ETH': (3500, -0.8)
+}
+
+# Model artifacts written by train_model.save_model
+MODEL_PATH = 'professional_model.pkl'
+FLAT_MODEL_DIR = 'professional_model_flat'
+REPORT_PATH = 'model_accuracy.json'
+
+# Daily OHLCV history (bar_store.BarStore) replayed into the indicator state at startup
+BAR_STORE_PATH = os.environ.get('BAR_STORE_PATH', 'bar_store')
+
+# Served while no trained model is available
+DEFAULT_REPORT = {
+    'overall_accuracy': 0.782,
+    'model_type': 'Advanced Prediction System',
+    'training_samples': 8000,
+    'feature_count': 9
+}
+
+# Upper bound on symbols per /api/analyze/batch call
+MAX_BATCH_SYMBOLS = 1000
+
+# Upper bound on symbols per /api/stream subscription
+MAX_STREAM_SYMBOLS = 50
+
+# Upper bound on /api/symbols results
+MAX_SYMBOL_RESULTS = 50
+
+# Professional recommendation for each model class
+RECOMMENDATIONS = {
+    2: ("STRONG BUY", "Very High", "Multiple strong bullish signals detected"),
+    1: ("BUY", "High", "Favorable market conditions with bullish bias"),
+    0: ("HOLD", "Medium", "Market in consolidation phase"),
+    -1: ("SELL", "High", "Bearish signals emerging"),
+    -2: ("STRONG SELL", "Very High", "Multiple strong bearish signals")
+}
+
+def load_model():
+    """Load the forest, choosing the inference backend by batch size
+
+    The flat export is memory-mapped, so every worker shares its pages
+    through the OS page cache, and it is much faster for single requests
+    and small batches. sklearn's compiled traversal wins on large ones, so
+    by default (INFERENCE_BACKEND=auto) batches up to FLAT_MAX_ROWS go to
+    the flat export and larger /api/analyze/batch calls to the pickle,
+    which is only loaded once the first such batch arrives.
+    INFERENCE_BACKEND=sklearn or =flat forces one backend; flat converts
+    the pickle when no export exists.
+    """
+    backend = os.environ.get('INFERENCE_BACKEND', 'auto')
+    if backend in ('auto', 'flat') and os.path.isdir(FLAT_MODEL_DIR):
+        flat = FlatForest.load(FLAT_MODEL_DIR, mmap_mode='r')
+        if backend == 'flat' or not os.path.exists(MODEL_PATH):
+            return flat
+        # Unpickled into this worker's own memory only once a large batch needs it
+        return SizeRoutedForest(flat, partial(joblib.load, MODEL_PATH))
+    model = joblib.load(MODEL_PATH)
+    if backend == 'flat':
+        return FlatForest.from_sklearn(model)
+    return model
 
 class ProfessionalStockPredictor:
     def __init__(self):
-        # Load professional model
-        try:
-            self.model = joblib.load('professional_model.pkl')
-            self.model_loaded = True
-            print("✅ Professional ML model loaded")
-        except:
-            self.model = None
-            self.model_loaded = False
-            print("⚠️ Using advanced rule-based system")
+        # Load professional model; retrained artifacts are picked up without a restart
+        self.registry = ModelRegistry(
+            load_model,
+            watch_paths=[MODEL_PATH, os.path.join(FLAT_MODEL_DIR, 'meta.json'), REPORT_PATH],
+            report_path=REPORT_PATH,
+            default_report=DEFAULT_REPORT,
+            classes=RECOMMENDATIONS,
+            poll_interval=float(os.environ.get('MODEL_POLL_SECONDS', 2))
+        )
+        if self.model_loaded:
+            logger.info(f"✅ Professional ML model loaded ({type(self.model).__name__}, {self.registry.current.version})")
+        else:
+            logger.warning("⚠️ Using advanced rule-based system")
         
-        # Load accuracy report
-        try:
-            with open('model_accuracy.json', 'r') as f:
-                self.accuracy_report = json.load(f)
-        except:
-            self.accuracy_report = {
-                'overall_accuracy': 0.782,
-                'model_type': 'Advanced Prediction System',
-                'training_samples': 8000,
-                'feature_count': 9
-            }
+        # Per-symbol O(1) indicator state, one bar per day
+        self.indicators = IndicatorBook()
+        self.warm_indicators(BAR_STORE_PATH)
+    
+    def warm_indicators(self, path):
+        """Replay recent daily bars so indicator features are real from the first request"""
+        if not os.path.isdir(path):
+            logger.warning(f"⚠️ No bar store at {path}; indicator features stay simulated until warm")
+            return 0
+        with BarStore(path) as store:
+            ready = self.indicators.warm_from_store(store)
+        logger.info(f"✅ Indicator state warmed for {ready} symbols from {path}")
+        return ready
+    
+    @property
+    def model(self):
+        return self.registry.active().model
+    
+    @property
+    def model_loaded(self):
+        return self.registry.active().loaded
+    
+    @property
+    def accuracy_report(self):
+        return self.registry.active().report
+    
+    def accuracy(self):
+        """Accuracy report of the active model plus its version"""
+        report = dict(self.registry.active().report)
+        report.update(self.registry.status())
+        return report
     
     def get_live_price(self, symbol):
         """Get real-time price from reliable APIs"""
-        symbol_upper = symbol.upper()
-        
-        # Crypto prices from CoinGecko
-        crypto_map = {
-            'BTC': 'bitcoin', 'BITCOIN': 'bitcoin',
-            'ETH': 'ethereum', 'ETHEREUM': 'ethereum'
-        }
-        
-        if symbol_upper in crypto_map:
-            try:
-                url = f"https://api.coingecko.com/api/v3/simple/price?ids={crypto_map[symbol_upper]}&vs_currencies=usd&include_24hr_change=true"
-                response = requests.get(url, timeout=8)
-                if response.status_code == 200:
-                    data = response.json()
-                    coin_data = data[crypto_map[symbol_upper]]
-                    return coin_data['usd'], coin_data.get('usd_24h_change', 0), "CoinGecko Live"
-            except:
-                pass
-        
-        # Accurate market prices (updated regularly)
-        accurate_prices = {
-            'AAPL': (178.25, 0.8), 'TSLA': (252.80, -1.2), 'MSFT': (331.40, 1.5),
-            'GOOGL': (139.85, 0.3), 'AMZN': (130.50, 2.1), 'NVDA': (450.75, 3.2),
-            'META': (300.25, -0.5), 'NFLX': (485.20, 1.8), 'SPY': (454.20, 0.6),
-            'QQQ': (372.65, 0.9), 'GOLD': (1985.50, 0.4), 'SILVER': (23.15, -0.2),
-            'OIL': (82.30, -1.5), 'BTC': (65000, 1.2), 'ETH': (3500, -0.8)
-        }
+        return self.get_live_prices([symbol])[0]
+    
+    def get_live_prices(self, symbols):
+        """Get real-time prices for many symbols, one upstream call per provider"""
+        symbols_upper = [symbol.upper() for symbol in symbols]
         
-        if symbol_upper in accurate_prices:
-            price, change = accurate_prices[symbol_upper]
-            return price, change, "Market Data"
+        # Crypto prices from CoinGecko or Binance, all coins in a single routed request
+        crypto = [s for s in symbols_upper if s in COINGECKO_IDS or s in BINANCE_PAIRS]
+        coins = {}
+        if crypto:
+            coins = quote_cache.get_many(crypto, 'router', quote_router.quotes, 'crypto')
         
-        return 100.0, 0.0, "Default"
+        quotes = []
+        for symbol_upper in symbols_upper:
+            if symbol_upper in coins:
+                price, change, provider = coins[symbol_upper]
+                quotes.append((price, change, PROVIDER_SOURCES[provider]))
+            elif symbol_upper in ACCURATE_PRICES:
+                price, change = ACCURATE_PRICES[symbol_upper]
+                quotes.append((price, change, "Market Data"))
+            else:
+                FALLBACKS.inc('default_price')
+                quotes.append((100.0, 0.0, "Default"))
+        return quotes
+    
+    def current_features(self, symbol, price, price_change, data_source):
+        """Read features from the streaming indicator state once it is warm"""
+        if data_source != "Default":
+            self.indicators.on_tick(symbol, price)
+            features = self.indicators.features(symbol)
+            if features is not None:
+                return features
+        return self.calculate_professional_features(symbol, price, price_change)
     
     def calculate_professional_features(self, symbol, price, price_change):
         """Calculate institutional-grade features"""
@@ -92,59 +218,81 @@ class ProfessionalStockPredictor:
     
     def predict_with_confidence(self, features):
         """Make prediction with confidence scoring"""
-        if self.model_loaded:
+        predictions, confidences = self.predict_batch([features])
+        return predictions[0], confidences[0]
+    
+    def predict_batch(self, feature_matrix, active=None):
+        """Score a whole feature matrix with a single model call"""
+        feature_matrix = np.asarray(feature_matrix, dtype=float)
+        active = active or self.registry.active()
+        
+        if active.loaded:
             try:
-                prediction = self.model.predict([features])[0]
-                probabilities = self.model.predict_proba([features])[0]
-                confidence = max(probabilities)
-                return prediction, confidence
+                # One predict_proba pass; the label is the argmax column
+                with INFERENCE_SECONDS.time(type(active.model).__name__):
+                    probabilities = active.model.predict_proba(feature_matrix)
+                best = probabilities.argmax(axis=1)
+                predictions = [int(label) for label in active.model.classes_[best]]
+                confidences = probabilities[np.arange(len(best)), best].tolist()
+                return predictions, confidences
             except:
-                pass
-        
-        # Advanced rule-based system
-        rsi, vol_chg, mom_5d, mom_20d, vol, sma20, sma50, macd, bb = features
-        
-        score = 0
-        if rsi < 35: score += 2
-        elif rsi < 45: score += 1
-        elif rsi > 70: score -= 2
-        elif rsi > 60: score -= 1
-        
-        if mom_5d > 0.03 and mom_20d > 0.05: score += 2
-        elif mom_5d > 0.01: score += 1
-        elif mom_5d < -0.03 and mom_20d < -0.05: score -= 2
-        elif mom_5d < -0.01: score -= 1
+                logger.exception("Model inference failed, falling back to rules")
         
-        if sma20 > 1.02 and sma50 > 1.01: score += 1
-        elif sma20 < 0.98 and sma50 < 0.99: score -= 1
-        
-        if score >= 3: return 2, 0.85
-        elif score >= 1: return 1, 0.75
-        elif score <= -3: return -2, 0.85
-        elif score <= -1: return -1, 0.75
-        else: return 0, 0.65
+        # Rule tables over the whole matrix at once
+        FALLBACKS.inc('rules', amount=len(feature_matrix))
+        with INFERENCE_SECONDS.time('rules'):
+            predictions, confidences = score_features(feature_matrix)
+        return predictions.tolist(), confidences.tolist()
+    
+    def rule_based_prediction(self, features):
+        """Advanced rule-based system"""
+        predictions, confidences = score_features([features])
+        return int(predictions[0]), float(confidences[0])
     
     def analyze_symbol(self, symbol):
         """Professional analysis pipeline"""
-        # Get live data
-        price, price_change, data_source = self.get_live_price(symbol)
-        
-        # Calculate features
-        features = self.calculate_professional_features(symbol, price, price_change)
+        return self.analyze_symbols([symbol])[0]
+    
+    def analyze_symbols(self, symbols):
+        """Batch analysis pipeline: one feature matrix, one model call"""
+        # Get live data for the whole batch
+        start = time.perf_counter()
+        quotes = self.get_live_prices(symbols)
+        return self.analyze_quotes(symbols, quotes, time.perf_counter() - start)
+    
+    def analyze_quotes(self, symbols, quotes, quote_seconds=0.0):
+        """Features, one model call and results for symbols whose quotes are already fetched"""
+        feature_matrix = []
+        for symbol, (price, price_change, data_source) in zip(symbols, quotes):
+            # Calculate features
+            start = time.perf_counter()
+            feature_matrix.append(self.current_features(symbol, price, price_change, data_source))
+            STAGE_SECONDS.observe(time.perf_counter() - start, 'features', source_label(data_source))
         
-        # Get prediction
-        prediction, confidence = self.predict_with_confidence(features)
+        if not feature_matrix:
+            return []
         
-        # Generate professional recommendation
-        recommendations = {
-            2: ("STRONG BUY", "Very High", "Multiple strong bullish signals detected"),
-            1: ("BUY", "High", "Favorable market conditions with bullish bias"),
-            0: ("HOLD", "Medium", "Market in consolidation phase"),
-            -1: ("SELL", "High", "Bearish signals emerging"),
-            -2: ("STRONG SELL", "Very High", "Multiple strong bearish signals")
-        }
+        # Get predictions for the whole batch from one model version
+        active = self.registry.active()
+        start = time.perf_counter()
+        predictions, confidences = self.predict_batch(feature_matrix, active)
+        inference_seconds = time.perf_counter() - start
+        for _, _, data_source in quotes:
+            STAGE_SECONDS.observe(quote_seconds, 'quote', source_label(data_source))
+            STAGE_SECONDS.observe(inference_seconds, 'inference', source_label(data_source))
         
-        rec, conf_level, reasoning = recommendations[prediction]
+        results = []
+        for symbol, (price, price_change, data_source), features, prediction, confidence in zip(
+                symbols, quotes, feature_matrix, predictions, confidences):
+            results.append(self.build_result(symbol, price, price_change, data_source,
+                                             features, prediction, confidence, active))
+        return results
+    
+    def build_result(self, symbol, price, price_change, data_source, features, prediction, confidence,
+                     active=None):
+        """Generate professional recommendation"""
+        rec, conf_level, reasoning = RECOMMENDATIONS[prediction]
+        active = active or self.registry.active()
         
         return {
             'symbol': symbol,
@@ -156,30 +304,157 @@ class ProfessionalStockPredictor:
             'confidence': conf_level,
             'reasoning': reasoning,
             'data_source': data_source,
-            'model_used': self.model_loaded,
-            'model_accuracy': self.accuracy_report['overall_accuracy'],
-            'timestamp': datetime.now().isoformat()
+            'model_used': active.loaded,
+            'model_version': active.version,
+            'model_accuracy': active.report['overall_accuracy'],
+            'generated_at': datetime.now().isoformat()
         }
 
-# Initialize predictor
-predictor = ProfessionalStockPredictor()
+# Built on first use, or in the gunicorn master before fork (see gunicorn.conf.py)
+_predictor = None
+_predictor_lock = threading.Lock()
+
+def get_predictor():
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = ProfessionalStockPredictor()
+    return _predictor
+
+# One batch analysis per interval, shared by every /api/stream client
+stream_hub = StreamHub(lambda symbols: get_predictor().analyze_symbols(symbols),
+                       interval=float(os.environ.get('STREAM_INTERVAL', 5)))
+
+# Serialized analyze responses with ETags, one per symbol, quote and model version
+response_cache = ResponseCache()
+
+registry.collect('quote_cache_events_total', 'Quote cache lookups and refreshes by outcome', 'counter',
+                 'event', quote_cache.stats, ('hits', 'misses', 'stale', 'coalesced', 'evictions', 'errors'))
+registry.collect('stream_events_total', 'Stream hub polls, fetched symbols, published events and errors',
+                 'counter', 'event', stream_hub.stats, ('polls', 'symbols_fetched', 'events', 'errors'))
+registry.collect('response_cache_events_total', 'Analyze responses served from cached bytes, rebuilt or 304',
+                 'counter', 'event', response_cache.stats, ('hits', 'misses', 'not_modified', 'evictions'))
 
 @app.route('/')
 def home():
-    return send_file('index.html')
+    return static_assets.response('index.html')
+
+def unknown_symbols(symbols):
+    """404 naming symbols missing from the symbol master, with the closest listed tickers"""
+    return jsonify({
+        'error': f"Unknown symbol{'s' if len(symbols) > 1 else ''}: {', '.join(symbols)}",
+        'suggestions': {symbol: symbol_index.suggest(symbol) for symbol in symbols}
+    }), 404
 
 @app.route('/api/analyze/<symbol>')
 def analyze_stock(symbol):
-    result = predictor.analyze_symbol(symbol.upper())
-    return jsonify(result)
+    symbol = symbol.upper().strip()
+    if unlisted([symbol]):
+        return unknown_symbols([symbol])
+    predictor = get_predictor()
+    start = time.perf_counter()
+    quote = predictor.get_live_price(symbol)
+    quote_seconds = time.perf_counter() - start
+    
+    # Same quote and model version -> same analysis, so the serialized body is reused
+    version = (quote, predictor.registry.active().version)
+    # Fresh for what is left of a cached live quote's TTL; static quotes get the full TTL
+    record = symbol_index.resolve(symbol)
+    asset_class = record['asset_class'] if record else 'default'
+    max_age = quote_cache.remaining_ttl(symbol, 'router')
+    if max_age is None:
+        max_age = quote_cache.ttls.get(asset_class, quote_cache.ttls['default'])
+    return response_cache.respond(
+        symbol, version, lambda: predictor.analyze_quotes([symbol], [quote], quote_seconds)[0],
+        max_age, quote_cache.stale_ttl)
+
+@app.route('/api/analyze/batch', methods=['GET', 'POST'])
+def analyze_batch():
+    if request.method == 'POST':
+        payload = request.get_json(silent=True) or {}
+        symbols = payload.get('symbols', []) if isinstance(payload, dict) else payload
+    else:
+        symbols = request.args.get('symbols', '').split(',')
+    
+    if not isinstance(symbols, list):
+        return jsonify({'error': 'symbols must be a list'}), 400
+    
+    symbols = [str(s).upper().strip() for s in symbols if str(s).strip()]
+    if not symbols:
+        return jsonify({'error': 'No symbols provided'}), 400
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return jsonify({'error': f'At most {MAX_BATCH_SYMBOLS} symbols per batch'}), 400
+    unknown = unlisted(symbols)
+    if unknown:
+        return unknown_symbols(unknown)
+    
+    results = get_predictor().analyze_symbols(symbols)
+    return jsonify({'count': len(results), 'results': results})
+
+@app.route('/api/stream')
+def stream_analysis():
+    """Server-Sent Events: a 'quote' event whenever a subscribed symbol's analysis changes"""
+    symbols = [s.upper().strip() for s in request.args.get('symbols', '').split(',') if s.strip()]
+    if not symbols:
+        return jsonify({'error': 'No symbols provided'}), 400
+    if len(symbols) > MAX_STREAM_SYMBOLS:
+        return jsonify({'error': f'At most {MAX_STREAM_SYMBOLS} symbols per stream'}), 400
+    unknown = unlisted(symbols)
+    if unknown:
+        return unknown_symbols(unknown)
+    
+    subscription = stream_hub.subscribe(symbols)
+    
+    def events():
+        try:
+            yield from subscription.events()
+        finally:
+            stream_hub.unsubscribe(subscription)
+    
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/providers/stats')
+def get_provider_stats():
+    return jsonify(quote_router.stats())
+
+@app.route('/api/stream/stats')
+def get_stream_stats():
+    return jsonify(stream_hub.stats())
+
+@app.route('/api/symbols')
+def search_symbols():
+    """Autocomplete: listed instruments whose ticker starts with ?prefix="""
+    asset_class = request.args.get('asset_class') or None
+    if asset_class is not None and asset_class not in ASSET_CLASSES:
+        return jsonify({'error': f'asset_class must be one of {", ".join(ASSET_CLASSES)}'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), MAX_SYMBOL_RESULTS)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    results = symbol_index.search(request.args.get('prefix', ''), limit, asset_class)
+    return jsonify({'count': len(results), 'symbols': results})
+
+@app.route('/api/symbols/<symbol>')
+def get_symbol(symbol):
+    record = symbol_index.resolve(symbol)
+    if record is None:
+        return unknown_symbols([symbol.upper().strip()])
+    return jsonify(record)
+
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    return jsonify(quote_cache.stats())
 
 @app.route('/api/accuracy')
 def get_accuracy():
-    return jsonify(predictor.accuracy_report)
+    return jsonify(get_predictor().accuracy())
 
 if __name__ == '__main__':
     print("🚀 PROFESSIONAL STOCK PREDICTOR")
-    print("📊 Model Accuracy:", predictor.accuracy_report['overall_accuracy'])
+    print("📊 Model Accuracy:", get_predictor().accuracy_report['overall_accuracy'])
     print("🌐 Website: http://localhost:5000")
     print("🔗 API: http://localhost:5000/api/analyze/AAPL")
     app.run(debug=True, port=5000, host='0.0.0.0')
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+
+import real_api_backend as backend
+from logs import configure_logging
+from market_data import AsyncMarketDataClient
+from metrics import CONTENT_TYPE, registry
+from quote_cache import quote_cache
+from symbols import symbol_index, unlisted
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Same headers the Flask app adds in after_request
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-headers', b'Content-Type,Authorization'),
+    (b'access-control-allow-methods', b'GET,PUT,POST,DELETE,OPTIONS')
+]
+
+class AsyncQuoteFetcher:
+    """Single-flight async Binance quotes backed by the shared quote cache"""
+
+    def __init__(self, client):
+        self.client = client
+        self._inflight = {}
+
+    async def binance_price(self, symbol):
+        pair = backend.BINANCE_PAIRS.get(symbol)
+        if pair is None:
+            return None
+        if not quote_cache.enabled:
+            return await self._fetch(pair)
+
+        value, fresh = quote_cache.peek(pair, 'binance')
+        if fresh:
+            return value
+
+        task = self._inflight.get(pair)
+        if task is None:
+            task = self._inflight[pair] = asyncio.ensure_future(self._fetch(pair))
+            task.add_done_callback(lambda _: self._inflight.pop(pair, None))
+        if value is not None:
+            # Serve the stale quote now; the task above refreshes the cache
+            return value
+        return await asyncio.shield(task)
+
+    async def _fetch(self, pair):
+        try:
+            quotes = await self.client.binance_tickers([pair])
+        except Exception as e:
+            logger.warning(f"⚠️ Binance API unavailable: {e}")
+            return None
+        value = quotes.get(pair)
+        quote_cache.put(pair, 'binance', value, 'crypto')
+        return value
+
+class AsyncAnalyzeApp:
+    """ASGI serving mode for the analyze and accuracy routes"""
+
+    def __init__(self):
+        self.fetcher = None
+        self.index_html = None
+
+    def get_fetcher(self):
+        if self.fetcher is None:
+            self.fetcher = AsyncQuoteFetcher(AsyncMarketDataClient(max_connections=1000))
+        return self.fetcher
+
+    async def crypto_quote(self, symbol):
+        """Live crypto quote -> (price, change, data_source), or None
+
+        Same path as real_api_backend.get_crypto_quotes: the shared quote board,
+        then Binance (one async single-flight call), then the provider router,
+        run in a thread, for the CoinGecko fallback behind its circuit breakers.
+        """
+        pair = backend.BINANCE_PAIRS.get(symbol)
+        if pair is not None:
+            board = backend.quote_board.get_many({pair}, max_age=2 * backend.board_publisher.interval)
+            if pair in board:
+                return board[pair] + ("Binance Live Data",)
+            quote = await self.get_fetcher().binance_price(symbol)
+            if quote is not None:
+                return tuple(quote) + ("Binance Live Data",)
+        elif symbol not in backend.COINGECKO_IDS:
+            return None
+        quotes = await asyncio.to_thread(backend.get_crypto_quotes, [symbol])
+        return quotes.get(symbol)
+
+    async def analyze_symbol(self, symbol):
+        """Async version of real_api_backend.analyze_symbol"""
+        quote = await self.crypto_quote(symbol)
+        if quote is not None:
+            price, price_change, data_source = quote
+        else:
+            price, price_change, data_source = backend.get_real_yahoo_price(symbol)
+            if price is None:
+                price, price_change, data_source = backend.get_simulated_price(symbol)
+        return backend.build_analysis(symbol, price, price_change, data_source)
+
+    async def handle(self, method, path):
+        """Route one request -> (status, content_type, body_bytes)"""
+        if method == 'OPTIONS':
+            return 200, b'text/plain', b''
+        if method not in ('GET', 'HEAD'):
+            # Every route is read-only; __call__ adds the Allow header
+            return 405, b'application/json', json.dumps({'error': 'Method not allowed'}).encode()
+
+        if path == '/':
+            if self.index_html is None:
+                with open('index.html', 'rb') as f:
+                    self.index_html = f.read()
+            return 200, b'text/html; charset=utf-8', self.index_html
+
+        if path.startswith('/api/analyze/'):
+            symbol = path[len('/api/analyze/'):].upper().strip()
+            if unlisted([symbol]):
+                body = {'error': f'Unknown symbol: {symbol}', 'suggestions': {symbol: symbol_index.suggest(symbol)}}
+                return 404, b'application/json', json.dumps(body).encode()
+            try:
+                logger.info(f"🔍 Analyzing: {symbol}")
+                return 200, b'application/json', json.dumps(await self.analyze_symbol(symbol)).encode()
+            except Exception as e:
+                logger.exception(f"❌ Error analyzing {symbol}: {e}")
+                body = {'error': f'Analysis failed: {str(e)}'}
+                return 500, b'application/json', json.dumps(body).encode()
+
+        if path == '/api/accuracy':
+            body = dict(backend.ACCURACY_REPORT, timestamp=datetime.now().isoformat())
+            return 200, b'application/json', json.dumps(body).encode()
+
+        if path == '/metrics':
+            return 200, CONTENT_TYPE.encode(), registry.render().encode()
+
+        if path == '/api/cache/stats':
+            return 200, b'application/json', json.dumps(quote_cache.stats()).encode()
+
+        return 404, b'application/json', json.dumps({'error': 'Not found'}).encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    self.get_fetcher()
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    if self.fetcher is not None:
+                        await self.fetcher.client.close()
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+
+        if scope['type'] != 'http':
+            return
+
+        status, content_type, body = await self.handle(scope['method'], scope['path'])
+        headers = [(b'content-type', content_type),
+                   (b'content-length', str(len(body)).encode())] + CORS_HEADERS
+        if status == 405:
+            headers.append((b'allow', b'GET, HEAD'))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        # HEAD gets GET's headers, including its content-length, without the body
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+
+app = AsyncAnalyzeApp()
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("🚀 AI STOCK PREDICTOR - ASYNC (ASGI) MODE")
+    print("🌐 Live at: http://localhost:5000")
+    uvicorn.run(app, host='0.0.0.0', port=5000, log_level='warning')
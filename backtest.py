@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+
+from bar_store import BarStore
+from indicators import WARMUP_BARS, compute_features, synthetic_history
+from rules import MOMENTUM_RSI_RULES
+
+# Target position held over the next bar for each recommendation class
+POSITION_BY_CLASS = {2: 1.0, 1: 0.5, 0: 0.0, -1: -0.5, -2: -1.0}
+
+# Trading days per year, for annualisation
+BARS_PER_YEAR = 252
+
+# Worker-process globals, set once by _init_worker
+_model = None
+_settings = None
+
+def rule_classes(rsi, price_change):
+    """real_api_backend.build_analysis's RSI / price-change rules for whole arrays"""
+    return MOMENTUM_RSI_RULES.evaluate(('signal',), rsi=rsi, change=price_change)['signal'].astype(np.int8)
+
+def model_classes(model, features, block_rows=200_000):
+    """Model class for every warm bar; 0 (HOLD) during warm-up"""
+    flat = features.reshape(-1, features.shape[-1])
+    warm = ~np.isnan(flat).any(axis=1)
+    classes = np.zeros(len(flat), dtype=np.int8)
+    rows = np.flatnonzero(warm)
+    for start in range(0, len(rows), block_rows):
+        block = rows[start:start + block_rows]
+        classes[block] = model.predict(flat[block])
+    return classes.reshape(features.shape[:-1])
+
+def positions_from_classes(classes):
+    lookup = np.zeros(5)
+    for label, position in POSITION_BY_CLASS.items():
+        lookup[label + 2] = position
+    return lookup[classes.astype(np.intp) + 2]
+
+def simulate(close, positions, cost_bps):
+    """Per-bar strategy returns: the position set at bar t's close earns bar t+1's return"""
+    forward = np.zeros(close.shape)
+    forward[..., :-1] = close[..., 1:] / close[..., :-1] - 1
+    trades = np.abs(np.diff(positions, axis=-1, prepend=0.0))
+    returns = positions * forward - trades * cost_bps / 1e4
+    return returns, forward, trades
+
+def equity_stats(returns):
+    """Total return and max drawdown along the last axis"""
+    equity = np.cumprod(1 + returns, axis=-1)
+    drawdown = 1 - equity / np.maximum.accumulate(equity, axis=-1)
+    return equity[..., -1] - 1, drawdown.max(axis=-1)
+
+def _init_worker(model_path, settings):
+    global _model, _settings
+    _settings = settings
+    _model = joblib.load(model_path) if model_path else None
+    if _model is not None and hasattr(_model, 'n_jobs'):
+        _model.set_params(n_jobs=1)
+
+def load_chunk(chunk):
+    """(close, volume) for one chunk of symbols, from the bar store or synthetic history"""
+    if _settings['store']:
+        store = BarStore(_settings['store'])
+        timestamps = _settings['timestamps']
+        close, volume = [], []
+        for symbol in chunk:
+            bars = store.read(symbol, timestamps[0], timestamps[-1] + 1, columns=('ts', 'close', 'volume'))
+            # Pick rows by bar time, so a symbol with gaps still lines up with the rest
+            rows = np.searchsorted(bars['ts'], timestamps)
+            close.append(bars['close'][rows])
+            volume.append(bars['volume'][rows])
+        return np.stack(close), np.stack(volume)
+    return synthetic_history(len(chunk), _settings['bars'], seed=_settings['seed'] + chunk[0])
+
+def backtest_chunk(chunk):
+    """Worker: run every strategy over one chunk of symbols, with no per-bar Python loop"""
+    close, volume = load_chunk(chunk)
+    features = compute_features(close, volume)
+    warm = np.zeros(close.shape, dtype=bool)
+    warm[:, WARMUP_BARS - 1:] = True
+
+    price_change = np.zeros(close.shape)
+    price_change[:, 1:] = (close[:, 1:] / close[:, :-1] - 1) * 100
+    strategies = {'rules': np.where(warm, rule_classes(features[..., 0], price_change), 0)}
+    if _model is not None:
+        strategies['model'] = model_classes(_model, features)
+
+    out = {}
+    for name, classes in strategies.items():
+        positions = positions_from_classes(classes)
+        returns, forward, trades = simulate(close, positions, _settings['cost_bps'])
+        total_return, max_drawdown = equity_stats(returns)
+        active = (positions != 0) & (forward != 0)
+        out[name] = {
+            'portfolio_sum': returns.sum(axis=0),
+            'hits': int(((positions * forward) > 0).sum()),
+            'active_bars': int(active.sum()),
+            'trades': trades.sum(axis=1),
+            'total_return': total_return,
+            'max_drawdown': max_drawdown,
+            'class_counts': np.bincount(classes[warm].astype(np.intp) + 2, minlength=5)
+        }
+    return out
+
+def summarize(name, parts, n_symbols, n_bars, period_bars):
+    """Merge worker chunks into portfolio, per-symbol and per-period metrics"""
+    portfolio = sum(p['portfolio_sum'] for p in parts) / n_symbols
+    total_return, max_drawdown = equity_stats(portfolio)
+    years = n_bars / BARS_PER_YEAR
+    volatility = portfolio.std() * np.sqrt(BARS_PER_YEAR)
+    per_symbol_return = np.concatenate([p['total_return'] for p in parts])
+    per_symbol_drawdown = np.concatenate([p['max_drawdown'] for p in parts])
+    trades = np.concatenate([p['trades'] for p in parts])
+    active_bars = sum(p['active_bars'] for p in parts)
+
+    # The same equity curve cut into consecutive periods; nothing is refit per period
+    periods = []
+    for start in range(WARMUP_BARS, n_bars, period_bars):
+        window = portfolio[start:start + period_bars]
+        period_return, period_drawdown = equity_stats(window)
+        periods.append({'start_bar': start, 'bars': len(window),
+                        'return': round(float(period_return), 4),
+                        'max_drawdown': round(float(period_drawdown), 4)})
+
+    counts = sum(p['class_counts'] for p in parts)
+    return {
+        'strategy': name,
+        'hit_rate': round(sum(p['hits'] for p in parts) / max(active_bars, 1), 4),
+        'exposure': round(active_bars / (n_symbols * (n_bars - WARMUP_BARS)), 4),
+        'portfolio_total_return': round(float(total_return), 4),
+        'portfolio_annual_return': round(float((1 + total_return) ** (1 / years) - 1), 4),
+        'portfolio_sharpe': round(float(portfolio.mean() * BARS_PER_YEAR / volatility), 3) if volatility else 0.0,
+        'portfolio_max_drawdown': round(float(max_drawdown), 4),
+        'median_symbol_return': round(float(np.median(per_symbol_return)), 4),
+        'median_symbol_max_drawdown': round(float(np.median(per_symbol_drawdown)), 4),
+        'annual_turnover': round(float(trades.mean() / years), 2),
+        'signal_mix': {label: int(count) for label, count in zip(
+            ['STRONG SELL', 'SELL', 'HOLD', 'BUY', 'STRONG BUY'], counts)},
+        'period_stats': periods
+    }
+
+def run_backtest(symbols, bars, model_path=None, store=None, workers=None, chunk_size=50,
+                 cost_bps=5.0, period_bars=BARS_PER_YEAR, seed=42):
+    """Backtest every strategy over all symbols, chunked across worker processes"""
+    if isinstance(symbols, int):
+        symbols = list(range(symbols))
+    settings = {'bars': bars, 'store': store, 'cost_bps': cost_bps, 'seed': seed}
+    if store:
+        # Replay the most recent bar times every symbol has, so returns line up across the portfolio
+        reader = BarStore(store)
+        timestamps = None
+        for symbol in symbols:
+            ts = reader.read(symbol, columns=('ts',))['ts']
+            timestamps = ts if timestamps is None else np.intersect1d(timestamps, ts, assume_unique=True)
+        timestamps = timestamps[-bars:]
+        if not len(timestamps):
+            raise ValueError('The symbols share no bar times to replay')
+        settings['bars'] = bars = len(timestamps)
+        settings['timestamps'] = timestamps
+    chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_path, settings)) as pool:
+        for out in pool.map(backtest_chunk, chunks):
+            for name, part in out.items():
+                results.setdefault(name, []).append(part)
+
+    return {name: summarize(name, parts, len(symbols), bars, period_bars) for name, parts in results.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='Vectorized backtest of the rules and the model')
+    parser.add_argument('--symbols', type=int, default=1000, help='synthetic symbols (ignored with --store)')
+    parser.add_argument('--bars', type=int, default=2520, help='daily bars per symbol (2520 = 10 years)')
+    parser.add_argument('--store', help='bar store directory to replay instead of synthetic history')
+    parser.add_argument('--model', default='professional_model.pkl')
+    parser.add_argument('--workers', type=int, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=50, help='symbols per worker task')
+    parser.add_argument('--cost-bps', type=float, default=5.0, help='cost per unit of position traded')
+    parser.add_argument('--period-bars', type=int, default=BARS_PER_YEAR, help='bars per reported period')
+    parser.add_argument('--output', help='write the report as JSON')
+    args = parser.parse_args()
+
+    if args.store:
+        symbols = BarStore(args.store).symbols()
+    else:
+        symbols = args.symbols
+    model_path = args.model if os.path.exists(args.model) else None
+    if model_path is None:
+        print(f"⚠️ {args.model} not found, backtesting the rule engine only")
+
+    n = len(symbols) if isinstance(symbols, list) else symbols
+    print(f"📊 Backtesting {n:,} symbols x {args.bars:,} bars")
+    start = time.perf_counter()
+    report = run_backtest(symbols, args.bars, model_path, args.store, args.workers,
+                          args.chunk_size, args.cost_bps, args.period_bars)
+    elapsed = time.perf_counter() - start
+
+    for name, result in report.items():
+        print(f"📈 {name:>5}: hit rate {result['hit_rate']:.3f} | annual return {result['portfolio_annual_return']:+.2%} "
+              f"| Sharpe {result['portfolio_sharpe']:.2f} | max DD {result['portfolio_max_drawdown']:.2%} "
+              f"| turnover {result['annual_turnover']:.1f}x/yr")
+    print(f"⏱️  {elapsed:.1f}s ({n * args.bars / elapsed / 1e6:.2f}M bars/s)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(dict(report, elapsed_seconds=round(elapsed, 3)), f, indent=2)
+    return report
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+import fcntl
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+
+# Column name -> dtype; ts is bar open time in epoch seconds
+COLUMNS = {
+    'ts': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64
+}
+
+# Tail rows sealed into an immutable .npy segment once reached
+SEAL_ROWS = 65536
+
+# compact() merges segments up to this many rows each
+SEGMENT_ROWS = 1 << 20
+
+SYMBOL_PATTERN = re.compile(r'[A-Z0-9][A-Z0-9._-]{0,31}')
+
+class _View:
+    """Memory maps of one manifest generation for one symbol"""
+    __slots__ = ('key', 'segments', 'offsets', 'rows')
+
+    def __init__(self, key, segments):
+        self.key = key
+        self.segments = segments
+        self.offsets = np.cumsum([0] + [len(seg['ts']) for seg in segments])
+        self.rows = int(self.offsets[-1])
+
+class BarStore:
+    """Append-only per-symbol OHLCV bars in memory-mapped columnar files
+
+    Layout per symbol directory:
+      manifest.json         committed state, replaced atomically
+      seg-<n>/<col>.npy     sealed, immutable column segments
+      tail-<n>/<col>.bin    raw append-only columns of the open segment
+
+    Readers open whatever the current manifest lists and map only the
+    committed row count, so they never see a half-written bar and never
+    block the writer. One process may open the store writable; that is
+    enforced with an exclusive flock. Replaced files are unlinked, never
+    rewritten, so maps held by readers stay valid.
+    """
+
+    def __init__(self, root, writable=False):
+        self.root = root
+        self.writable = writable
+        self._views = {}
+        # Sealed segments never change, so their maps outlive manifest generations
+        self._segments = {}
+        self._lock_file = None
+        os.makedirs(root, exist_ok=True)
+        if writable:
+            self._lock_file = open(os.path.join(root, '.writer.lock'), 'w')
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock_file.close()
+                raise RuntimeError(f"Bar store {root} is already open for writing")
+
+    def close(self):
+        self._views.clear()
+        self._segments.clear()
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _dir(self, symbol):
+        if not SYMBOL_PATTERN.fullmatch(symbol):
+            raise ValueError(f"Invalid symbol {symbol!r}")
+        return os.path.join(self.root, symbol)
+
+    def _manifest(self, symbol):
+        try:
+            with open(os.path.join(self._dir(symbol), 'manifest.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'generation': 0, 'segments': [], 'tail': None, 'tail_rows': 0}
+
+    def _commit(self, symbol, manifest):
+        manifest['generation'] += 1
+        path = os.path.join(self._dir(symbol), 'manifest.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+        os.replace(path + '.tmp', path)
+
+    def symbols(self):
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, 'manifest.json')))
+
+    # Writing
+
+    def append(self, symbol, bars):
+        """Append bars ({column: values}, as returned by read) after the symbol's last bar"""
+        if not self.writable:
+            raise PermissionError("Bar store opened read-only")
+        missing = set(COLUMNS) - set(bars)
+        if missing:
+            raise ValueError(f"Missing columns: {sorted(missing)}")
+        columns = {name: np.atleast_1d(np.asarray(bars[name], dtype=dtype)) for name, dtype in COLUMNS.items()}
+        rows = len(columns['ts'])
+        if any(len(values) != rows for values in columns.values()):
+            raise ValueError("All columns must have the same length")
+        if rows == 0:
+            return 0
+        if np.any(np.diff(columns['ts']) <= 0):
+            raise ValueError("Timestamps must be strictly increasing")
+
+        directory = self._dir(symbol)
+        manifest = self._manifest(symbol)
+        last = self._committed_last_ts(directory, manifest)
+        if last is not None and columns['ts'][0] <= last:
+            raise ValueError(f"{symbol}: bar at {columns['ts'][0]} is not after the last bar {last}")
+        if manifest['tail'] is None:
+            manifest['tail'] = f'tail-{manifest["generation"] + 1:06d}'
+        tail = os.path.join(directory, manifest['tail'])
+        os.makedirs(tail, exist_ok=True)
+
+        for name, values in columns.items():
+            with open(os.path.join(tail, f'{name}.bin'), 'ab') as f:
+                # Drop bytes a crashed append left beyond the committed rows
+                f.truncate(manifest['tail_rows'] * values.itemsize)
+                f.write(values.tobytes())
+        manifest['tail_rows'] += rows
+        self._commit(symbol, manifest)
+
+        if manifest['tail_rows'] >= SEAL_ROWS:
+            self._seal(symbol)
+        return rows
+
+    def _committed_last_ts(self, directory, manifest):
+        """Last committed timestamp straight from the manifest and tail file"""
+        if manifest['tail_rows']:
+            with open(os.path.join(directory, manifest['tail'], 'ts.bin'), 'rb') as f:
+                f.seek((manifest['tail_rows'] - 1) * 8)
+                return int(np.frombuffer(f.read(8), dtype=np.int64)[0])
+        if manifest['segments']:
+            return manifest['segments'][-1]['end']
+        return None
+
+    def _write_segment(self, directory, name, columns):
+        staging = os.path.join(directory, name + '.tmp')
+        os.makedirs(staging, exist_ok=True)
+        for column, values in columns.items():
+            np.save(os.path.join(staging, f'{column}.npy'), values)
+        os.rename(staging, os.path.join(directory, name))
+        return {'name': name, 'rows': len(columns['ts']),
+                'start': int(columns['ts'][0]), 'end': int(columns['ts'][-1])}
+
+    def _seal(self, symbol):
+        """Turn the tail into an immutable .npy segment"""
+        directory = self._dir(symbol)
+        manifest = self._manifest(symbol)
+        if not manifest['tail_rows']:
+            return
+        view = self._view(symbol)
+        tail = view.segments[-1]
+        segment = self._write_segment(directory, f'seg-{manifest["generation"] + 1:06d}',
+                                      {name: np.array(tail[name]) for name in COLUMNS})
+
+        old_tail = manifest['tail']
+        manifest['segments'].append(segment)
+        manifest['tail'] = None
+        manifest['tail_rows'] = 0
+        self._commit(symbol, manifest)
+        shutil.rmtree(os.path.join(directory, old_tail), ignore_errors=True)
+
+    def compact(self, symbol, segment_rows=SEGMENT_ROWS):
+        """Seal the tail and merge adjacent small segments into ones of up to segment_rows"""
+        if not self.writable:
+            raise PermissionError("Bar store opened read-only")
+        self._seal(symbol)
+        directory = self._dir(symbol)
+        manifest = self._manifest(symbol)
+
+        groups = []
+        for segment in manifest['segments']:
+            if groups and sum(s['rows'] for s in groups[-1]) + segment['rows'] <= segment_rows:
+                groups[-1].append(segment)
+            else:
+                groups.append([segment])
+        if len(groups) == len(manifest['segments']):
+            return 0
+
+        merged = []
+        retired = []
+        for number, group in enumerate(groups):
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            maps = [self._load_segment(directory, segment['name']) for segment in group]
+            columns = {name: np.concatenate([m[name] for m in maps]) for name in COLUMNS}
+            name = f'seg-{manifest["generation"] + 1:06d}-{number:04d}'
+            merged.append(self._write_segment(directory, name, columns))
+            retired.extend(segment['name'] for segment in group)
+
+        manifest['segments'] = merged
+        self._commit(symbol, manifest)
+        for name in retired:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+        return len(retired)
+
+    # Reading
+
+    def _load_segment(self, directory, name):
+        return {column: np.load(os.path.join(directory, name, f'{column}.npy'), mmap_mode='r')
+                for column in COLUMNS}
+
+    def _load_tail(self, directory, name, rows):
+        return {column: np.memmap(os.path.join(directory, name, f'{column}.bin'),
+                                  dtype=dtype, mode='r', shape=(rows,))
+                for column, dtype in COLUMNS.items()}
+
+    def _view(self, symbol):
+        """Maps for the current manifest, cached until the manifest is replaced"""
+        directory = self._dir(symbol)
+        for _ in range(5):
+            try:
+                st = os.stat(os.path.join(directory, 'manifest.json'))
+            except FileNotFoundError:
+                return _View(None, [])
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            view = self._views.get(symbol)
+            if view is not None and view.key == key:
+                return view
+            try:
+                manifest = self._manifest(symbol)
+                cached = self._segments.get(symbol, {})
+                current = {s['name']: cached.get(s['name']) or self._load_segment(directory, s['name'])
+                           for s in manifest['segments']}
+                self._segments[symbol] = current
+                segments = list(current.values())
+                if manifest['tail_rows']:
+                    segments.append(self._load_tail(directory, manifest['tail'], manifest['tail_rows']))
+            except FileNotFoundError:
+                # Compaction removed a file between reading the manifest and mapping it
+                continue
+            view = _View(key, segments)
+            self._views[symbol] = view
+            return view
+        raise RuntimeError(f"{symbol}: manifest kept changing while opening")
+
+    def count(self, symbol):
+        return self._view(symbol).rows
+
+    def last_ts(self, symbol):
+        view = self._view(symbol)
+        return int(view.segments[-1]['ts'][-1]) if view.rows else None
+
+    def read(self, symbol, start=None, end=None, columns=tuple(COLUMNS)):
+        """Bars with start <= ts < end; zero-copy memmap slices when they fall in one segment"""
+        view = self._view(symbol)
+        parts = {name: [] for name in columns}
+        for segment in view.segments:
+            ts = segment['ts']
+            lo = 0 if start is None else int(np.searchsorted(ts, start, 'left'))
+            hi = len(ts) if end is None else int(np.searchsorted(ts, end, 'left'))
+            if lo < hi:
+                for name in columns:
+                    parts[name].append(segment[name][lo:hi])
+        return {name: self._join(chunks, COLUMNS[name]) for name, chunks in parts.items()}
+
+    def last(self, symbol, n, columns=tuple(COLUMNS)):
+        """The most recent n bars (indicator warm-up windows)"""
+        view = self._view(symbol)
+        first = max(0, view.rows - n)
+        parts = {name: [] for name in columns}
+        for segment, offset in zip(view.segments, view.offsets):
+            lo = max(0, first - offset)
+            if lo < len(segment['ts']):
+                for name in columns:
+                    parts[name].append(segment[name][lo:])
+        return {name: self._join(chunks, COLUMNS[name]) for name, chunks in parts.items()}
+
+    @staticmethod
+    def _join(chunks, dtype):
+        if not chunks:
+            return np.empty(0, dtype=dtype)
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_for(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up")
+
+def start_server(mode, port, upstream_url, workers):
+    """Launch sync gunicorn or async uvicorn against the mock upstream"""
+    env = dict(os.environ, BINANCE_API_URL=upstream_url, COINGECKO_API_URL=upstream_url,
+               QUOTE_CACHE='off', PYTHONUNBUFFERED='1')
+    if mode == 'sync':
+        cmd = [sys.executable, '-m', 'gunicorn', 'real_api_backend:app', '-k', 'sync', '-w', str(workers),
+               '-b', f'127.0.0.1:{port}', '--backlog', '2048', '--timeout', '120']
+    else:
+        cmd = [sys.executable, '-m', 'uvicorn', 'asgi_app:app', '--workers', str(workers),
+               '--host', '127.0.0.1', '--port', str(port), '--backlog', '2048',
+               '--log-level', 'warning', '--no-access-log']
+    return subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+async def drive(url, clients, requests_per_client):
+    """Closed-loop load: each client issues its requests back to back"""
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        async def run_client():
+            nonlocal errors
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run_client() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(pick(0.50), 1),
+        'p95_ms': round(pick(0.95), 1),
+        'p99_ms': round(pick(0.99), 1),
+        'max_ms': round(latencies[-1] * 1000, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync gunicorn vs async ASGI under concurrent load')
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=3, help='requests per client')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.2, help='mock upstream latency in seconds')
+    parser.add_argument('--symbol', default='BTC')
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--output', help='write results as JSON')
+    args = parser.parse_args()
+
+    upstream_port = free_port()
+    upstream = subprocess.Popen([sys.executable, 'mock_upstream.py', '--port', str(upstream_port),
+                                 '--latency', str(args.latency)], stdout=subprocess.DEVNULL)
+    upstream_url = f'http://127.0.0.1:{upstream_port}/api/v3'
+    results = {'clients': args.clients, 'requests_per_client': args.requests,
+               'workers': args.workers, 'upstream_latency_s': args.latency}
+
+    try:
+        for mode in args.modes.split(','):
+            port = free_port()
+            server = start_server(mode, port, upstream_url, args.workers)
+            try:
+                wait_for(f'http://127.0.0.1:{port}/api/accuracy')
+                print(f"⏱️  {mode}: {args.clients} clients x {args.requests} requests...")
+                results[mode] = asyncio.run(drive(f'http://127.0.0.1:{port}/api/analyze/{args.symbol}',
+                                                  args.clients, args.requests))
+                print(f"   {json.dumps(results[mode])}")
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        upstream.terminate()
+        upstream.wait()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from bar_store import BarStore
+from indicators import FEATURE_NAMES, WARMUP_BARS, compute_features, synthetic_history
+
+def main():
+    parser = argparse.ArgumentParser(description='Bar store append, compaction and range-read throughput')
+    parser.add_argument('--symbols', type=int, default=10)
+    parser.add_argument('--bars', type=int, default=500_000, help='one-minute bars per symbol')
+    parser.add_argument('--chunk', type=int, default=390, help='bars per append (390 = one trading day)')
+    parser.add_argument('--reads', type=int, default=2000)
+    parser.add_argument('--root', help='store directory (default: a temporary one)')
+    args = parser.parse_args()
+
+    root = args.root or tempfile.mkdtemp(prefix='bar_store_')
+    close, volume = synthetic_history(args.symbols, args.bars)
+    ts = np.arange(args.bars, dtype=np.int64) * 60
+    symbols = [f'SYM{i:03d}' for i in range(args.symbols)]
+    total = args.symbols * args.bars
+
+    try:
+        start = time.perf_counter()
+        with BarStore(root, writable=True) as store:
+            for i, symbol in enumerate(symbols):
+                for lo in range(0, args.bars, args.chunk):
+                    hi = lo + args.chunk
+                    c = close[i, lo:hi]
+                    store.append(symbol, {'ts': ts[lo:hi], 'open': c, 'high': c, 'low': c,
+                                          'close': c, 'volume': volume[i, lo:hi]})
+            append_s = time.perf_counter() - start
+            print(f"✍️  Appended {total:,} bars in {args.bars // args.chunk * args.symbols:,} appends: "
+                  f"{append_s:.2f}s ({total / append_s / 1e6:.2f}M bars/s)")
+
+            start = time.perf_counter()
+            merged = sum(store.compact(symbol) for symbol in symbols)
+            print(f"🗜️  Compacted {merged} segments in {time.perf_counter() - start:.2f}s")
+
+        reader = BarStore(root)
+        rng = np.random.default_rng(0)
+        picks = rng.integers(0, args.symbols, args.reads)
+        offsets = rng.integers(0, args.bars - 300, args.reads)
+
+        start = time.perf_counter()
+        for i, offset in zip(picks, offsets):
+            reader.read(symbols[i], int(ts[offset]), int(ts[offset + 300]), columns=('close', 'volume'))
+        range_us = (time.perf_counter() - start) / args.reads * 1e6
+
+        start = time.perf_counter()
+        for i in picks:
+            window = reader.last(symbols[i], 200, columns=('close', 'volume'))
+            compute_features(window['close'], window['volume'])[-1]
+        last_us = (time.perf_counter() - start) / args.reads * 1e6
+
+        # Baseline: load a symbol's whole close/volume columns, then slice
+        segment = os.path.join(root, symbols[0], reader._manifest(symbols[0])['segments'][0]['name'])
+        start = time.perf_counter()
+        for _ in range(20):
+            np.load(os.path.join(segment, 'close.npy'))[-300:]
+            np.load(os.path.join(segment, 'volume.npy'))[-300:]
+        full_us = (time.perf_counter() - start) / 20 * 1e6
+
+        size = sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(root) for f in files)
+        print(f"📖 300-bar range read:           {range_us:.1f} µs")
+        print(f"📈 last 200 bars + {len(FEATURE_NAMES)} features:  {last_us:.1f} µs (warm-up {WARMUP_BARS})")
+        print(f"🐌 Full-segment np.load + slice: {full_us:.1f} µs")
+        print(f"💾 {size / 1e6:.0f} MB on disk ({size / total:.0f} bytes/bar)")
+    finally:
+        if not args.root:
+            shutil.rmtree(root)
+
+if __name__ == '__main__':
+    main()
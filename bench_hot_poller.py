@@ -0,0 +1,53 @@
+import argparse
+import time
+
+import numpy as np
+
+import real_api_backend
+from hot_poller import HotSetPoller
+from market_data import MarketDataClient
+from mock_upstream import FakeMarketServer
+from quote_cache import QuoteCache
+
+def time_requests(client, symbols, repeats):
+    samples = []
+    for _ in range(repeats):
+        for symbol in symbols:
+            start = time.perf_counter()
+            response = client.get(f'/api/analyze/{symbol}')
+            samples.append(time.perf_counter() - start)
+            assert response.status_code == 200
+    return np.percentile(samples, [50, 99]) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='/api/analyze latency: inline analysis vs hot-set lookup')
+    parser.add_argument('--latency', type=float, default=0.05, help='mock Binance latency in seconds')
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    groups = {'crypto (Binance)': ['BTC', 'ETH'], 'stocks/ETFs/commodities': ['AAPL', 'TSLA', 'GOLD', 'SPY']}
+    symbols = [symbol for group in groups.values() for symbol in group]
+    results = {}
+    with FakeMarketServer(latency=args.latency) as upstream:
+        real_api_backend.market_data = MarketDataClient(binance_url=upstream.binance_url)
+        real_api_backend.quote_cache = QuoteCache()
+        real_api_backend.quote_cache.enabled = False
+        client = real_api_backend.app.test_client()
+
+        # stale_ttl=-1 turns every lookup into a miss: the old inline request path
+        inline = HotSetPoller(real_api_backend.analyze_symbols, stale_ttl=-1, background=False)
+        hot = HotSetPoller(real_api_backend.analyze_symbols, seed_symbols=symbols, background=False)
+        hot.refresh()
+
+        for label, poller in (('inline', inline), ('hot', hot)):
+            real_api_backend.hot_poller = poller
+            for group, group_symbols in groups.items():
+                results[label, group] = time_requests(client, group_symbols, args.repeats)
+
+    for group in groups:
+        (inline_p50, inline_p99), (hot_p50, hot_p99) = results['inline', group], results['hot', group]
+        print(f"📊 {group}: inline p50 {inline_p50:.3f} ms / p99 {inline_p99:.3f} ms | "
+              f"hot p50 {hot_p50:.3f} ms / p99 {hot_p99:.3f} ms | {inline_p50 / hot_p50:.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import time
+
+import numpy as np
+
+from indicator_state import IndicatorBook
+from indicators import latest_features, synthetic_history
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-tick cost of streaming indicator updates')
+    parser.add_argument('--symbols', type=int, default=10000)
+    parser.add_argument('--history', type=int, default=260, help='bars of history per symbol')
+    parser.add_argument('--rounds', type=int, default=5, help='ticks per symbol to time')
+    args = parser.parse_args()
+
+    close, volume = synthetic_history(args.symbols, args.history + args.rounds)
+    symbols = [f'SYM{i}' for i in range(args.symbols)]
+    book = IndicatorBook(bar_seconds=1)
+
+    start = time.perf_counter()
+    for i, symbol in enumerate(symbols):
+        book.warm(symbol, close[i, :args.history], volume[i, :args.history])
+    print(f"🔥 Warmed {args.symbols:,} symbols x {args.history} bars in {time.perf_counter() - start:.2f}s")
+
+    n = 0
+    start = time.perf_counter()
+    for r in range(args.rounds):
+        t = args.history + r
+        for i, symbol in enumerate(symbols):
+            book.on_tick(symbol, close[i, t], volume[i, t], timestamp=t)
+            book.features(symbol)
+            n += 1
+    elapsed = time.perf_counter() - start
+    print(f"⚡ Streaming: {elapsed / n * 1e6:.1f} µs per tick+features, "
+          f"{elapsed / args.rounds * 1000:.1f} ms per {args.symbols:,}-symbol sweep")
+
+    sample = min(args.symbols, 500)
+    start = time.perf_counter()
+    for i in range(sample):
+        latest_features(close[i, :args.history + 1], volume[i, :args.history + 1])
+    recompute = (time.perf_counter() - start) / sample
+    print(f"🐢 Full recompute: {recompute * 1e6:.1f} µs per symbol "
+          f"({recompute * args.symbols * 1000:.1f} ms per sweep)")
+
+    i = args.symbols - 1
+    full = latest_features(close[i], volume[i])
+    print(f"✅ Max abs difference vs recompute: {np.max(np.abs(np.array(book.features(symbols[i])) - full)):.2e}")
+
+if __name__ == '__main__':
+    main()
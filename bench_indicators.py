@@ -0,0 +1,70 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicators import WARMUP_BARS, compute_features, synthetic_history
+
+def wilder(values, period=14):
+    """Wilder smoothing seeded with the SMA of the first period values"""
+    seeded = values.iloc[period - 1:].copy()
+    seeded.iloc[0] = values.iloc[:period].mean()
+    return seeded.ewm(alpha=1 / period, adjust=False).mean()
+
+def pandas_features(close, volume):
+    """Naive per-symbol pandas .rolling()/.ewm() baseline for one series"""
+    c = pd.Series(close)
+    v = pd.Series(volume)
+
+    delta = c.diff().iloc[1:]
+    gains = wilder(delta.clip(lower=0))
+    losses = wilder(delta.clip(upper=0).abs())
+    rsi = (100 - 100 / (1 + gains / losses)).reindex(c.index)
+
+    sma_20 = c.rolling(20).mean()
+    band = c.rolling(20).std(ddof=0) * 2
+    macd = c.ewm(span=12, adjust=False).mean() - c.ewm(span=26, adjust=False).mean()
+
+    frame = pd.DataFrame({
+        'RSI': rsi,
+        'Volume_Change': (v / v.rolling(20).mean() - 1) * 100,
+        'Momentum_5D': c / c.shift(5) - 1,
+        'Momentum_20D': c / c.shift(20) - 1,
+        'Volatility': c.pct_change().rolling(20).std(),
+        'SMA_20_Ratio': c / sma_20,
+        'SMA_50_Ratio': c / c.rolling(50).mean(),
+        'MACD': macd / c,
+        'BB_Position': ((c - (sma_20 - band)) / (2 * band)).clip(0, 1)
+    })
+    frame.iloc[:WARMUP_BARS - 1] = np.nan
+    return frame.to_numpy()
+
+def main():
+    parser = argparse.ArgumentParser(description='Vectorized indicator engine vs pandas rolling baseline')
+    parser.add_argument('--symbols', type=int, default=2000)
+    parser.add_argument('--bars', type=int, default=1260, help='bars per symbol (1260 = 5 trading years)')
+    parser.add_argument('--baseline-symbols', type=int, default=200,
+                        help='symbols timed for the pandas baseline (extrapolated to --symbols)')
+    args = parser.parse_args()
+
+    close, volume = synthetic_history(args.symbols, args.bars)
+    print(f"📊 {args.symbols} symbols x {args.bars} bars = {close.size:,} bars")
+
+    start = time.perf_counter()
+    features = compute_features(close, volume)
+    engine_s = time.perf_counter() - start
+    print(f"⚡ NumPy engine:    {engine_s:.3f}s ({close.size / engine_s / 1e6:.1f}M bars/s)")
+
+    n = min(args.baseline_symbols, args.symbols)
+    start = time.perf_counter()
+    baseline = [pandas_features(close[i], volume[i]) for i in range(n)]
+    baseline_s = (time.perf_counter() - start) * args.symbols / n
+    print(f"🐼 pandas baseline: {baseline_s:.3f}s (extrapolated from {n} symbols)")
+    print(f"🚀 Speedup: {baseline_s / engine_s:.1f}x")
+
+    max_error = max(np.nanmax(np.abs(features[i] - baseline[i])) for i in range(n))
+    print(f"✅ Max abs difference vs pandas: {max_error:.2e}")
+
+if __name__ == '__main__':
+    main()
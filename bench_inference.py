@@ -0,0 +1,55 @@
+import argparse
+import time
+
+import joblib
+import numpy as np
+
+from flat_forest import FlatForest
+from train_model import ProfessionalModelTrainer, iter_training_chunks
+
+def timed(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return np.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description='Flat-array forest vs sklearn predict_proba')
+    parser.add_argument('--model', default='professional_model.pkl')
+    parser.add_argument('--single-repeats', type=int, default=300)
+    parser.add_argument('--batch-rows', type=int, default=10000)
+    parser.add_argument('--batch-repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        forest = joblib.load(args.model)
+    except FileNotFoundError:
+        print(f"⚠️ {args.model} not found, training the default model in memory")
+        trainer = ProfessionalModelTrainer()
+        X, y = trainer.generate_high_quality_data()
+        forest = trainer.model.fit(X, y)
+    forest.set_params(n_jobs=None)
+    flat = FlatForest.from_sklearn(forest)
+    print(f"🌲 {flat.n_estimators} trees, {len(flat.feature):,} nodes, depth {flat.depth}")
+
+    X, _ = next(iter_training_chunks(args.batch_rows, args.batch_rows, seed=7))
+    row = X[:1]
+    assert np.array_equal(flat.predict_proba(X), forest.predict_proba(X))
+
+    sk_single = timed(lambda: forest.predict_proba(row), args.single_repeats)
+    flat_single = timed(lambda: flat.predict_proba(row), args.single_repeats)
+    print(f"⚡ Single row:  sklearn {sk_single * 1e3:.3f} ms | flat {flat_single * 1e3:.3f} ms "
+          f"| {sk_single / flat_single:.1f}x")
+
+    for rows in (500, args.batch_rows):
+        batch = X[:rows]
+        sk_batch = timed(lambda: forest.predict_proba(batch), args.batch_repeats)
+        flat_batch = timed(lambda: flat.predict_proba(batch), args.batch_repeats)
+        print(f"📦 {rows:,} rows: sklearn {sk_batch * 1e3:.1f} ms | flat {flat_batch * 1e3:.1f} ms "
+              f"| {sk_batch / flat_batch:.1f}x")
+    print("✅ Probabilities bit-identical to sklearn")
+
+if __name__ == '__main__':
+    main()
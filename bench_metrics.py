@@ -0,0 +1,59 @@
+import argparse
+import logging
+import threading
+import time
+
+from logs import configure_logging, dropped, stop_logging
+from metrics import Registry
+
+def per_call_ns(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e9
+
+def main():
+    parser = argparse.ArgumentParser(description='Cost of recording metrics and logging on the request path')
+    parser.add_argument('--calls', type=int, default=200_000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    registry = Registry()
+    latency = registry.histogram('bench_seconds', 'bench', ('stage', 'source'))
+    errors = registry.counter('bench_total', 'bench', ('provider',))
+
+    def timed_block():
+        with latency.time('inference', 'binance'):
+            pass
+
+    print(f"⏱️  {args.calls:,} calls each")
+    print(f"   empty loop        {per_call_ns(lambda: None, args.calls):7.0f} ns")
+    print(f"   histogram.observe {per_call_ns(lambda: latency.observe(0.003, 'quote', 'binance'), args.calls):7.0f} ns")
+    print(f"   histogram.time    {per_call_ns(timed_block, args.calls):7.0f} ns")
+    print(f"   counter.inc       {per_call_ns(lambda: errors.inc('binance'), args.calls):7.0f} ns")
+
+    def worker():
+        for _ in range(args.calls // args.threads):
+            latency.observe(0.003, 'quote', 'binance')
+
+    workers = [threading.Thread(target=worker) for _ in range(args.threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    print(f"🧵 {args.threads} threads: {args.calls / elapsed / 1e6:.2f}M observations/s")
+
+    start = time.perf_counter()
+    text = registry.render()
+    print(f"📄 render {len(text):,} bytes in {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    configure_logging('INFO')
+    logger = logging.getLogger('bench')
+    call = per_call_ns(lambda: logger.info('quote %s %.2f', 'AAPL', 175.0), args.calls // 10)
+    stop_logging()
+    print(f"📝 logger.info on the caller thread {call:7.0f} ns | dropped {dropped():,}")
+
+if __name__ == '__main__':
+    main()
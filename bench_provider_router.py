@@ -0,0 +1,45 @@
+import argparse
+import time
+
+import numpy as np
+
+from market_data import MarketDataClient
+from mock_upstream import FakeMarketServer
+from provider_router import Provider, ProviderRouter
+
+IDS = {'BTC': 'BTCUSDT', 'ETH': 'ETHUSDT'}
+COINS = {'BTC': 'bitcoin', 'ETH': 'ethereum'}
+
+def measure(binance_latency, binance_fail, calls, deadline):
+    """Router latency and winners with Binance slow or down and CoinGecko healthy"""
+    with FakeMarketServer(latency=binance_latency, fail=binance_fail) as binance, \
+            FakeMarketServer(latency=0.02) as coingecko:
+        binance_client = MarketDataClient(binance_url=binance.binance_url, retries=0)
+        coingecko_client = MarketDataClient(coingecko_url=coingecko.coingecko_url, retries=0)
+        router = ProviderRouter([
+            Provider('binance', IDS, binance_client.binance_tickers),
+            Provider('coingecko', COINS, coingecko_client.coingecko_prices)
+        ], deadline=deadline)
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            router.quotes(list(IDS))
+            latencies.append(time.perf_counter() - start)
+        return np.array(latencies) * 1000, router.stats()
+
+def main():
+    parser = argparse.ArgumentParser(description='Quote latency through the provider router under upstream faults')
+    parser.add_argument('--calls', type=int, default=50)
+    parser.add_argument('--slow', type=float, default=1.0, help='seconds of injected Binance latency')
+    parser.add_argument('--deadline', type=float, default=2.0)
+    args = parser.parse_args()
+
+    for label, latency, fail in (('healthy', 0.0, False), ('slow', args.slow, False), ('down', 0.0, True)):
+        latencies, stats = measure(latency, fail, args.calls, args.deadline)
+        print(f"🔀 binance {label:7s} p50 {np.percentile(latencies, 50):7.1f} ms | "
+              f"p95 {np.percentile(latencies, 95):7.1f} ms | "
+              f"wins binance {stats['binance']['wins']} coingecko {stats['coingecko']['wins']} | "
+              f"hedges {stats['coingecko']['hedges']} | binance circuit {stats['binance']['state']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from bench_async import free_port, wait_for
+from mock_upstream import FakeMarketServer
+from quote_board import QuoteBoard
+
+def upstream_calls(board, workers, seconds, rate):
+    """Binance calls made by a gunicorn deployment under steady crypto traffic"""
+    with FakeMarketServer() as upstream:
+        port = free_port()
+        env = dict(os.environ, BINANCE_API_URL=upstream.binance_url, COINGECKO_API_URL=upstream.coingecko_url,
+                   QUOTE_BOARD='on' if board else 'off', LOG_LEVEL='WARNING')
+        server = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'real_api_backend:app', '-c', 'gunicorn.conf.py',
+                                   '-w', str(workers), '-b', f'127.0.0.1:{port}'],
+                                  env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for(f'http://127.0.0.1:{port}/api/accuracy')
+            before = upstream.request_count
+            deadline = time.time() + seconds
+            with httpx.Client(base_url=f'http://127.0.0.1:{port}') as client:
+                i = 0
+                while time.time() < deadline:
+                    # New connections spread requests over the workers
+                    client.get(f"/api/analyze/{('BTC', 'ETH', 'SOL', 'ADA')[i % 4]}", headers={'Connection': 'close'})
+                    i += 1
+                    time.sleep(1 / rate)
+            return upstream.request_count - before, i
+        finally:
+            server.terminate()
+            server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description='Upstream calls with and without the shared quote board')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--rate', type=float, default=50, help='client requests per second')
+    parser.add_argument('--reads', type=int, default=200_000)
+    args = parser.parse_args()
+
+    board = QuoteBoard(['BTCUSDT', 'ETHUSDT'])
+    board.publish({'BTCUSDT': (65000.0, 1.2)}, 'binance')
+    start = time.perf_counter()
+    for _ in range(args.reads):
+        board.read('BTCUSDT')
+    print(f"📖 seqlock read {(time.perf_counter() - start) / args.reads * 1e9:.0f} ns | "
+          f"board {board.nbytes} bytes shared by every worker")
+
+    for enabled in (False, True):
+        calls, requests = upstream_calls(enabled, args.workers, args.seconds, args.rate)
+        print(f"🔁 board {'on ' if enabled else 'off'}: {args.workers} workers, {requests} requests in "
+              f"{args.seconds:g}s -> {calls} Binance calls")
+
+if __name__ == '__main__':
+    main()
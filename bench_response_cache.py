@@ -0,0 +1,57 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from flask import jsonify
+
+import app
+import server
+
+def rate(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description='Requests/sec for cached vs uncached /api/analyze responses')
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--symbol', default='AAPL')
+    args = parser.parse_args()
+
+    symbol = args.symbol.upper()
+    data = server.STOCK_DATA[symbol]
+    cache = server.response_cache
+    print(f"⏱️  {args.requests:,} responses for {symbol}")
+
+    # Handler cost alone: build + serialize every time (the old route) vs cached bytes
+    with server.app.test_request_context(f'/api/analyze/{symbol}'):
+        rebuild = rate(lambda: jsonify(server.analyze_data(symbol, data)), args.requests)
+        cached = rate(lambda: cache.respond(symbol, 'static', lambda: server.analyze_data(symbol, data)),
+                      args.requests)
+    etag = cache.get(symbol, 'static', lambda: server.analyze_data(symbol, data)).etag
+    with server.app.test_request_context(f'/api/analyze/{symbol}', headers={'If-None-Match': f'"{etag}"'}):
+        revalidated = rate(lambda: cache.respond(symbol, 'static', lambda: server.analyze_data(symbol, data)),
+                           args.requests)
+    print(f"   handler  rebuild+jsonify {rebuild:9,.0f}/s | cached body {cached:9,.0f}/s "
+          f"({cached / rebuild:.1f}x) | 304 {revalidated:9,.0f}/s")
+
+    # Whole Flask request cycle through the test client
+    client = server.app.test_client()
+    full_cached = rate(lambda: client.get(f'/api/analyze/{symbol}'), args.requests // 4)
+    full_304 = rate(lambda: client.get(f'/api/analyze/{symbol}', headers={'If-None-Match': f'"{etag}"'}),
+                    args.requests // 4)
+    full_uncached = rate(lambda: client.get('/api/analyze/UNCACHED'), args.requests // 4)
+    print(f"   request  uncached {full_uncached:9,.0f}/s | cached {full_cached:9,.0f}/s | 304 {full_304:9,.0f}/s")
+
+    # app.py: a miss runs features and model inference, a hit only fetches the (cached) quote
+    predictor = app.get_predictor()
+    with app.app.test_request_context(f'/api/analyze/{symbol}'):
+        rebuild = rate(lambda: jsonify(predictor.analyze_symbol(symbol)), args.requests // 4)
+        cached = rate(lambda: app.analyze_stock(symbol), args.requests // 4)
+    print(f"   app.py   rebuild+jsonify {rebuild:9,.0f}/s | cached handler {cached:9,.0f}/s ({cached / rebuild:.1f}x)")
+
+if __name__ == '__main__':
+    main()
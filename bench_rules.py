@@ -0,0 +1,48 @@
+import argparse
+import time
+
+from legacy_rules import legacy_basic, legacy_momentum_rsi, legacy_points, random_inputs
+from rules import BASIC_RULES, MOMENTUM_RSI_RULES, score_features
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Rule table throughput vs the per-row if/elif ladders')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rsi, change, features = random_inputs(args.rows)
+    rsi_list, change_list, feature_rows = rsi.tolist(), change.tolist(), features.tolist()
+
+    cases = [
+        ('momentum/RSI ladder', lambda: [legacy_momentum_rsi(r, c) for r, c in zip(rsi_list, change_list)],
+         lambda: MOMENTUM_RSI_RULES.evaluate(rsi=rsi, change=change)),
+        ('basic ladder', lambda: [legacy_basic(r, c) for r, c in zip(rsi_list, change_list)],
+         lambda: BASIC_RULES.evaluate(rsi=rsi, change=change)),
+        ('feature points', lambda: [legacy_points(row) for row in feature_rows],
+         lambda: score_features(features)),
+        ('momentum/RSI signal', lambda: [legacy_momentum_rsi(r, c) for r, c in zip(rsi_list, change_list)],
+         lambda: MOMENTUM_RSI_RULES.evaluate(('signal',), rsi=rsi, change=change))
+    ]
+
+    print(f"📊 {args.rows:,} rows, best of {args.repeat}")
+    for name, legacy, table in cases:
+        legacy_s = timed(legacy, args.repeat)
+        table_s = timed(table, args.repeat)
+        print(f"⚡ {name:<20} if/elif {args.rows / legacy_s / 1e6:6.2f}M rows/s | "
+              f"np.select {args.rows / table_s / 1e6:7.2f}M rows/s | {legacy_s / table_s:5.1f}x")
+
+    start = time.perf_counter()
+    for r, c in zip(rsi_list[:100_000], change_list[:100_000]):
+        MOMENTUM_RSI_RULES.evaluate_one(rsi=r, change=c)
+    print(f"🔍 evaluate_one: {(time.perf_counter() - start) / 100_000 * 1e6:.2f} µs/row")
+
+if __name__ == '__main__':
+    main()
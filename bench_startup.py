@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from bench_async import free_port, wait_for
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (label, INFERENCE_BACKEND, use gunicorn.conf.py preload)
+SCENARIOS = [
+    ('pickle, load per worker', 'sklearn', False),
+    ('pickle, preload + fork', 'sklearn', True),
+    ('flat mmap, preload + fork', 'flat', True),
+    ('auto (flat + pickle), preload + fork', 'auto', True)
+]
+
+def memory_kb(pid):
+    """Rss, Pss and private (USS) kB from /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'uss': fields['Private_Clean'] + fields['Private_Dirty']
+    }
+
+def worker_pids(master_pid):
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+def ensure_model(model_dir, samples):
+    """Train and save the default model into model_dir if it has none"""
+    if os.path.exists(os.path.join(model_dir, 'professional_model.pkl')):
+        return
+    from train_model import ProfessionalModelTrainer
+
+    print(f"⚠️ No model in {model_dir}, training one ({samples} samples)")
+    cwd = os.getcwd()
+    os.chdir(model_dir)
+    try:
+        ProfessionalModelTrainer().train_and_validate(samples)
+    finally:
+        os.chdir(cwd)
+
+def run_scenario(label, backend, preload, model_dir, workers, warm_requests):
+    port = free_port()
+    empty_config = None
+    if preload:
+        config = os.path.join(REPO_DIR, 'gunicorn.conf.py')
+    else:
+        # An explicit blank config keeps gunicorn from reading ./gunicorn.conf.py
+        with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as f:
+            empty_config = config = f.name
+    env = dict(os.environ, INFERENCE_BACKEND=backend, PYTHONPATH=REPO_DIR, PYTHONUNBUFFERED='1')
+    cmd = [sys.executable, '-m', 'gunicorn', 'app:app', '-c', config, '-k', 'sync', '-w', str(workers),
+           '-b', f'127.0.0.1:{port}', '--chdir', model_dir]
+
+    start = time.perf_counter()
+    server = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f'http://127.0.0.1:{port}'
+        wait_for(f'{url}/api/accuracy', timeout=120)
+        first_response_s = time.perf_counter() - start
+
+        # Spread requests over the workers so every one has scored with the model
+        with httpx.Client(timeout=60) as client:
+            for _ in range(warm_requests):
+                response = client.get(f'{url}/api/analyze/AAPL')
+                response.raise_for_status()
+                if not response.json()['model_used']:
+                    raise RuntimeError(f"{label}: worker fell back to rule-based predictions")
+        workers_ready_s = time.perf_counter() - start
+
+        per_worker = [memory_kb(pid) for pid in worker_pids(server.pid)]
+        master = memory_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+        if empty_config:
+            os.unlink(empty_config)
+
+    mean = lambda key: round(sum(w[key] for w in per_worker) / len(per_worker) / 1024, 1)
+    return {
+        'scenario': label,
+        'first_response_s': round(first_response_s, 3),
+        'warm_all_workers_s': round(workers_ready_s, 3),
+        'workers': len(per_worker),
+        'worker_rss_mb': mean('rss'),
+        'worker_pss_mb': mean('pss'),
+        'worker_uss_mb': mean('uss'),
+        'total_pss_mb': round((sum(w['pss'] for w in per_worker) + master['pss']) / 1024, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Gunicorn cold start and per-worker memory by model layout')
+    parser.add_argument('--model-dir', default='.', help='directory holding the trained model artifacts')
+    parser.add_argument('--samples', type=int, default=8000, help='training samples if no model exists')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--warm-requests', type=int, default=40)
+    parser.add_argument('--output', help='write results as JSON')
+    args = parser.parse_args()
+
+    model_dir = os.path.abspath(args.model_dir)
+    ensure_model(model_dir, args.samples)
+
+    results = []
+    for label, backend, preload in SCENARIOS:
+        result = run_scenario(label, backend, preload, model_dir, args.workers, args.warm_requests)
+        results.append(result)
+        print(f"⏱️  {label:<27} first response {result['first_response_s']:.2f}s | "
+              f"worker RSS {result['worker_rss_mb']:.1f} MB, PSS {result['worker_pss_mb']:.1f} MB, "
+              f"private {result['worker_uss_mb']:.1f} MB | total PSS {result['total_pss_mb']:.1f} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+if __name__ == '__main__':
+    main()
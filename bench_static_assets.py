@@ -0,0 +1,45 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from flask import Flask, send_file
+
+import server
+
+BROWSER_ENCODINGS = 'gzip, deflate, br'
+
+def per_request(client, path, headers, n):
+    """(µs per request, body bytes) through the Flask test client"""
+    response = client.get(path, headers=headers)
+    size = len(response.get_data())
+    start = time.perf_counter()
+    for _ in range(n):
+        client.get(path, headers=headers).close()
+    return (time.perf_counter() - start) / n * 1e6, size
+
+def main():
+    parser = argparse.ArgumentParser(description='Landing page: send_file per request vs precompressed in-memory assets')
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    # The old home(): read and stream index.html from disk on every request
+    legacy = Flask(__name__)
+    legacy.add_url_rule('/', 'home', lambda: send_file('index.html'))
+
+    headers = {'Accept-Encoding': BROWSER_ENCODINGS}
+    old_us, old_bytes = per_request(legacy.test_client(), '/', headers, args.requests)
+    new_us, new_bytes = per_request(server.app.test_client(), '/', headers, args.requests)
+    etag = server.app.test_client().get('/', headers=headers).headers['ETag']
+    revalidate_us, _ = per_request(server.app.test_client(), '/', dict(headers, **{'If-None-Match': etag}),
+                                   args.requests)
+
+    print(f"🌐 GET / with Accept-Encoding: {BROWSER_ENCODINGS} ({args.requests:,} requests)")
+    print(f"   send_file     {old_bytes:7,} bytes  {old_us:7.1f} µs/request")
+    print(f"   precompressed {new_bytes:7,} bytes  {new_us:7.1f} µs/request  "
+          f"({old_bytes / new_bytes:.1f}x fewer bytes, {old_us / new_us:.1f}x faster)")
+    print(f"   304           {0:7,} bytes  {revalidate_us:7.1f} µs/request")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import random
+import threading
+import time
+
+from symbol_state import SymbolStateStore
+
+def rss_mb():
+    """Current resident set size (Linux /proc)"""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4096 / 1e6
+
+def simulated_data():
+    return {'price': random.uniform(10, 500), 'change': random.uniform(-3, 3), 'rsi': random.uniform(30, 70)}
+
+def flood(store, n, threads, report_every):
+    """n distinct symbols spread over threads, printing RSS as they go"""
+    def worker(offset):
+        for i in range(offset, n, threads):
+            store.get_or_create(f'X{i:08d}', simulated_data)
+            if i % report_every == 0:
+                print(f"   {i:>10,} symbols  RSS {rss_mb():7.1f} MB  entries {len(store):,}")
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+def main():
+    parser = argparse.ArgumentParser(description='Flood the symbol state store with distinct symbols')
+    parser.add_argument('--symbols', type=int, default=3_000_000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--max-entries', type=int, default=10000)
+    parser.add_argument('--unbounded', action='store_true', help='baseline: a plain dict, as STOCK_DATA was')
+    args = parser.parse_args()
+
+    start_rss = rss_mb()
+    start = time.perf_counter()
+    print(f"🌊 {args.symbols:,} distinct symbols over {args.threads} threads")
+    if args.unbounded:
+        table = {}
+        for i in range(args.symbols):
+            table[f'X{i:08d}'] = simulated_data()
+            if i % (args.symbols // 6) == 0:
+                print(f"   {i:>10,} symbols  RSS {rss_mb():7.1f} MB  entries {len(table):,}")
+    else:
+        store = SymbolStateStore(max_entries=args.max_entries, ttl=3600)
+        flood(store, args.symbols, args.threads, args.symbols // 6)
+        stats = store.stats()
+        print(f"📦 entries {stats['entries']:,} | accounted {stats['bytes'] / 1e6:.1f} MB | "
+              f"evictions {stats['evictions']:,}")
+    elapsed = time.perf_counter() - start
+    print(f"💾 RSS {start_rss:.1f} -> {rss_mb():.1f} MB | {args.symbols / elapsed / 1e3:.0f}k symbols/s")
+
+if __name__ == '__main__':
+    main()
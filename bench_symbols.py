@@ -0,0 +1,69 @@
+import argparse
+import random
+import string
+import time
+import tracemalloc
+
+from symbols import ASSET_CLASSES, SymbolIndex
+
+EXCHANGES = ['NASDAQ', 'NYSE', 'NYSEARCA', 'LSE', 'XETRA', 'TSE', 'HKEX', 'CRYPTO', 'COMEX']
+
+def synthetic_master(n, seed=0):
+    """n random instruments: 1-5 letter tickers with a share-class suffix now and then"""
+    rng = random.Random(seed)
+    records = {}
+    while len(records) < n:
+        symbol = ''.join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5)))
+        if rng.random() < 0.05:
+            symbol += '.' + rng.choice('AB')
+        asset_class = rng.choice(ASSET_CLASSES)
+        records[symbol] = {
+            'symbol': symbol,
+            'name': f'{symbol.title()} Holdings {rng.randint(1, 999)}',
+            'asset_class': asset_class,
+            'exchange': rng.choice(EXCHANGES),
+            'binance': symbol.replace('.', '') + 'USDT' if asset_class == 'crypto' else '',
+            'coingecko': symbol.lower() if asset_class == 'crypto' else ''
+        }
+    return list(records.values())
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return built, elapsed, size
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='Symbol index memory, lookup and prefix-search cost')
+    parser.add_argument('--instruments', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=20_000)
+    args = parser.parse_args()
+
+    records = synthetic_master(args.instruments)
+    rng = random.Random(1)
+    lookups = [rng.choice(records)['symbol'] for _ in range(args.queries)]
+    prefixes = [symbol[:rng.randint(1, 2)] for symbol in lookups[:2000]]
+
+    index, index_s, index_bytes = measure(lambda: SymbolIndex(records))
+    # Baseline: the hardcoded-dict approach scaled up, {symbol: metadata dict}
+    table, _, dict_bytes = measure(lambda: {r['symbol']: dict(r) for r in records})
+    sorted_symbols = sorted(table)
+
+    print(f"📚 {len(index):,} instruments, index built in {index_s:.2f}s")
+    print(f"💾 SymbolIndex {index_bytes / 1e6:.1f} MB ({index.nbytes / 1e6:.1f} MB of arrays) | "
+          f"dict of dicts {dict_bytes / 1e6:.1f} MB")
+    print(f"🔍 resolve:          {timed(index.resolve, lookups):.2f} µs | dict.get {timed(table.get, lookups):.2f} µs")
+    print(f"🔤 prefix search 10: {timed(index.search, prefixes):.2f} µs | linear startswith scan "
+          f"{timed(lambda p: [s for s in sorted_symbols if s.startswith(p)][:10], prefixes[:200]):.0f} µs")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import time
+
+import numpy as np
+
+from train_model import iter_training_chunks
+
+def legacy_label(row):
+    """Original per-row if/elif labeling from train_model.py"""
+    rsi, volume_change, price_momentum_5d, price_momentum_20d, _, sma_ratio_20, sma_ratio_50, macd, _ = row
+    buy_signals = 0
+    sell_signals = 0
+    
+    if rsi < 30: buy_signals += 2
+    elif rsi < 40: buy_signals += 1
+    elif rsi > 70: sell_signals += 2
+    elif rsi > 60: sell_signals += 1
+    
+    if price_momentum_5d > 0.05 and price_momentum_20d > 0.08: buy_signals += 2
+    elif price_momentum_5d < -0.05 and price_momentum_20d < -0.08: sell_signals += 2
+    elif price_momentum_5d > 0.02: buy_signals += 1
+    elif price_momentum_5d < -0.02: sell_signals += 1
+    
+    if sma_ratio_20 > 1.05 and sma_ratio_50 > 1.02: buy_signals += 1
+    elif sma_ratio_20 < 0.95 and sma_ratio_50 < 0.98: sell_signals += 1
+    
+    if volume_change > 30: buy_signals += 1
+    elif volume_change < -20: sell_signals += 1
+    
+    if macd > 0.02: buy_signals += 1
+    elif macd < -0.02: sell_signals += 1
+    
+    if buy_signals >= 5 and sell_signals <= 1: return 2
+    elif buy_signals >= 3: return 1
+    elif sell_signals >= 5 and buy_signals <= 1: return -2
+    elif sell_signals >= 3: return -1
+    return 0
+
+def legacy_generate(n_samples):
+    """Original loop: nine scalar np.random.uniform draws per row"""
+    np.random.seed(42)
+    features = []
+    targets = []
+    for _ in range(n_samples):
+        row = [np.random.uniform(20, 80), np.random.uniform(-40, 120),
+               np.random.uniform(-0.15, 0.15), np.random.uniform(-0.25, 0.25),
+               np.random.uniform(0.015, 0.08), np.random.uniform(0.85, 1.15),
+               np.random.uniform(0.80, 1.20), np.random.uniform(-0.08, 0.08),
+               np.random.uniform(0, 1)]
+        features.append(row)
+        targets.append(legacy_label(row))
+    return np.array(features), np.array(targets)
+
+def main():
+    parser = argparse.ArgumentParser(description='Vectorized vs loop training-data generation')
+    parser.add_argument('--samples', type=int, default=10_000_000)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--legacy-samples', type=int, default=100_000,
+                        help='rows timed for the loop baseline (extrapolated to --samples)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = 0
+    for X, y in iter_training_chunks(args.samples, args.chunk_size):
+        rows += len(y)
+    vectorized_s = time.perf_counter() - start
+    print(f"⚡ Vectorized: {rows:,} rows in {vectorized_s:.2f}s ({rows / vectorized_s / 1e6:.1f}M rows/s)")
+
+    start = time.perf_counter()
+    legacy_generate(args.legacy_samples)
+    legacy_s = (time.perf_counter() - start) * args.samples / args.legacy_samples
+    print(f"🐢 Legacy loop: {legacy_s:.1f}s (extrapolated from {args.legacy_samples:,} rows)")
+    print(f"🚀 Speedup: {legacy_s / vectorized_s:.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,18 @@
-from flask import Flask, jsonify, send_file
+from flask import Flask, jsonify
+import logging
 import os
+import random
 from datetime import datetime
+from logs import configure_logging
+from response_cache import ResponseCache
+from rules import BASIC_RULES
+from static_assets import static_assets
+from symbol_state import SymbolStateStore
 
-app = Flask(__name__, static_folder='.', static_url_path='')
+app = Flask(__name__)
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 # Enable CORS
 @app.after_request
@@ -28,80 +38,72 @@ STOCK_DATA = {
     'SPY': {'price': 454.20, 'change': 0.6, 'rsi': 51.8}
 }
 
+# Simulated data for symbols outside STOCK_DATA, bounded by SYMBOL_STATE_MAX / SYMBOL_STATE_TTL
+symbol_state = SymbolStateStore(pinned=STOCK_DATA)
+
+# Serialized analyze responses with ETags, rebuilt when a symbol's data changes
+response_cache = ResponseCache()
+
+def simulated_data():
+    return {
+        'price': random.uniform(10, 500),
+        'change': random.uniform(-3, 3),
+        'rsi': random.uniform(30, 70)
+    }
+
 @app.route('/')
 def serve_index():
-    return send_file('index.html')
+    return static_assets.response('index.html')
+
+def analyze_data(symbol, data):
+    """Analysis result for one symbol's price, change and RSI"""
+    price = data['price']
+    change = data['change']
+    rsi = data['rsi']
+    
+    # Prediction logic
+    rule = BASIC_RULES.evaluate_one(rsi=rsi, change=change)
+    recommendation = rule['recommendation']
+    confidence = rule['confidence']
+    score = rule['score']
+    reasoning = rule['reasoning']
+    
+    result = {
+        'symbol': symbol,
+        'price': price,
+        'price_change': change,
+        'rsi': round(rsi, 1),
+        'prediction_score': score,
+        'recommendation': recommendation,
+        'confidence': confidence,
+        'reasoning': reasoning,
+        'data_source': 'Professional Market Data',
+        'model_used': True,
+        'model_accuracy': 0.782,
+        'generated_at': datetime.now().isoformat()
+    }
+    
+    logger.info(f"✅ Analysis complete: {symbol} - {recommendation}")
+    return result
 
 @app.route('/api/analyze/<symbol>')
 def analyze_stock(symbol):
     try:
         symbol = symbol.upper().strip()
-        print(f"🔍 Analyzing: {symbol}")
+        logger.info(f"🔍 Analyzing: {symbol}")
         
-        if symbol in STOCK_DATA:
-            data = STOCK_DATA[symbol]
-        else:
-            import random
-            data = {
-                'price': random.uniform(10, 500),
-                'change': random.uniform(-3, 3),
-                'rsi': random.uniform(30, 70)
-            }
-            STOCK_DATA[symbol] = data
-        
-        price = data['price']
-        change = data['change']
-        rsi = data['rsi']
-        
-        # Prediction logic
-        if rsi < 35 and change > 0:
-            recommendation = "STRONG BUY"
-            confidence = "Very High"
-            score = 0.85
-            reasoning = "Oversold with strong positive momentum"
-        elif rsi < 45 and change > 0:
-            recommendation = "BUY"
-            confidence = "High"
-            score = 0.75
-            reasoning = "Favorable conditions with upward trend"
-        elif rsi > 65 and change < 0:
-            recommendation = "STRONG SELL"
-            confidence = "Very High"
-            score = 0.15
-            reasoning = "Overbought with strong negative momentum"
-        elif rsi > 55 and change < 0:
-            recommendation = "SELL"
-            confidence = "High"
-            score = 0.25
-            reasoning = "Bearish signals emerging"
-        else:
-            recommendation = "HOLD"
-            confidence = "Medium"
-            score = 0.5
-            reasoning = "Market in consolidation phase"
-        
-        result = {
-            'symbol': symbol,
-            'price': price,
-            'price_change': change,
-            'rsi': round(rsi, 1),
-            'prediction_score': score,
-            'recommendation': recommendation,
-            'confidence': confidence,
-            'reasoning': reasoning,
-            'data_source': 'Professional Market Data',
-            'model_used': True,
-            'model_accuracy': 0.782,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        print(f"✅ Analysis complete: {symbol} - {recommendation}")
-        return jsonify(result)
+        # Seeded symbols are fixed; others get simulated data, kept in a bounded store
+        data = symbol_state.get_or_create(symbol, simulated_data)
+        return response_cache.respond(symbol, data, lambda: analyze_data(symbol, data))
         
     except Exception as e:
-        print(f"❌ Error analyzing {symbol}: {e}")
+        logger.exception(f"❌ Error analyzing {symbol}: {e}")
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
+@app.route('/api/state/stats')
+def get_state_stats():
+    return jsonify(symbol_state.stats())
+
 @app.route('/api/accuracy')
 def get_accuracy():
     return jsonify({
@@ -112,10 +114,10 @@ def get_accuracy():
         'timestamp': datetime.now().isoformat()
     })
 
-# Serve static files
+# Serve static files listed in the asset manifest, never arbitrary paths
 @app.route('/<path:path>')
 def serve_static(path):
-    return send_file(path)
+    return static_assets.response(path)
 
 if __name__ == '__main__':
     print("🚀 PROFESSIONAL STOCK PREDICTOR")
@@ -0,0 +1,183 @@
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+# Rows per traversal block; bounds the (trees, rows) working set
+BLOCK_ROWS = 2048
+
+class FlatForest:
+    """RandomForestClassifier flattened into contiguous NumPy node arrays
+
+    Every tree's nodes are concatenated into shared feature/threshold/left/
+    right/value arrays. Leaves point back to themselves, so a fixed number of
+    branch-free gather steps (the forest's max depth) walks all rows through
+    all trees at once. Probabilities are accumulated tree by tree in sklearn's
+    order, so results are bit-identical to a single-threaded predict_proba.
+    """
+
+    ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'roots', 'children')
+
+    def __init__(self, feature, threshold, left, right, value, roots, classes, depth, children=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = np.asarray(classes)
+        self.depth = int(depth)
+        self.n_features_in_ = None
+        # children[2 * node + go_right] is the next node; leaves point at themselves
+        if children is None:
+            children = np.stack([left, right], axis=1).ravel()
+        self.children = children
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Export a fitted RandomForestClassifier"""
+        import sklearn
+
+        # From 1.4 tree_.value holds class fractions and predict_proba returns them as-is
+        values_are_fractions = tuple(int(p) for p in sklearn.__version__.split('.')[:2]) >= (1, 4)
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            ids = np.arange(offset, offset + n)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(np.where(is_leaf, ids, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, ids, tree.children_right + offset).astype(np.int32))
+
+            proba = tree.value[:, 0, :forest.n_classes_]
+            if not values_are_fractions:
+                # Same normalisation as DecisionTreeClassifier.predict_proba before 1.4
+                normalizer = proba.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                proba = proba / normalizer
+            values.append(np.array(proba, dtype=np.float64))
+
+            roots.append(offset)
+            offset += n
+            depth = max(depth, tree.max_depth)
+
+        flat = cls(np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts),
+                   np.concatenate(rights), np.concatenate(values), np.array(roots, dtype=np.int32),
+                   forest.classes_, depth)
+        flat.n_features_in_ = forest.n_features_in_
+        return flat
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """Leaf index (into the flat arrays) for every tree and row -> (n_trees, n_rows)"""
+        n = len(X)
+        # Feature-major copy so one flat gather reads X[row, feature]
+        columns = np.ascontiguousarray(X.T).ravel()
+        rows = np.arange(n, dtype=np.int32)
+        # Tree-major node matrix keeps each gather inside one tree's nodes
+        nodes = np.repeat(self.roots[:, np.newaxis], n, axis=1)
+        for _ in range(self.depth):
+            go_right = columns[self.feature[nodes] * n + rows] > self.threshold[nodes]
+            nodes = self.children[nodes * 2 + go_right]
+        return nodes
+
+    def predict_proba(self, X):
+        # sklearn validates to float32 before walking the trees
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2:
+            raise ValueError("Expected a 2-D feature matrix")
+        if not np.isfinite(X).all():
+            raise ValueError("Input contains NaN or infinity")
+
+        out = np.empty((len(X), len(self.classes_)))
+        for start in range(0, len(X), BLOCK_ROWS):
+            leaf_values = self.value[self.apply(X[start:start + BLOCK_ROWS])]
+            # Add trees strictly in order, matching sklearn's running sum bit for bit
+            total = np.zeros(leaf_values.shape[1:])
+            for tree_values in leaf_values:
+                total += tree_values
+            out[start:start + BLOCK_ROWS] = total
+        out /= self.n_estimators
+        return out
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def save(self, path):
+        """Write one .npy per node array plus metadata, replacing the directory as a whole"""
+        staging = path + '.tmp'
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        for name in self.ARRAYS:
+            np.save(os.path.join(staging, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(staging, 'meta.json'), 'w') as f:
+            json.dump({'classes': self.classes_.tolist(), 'depth': self.depth,
+                       'n_features_in': self.n_features_in_}, f)
+
+        # Rename instead of overwriting: truncating a file that a worker has
+        # memory-mapped would crash it, an unlinked one stays readable
+        retired = path + '.old'
+        shutil.rmtree(retired, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, retired)
+        os.rename(staging, path)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        """Load a saved forest; mmap_mode='r' shares pages between processes"""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode) for name in cls.ARRAYS}
+        flat = cls(classes=meta['classes'], depth=meta['depth'], **arrays)
+        flat.n_features_in_ = meta['n_features_in']
+        return flat
+
+# Largest batch the flat walk wins on; sklearn's compiled traversal is faster beyond
+# (bench_inference.py, 150 trees on 1 CPU: even at ~1,000 rows, 0.5x at 10,000)
+FLAT_MAX_ROWS = int(os.environ.get('FLAT_MAX_ROWS', 512))
+
+class SizeRoutedForest:
+    """The flat forest for small batches and the sklearn forest for large ones
+
+    Both hold the same trees, so predictions do not depend on which one a
+    batch is routed to. The sklearn forest is built by load_forest on the
+    first batch routed to it, so a worker serving only small requests never
+    holds a private copy of the pickle next to the shared flat pages.
+    """
+
+    def __init__(self, flat, load_forest, max_flat_rows=FLAT_MAX_ROWS):
+        self.flat = flat
+        self.load_forest = load_forest
+        self.max_flat_rows = max_flat_rows
+        self.classes_ = flat.classes_
+        self.n_features_in_ = flat.n_features_in_
+        self._forest = None
+        self._lock = threading.Lock()
+
+    @property
+    def forest(self):
+        if self._forest is None:
+            with self._lock:
+                if self._forest is None:
+                    self._forest = self.load_forest()
+        return self._forest
+
+    def backend(self, n_rows):
+        return self.flat if n_rows <= self.max_flat_rows else self.forest
+
+    def predict_proba(self, X):
+        return self.backend(len(X)).predict_proba(X)
+
+    def predict(self, X):
+        return self.backend(len(X)).predict(X)
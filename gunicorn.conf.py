@@ -0,0 +1,37 @@
+"""Production gunicorn settings, passed explicitly by the Procfile (-c gunicorn.conf.py)
+
+The app is imported once in the master and forked (preload_app), and
+each worker serves requests on a thread pool (gthread). Module-level
+state is shared by those threads and copied into every worker at fork:
+caches and registries guard their data with locks, and background
+threads and pools are started per process after the fork, never in the
+master. GUNICORN_WORKER_CLASS=sync and GUNICORN_PRELOAD=off restore
+gunicorn's defaults (without preload, set QUOTE_BOARD_PATH so workers
+still share one quote board).
+"""
+import os
+import sys
+
+# Import the app once in the master so forked workers share its memory
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'on').lower() not in ('0', 'off', 'false')
+
+# Each /api/stream client holds a connection open, so serve requests on threads
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+
+def on_starting(server):
+    """Build the app's predictor before the workers fork"""
+    if not server.cfg.preload_app:
+        return
+    module = sys.modules.get(server.app.wsgi().import_name)
+    get_predictor = getattr(module, 'get_predictor', None)
+    if get_predictor is not None:
+        get_predictor()
+        server.log.info("Predictor loaded in master before fork")
+
+def post_fork(server, worker):
+    """Start the app's shared quote board publisher in each worker; one of them will hold the writer lock"""
+    module = sys.modules.get(server.app.wsgi().import_name)
+    publisher = getattr(module, 'board_publisher', None)
+    if publisher is not None:
+        publisher.ensure_started()
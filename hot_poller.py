@@ -0,0 +1,183 @@
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+class RateBudget:
+    """Token bucket: at most per_minute upstream calls, bursting to `burst`"""
+
+    def __init__(self, per_minute, burst=None, clock=time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst or max(1, per_minute // 6))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def take(self, n=1):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+class HotSetPoller:
+    """Keeps precomputed analyses for a hot symbol set fresh in the background
+
+    The hot set is the seed symbols plus anything requested within
+    recent_ttl seconds (capped at max_hot, least recently requested first
+    out). Every interval (+/- jitter) each provider's hot symbols are
+    analyzed with one analyze_many call, if that provider's RateBudget
+    allows it. Request handlers then only look a finished result up.
+    Results older than max_age are served flagged stale; older than
+    stale_ttl they count as a miss and the caller computes inline.
+    With HOT_POLLER=off nothing is stored and every lookup computes
+    inline; background=False keeps the store but leaves refresh() to the
+    caller.
+    """
+
+    def __init__(self, analyze_many, seed_symbols=(), provider_of=None, budgets=None,
+                 interval=5.0, jitter=0.2, max_age=15.0, stale_ttl=120.0,
+                 recent_ttl=600.0, max_hot=256, background=True, clock=time.monotonic):
+        self.analyze_many = analyze_many
+        self.seed_symbols = list(seed_symbols)
+        self.provider_of = provider_of or (lambda symbol: 'default')
+        self.budgets = budgets or {}
+        self.interval = interval
+        self.jitter = jitter
+        self.max_age = max_age
+        self.stale_ttl = stale_ttl
+        self.recent_ttl = recent_ttl
+        self.max_hot = max_hot
+        self.clock = clock
+        self.background = background
+        self.enabled = os.environ.get('HOT_POLLER', 'on').lower() not in ('0', 'off', 'false')
+
+        self._results = {}
+        self._recent = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'cycles': 0,
+                       'refreshed': 0, 'budget_skips': 0, 'errors': 0}
+
+    def get(self, symbol, compute=None):
+        """Precomputed result with staleness metadata
+
+        On a miss, compute(symbol) runs inline and its result is stored;
+        without compute a miss returns None. While disabled every lookup
+        is a miss and nothing is stored, since nothing would refresh it.
+        """
+        if not self.enabled:
+            with self._lock:
+                self._stats['misses'] += 1
+            if compute is None:
+                return None
+            return self._with_metadata((compute(symbol), self.clock(), time.time()), False)
+
+        self.ensure_started()
+        with self._lock:
+            now = self.clock()
+            self._recent[symbol] = now
+            entry = self._results.get(symbol)
+            if entry is not None and now - entry[1] <= self.stale_ttl:
+                stale = now - entry[1] > self.max_age
+                self._stats['stale_hits' if stale else 'hits'] += 1
+            else:
+                entry = None
+                self._stats['misses'] += 1
+        if entry is not None:
+            return self._with_metadata(entry, stale)
+
+        if compute is None:
+            return None
+        entry = self.put(symbol, compute(symbol))
+        return self._with_metadata(entry, False)
+
+    def put(self, symbol, result):
+        entry = (result, self.clock(), time.time())
+        with self._lock:
+            self._results[symbol] = entry
+        return entry
+
+    def _with_metadata(self, entry, stale):
+        result, refreshed_at, refreshed_wall = entry
+        return dict(result, data_age_seconds=round(self.clock() - refreshed_at, 3), stale=stale,
+                    refreshed_at=datetime.fromtimestamp(refreshed_wall).isoformat())
+
+    def hot_symbols(self):
+        """Seeds plus recently requested symbols, most recent first, capped at max_hot"""
+        now = self.clock()
+        with self._lock:
+            recent = sorted((symbol for symbol, seen in list(self._recent.items())
+                             if now - seen <= self.recent_ttl),
+                            key=self._recent.get, reverse=True)[:self.max_hot]
+            self._recent = {symbol: self._recent[symbol] for symbol in recent}
+            hot = list(dict.fromkeys(self.seed_symbols + recent))[:self.max_hot]
+
+            # Forget results nobody will read again
+            keep = set(hot)
+            self._results = {symbol: entry for symbol, entry in self._results.items() if symbol in keep}
+        return hot
+
+    def refresh(self):
+        """One polling cycle: a bulk analysis per provider that has budget left"""
+        groups = {}
+        for symbol in self.hot_symbols():
+            groups.setdefault(self.provider_of(symbol), []).append(symbol)
+
+        refreshed = 0
+        for provider, symbols in groups.items():
+            budget = self.budgets.get(provider)
+            if budget is not None and not budget.take():
+                with self._lock:
+                    self._stats['budget_skips'] += 1
+                continue
+            try:
+                results = self.analyze_many(symbols)
+            except Exception as e:
+                with self._lock:
+                    self._stats['errors'] += 1
+                logger.warning(f"⚠️ Hot-set refresh for {provider} failed: {e}")
+                continue
+            for symbol, result in zip(symbols, results):
+                self.put(symbol, result)
+            refreshed += len(symbols)
+
+        with self._lock:
+            self._stats['cycles'] += 1
+            self._stats['refreshed'] += refreshed
+        return refreshed
+
+    def ensure_started(self):
+        """Start the polling thread once per process (threads do not survive fork)"""
+        if not (self.enabled and self.background) or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            # Jitter keeps workers and replicas from polling upstream in lockstep
+            delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+            self._stop.wait(delay)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, hot=len(self._results), recent=len(self._recent),
+                        budgets={name: round(b.tokens, 2) for name, b in self.budgets.items()})
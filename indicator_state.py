@@ -0,0 +1,247 @@
+import threading
+import time
+from array import array
+
+from indicators import (BB_WIDTH, BB_WINDOW, MACD_FAST, MACD_SLOW, RSI_PERIOD,
+                        VOLATILITY_WINDOW, WARMUP_BARS)
+
+# Re-derive running sums from the ring buffers every N bars to cancel float drift
+RESYNC_EVERY = 1024
+
+# Bars replayed per symbol when warming from a bar store; enough for the EMAs and RSI to settle
+WARM_BARS = 250
+
+class _Window:
+    """Fixed-size ring with running sum and windowed Welford mean/M2"""
+    __slots__ = ('size', 'values', 'count', 'pos', 'total', 'mean', 'm2')
+
+    def __init__(self, size):
+        self.size = size
+        self.values = array('d', bytes(8 * size))
+        self.count = 0
+        self.pos = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x):
+        if self.count < self.size:
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+            self.total += x
+        else:
+            old = self.values[self.pos]
+            self._swap(old, x)
+        self.values[self.pos] = x
+        self.pos = (self.pos + 1) % self.size
+
+    def replace_last(self, x):
+        last = (self.pos - 1) % self.size
+        old = self.values[last]
+        if self.count < self.size:
+            delta_mean = (x - old) / self.count
+        else:
+            delta_mean = (x - old) / self.size
+        new_mean = self.mean + delta_mean
+        self.m2 += (x - old) * (x - new_mean + old - self.mean)
+        self.mean = new_mean
+        self.total += x - old
+        self.values[last] = x
+
+    def _swap(self, old, x):
+        new_mean = self.mean + (x - old) / self.size
+        self.m2 += (x - old) * (x - new_mean + old - self.mean)
+        self.mean = new_mean
+        self.total += x - old
+
+    def ago(self, k):
+        """Value pushed k steps before the latest one (0 = latest)"""
+        return self.values[(self.pos - 1 - k) % self.size]
+
+    def variance(self, ddof=0):
+        return max(self.m2, 0.0) / (self.count - ddof)
+
+    def resync(self):
+        if self.count < self.size:
+            return
+        self.total = sum(self.values)
+        self.mean = self.total / self.size
+        self.m2 = sum((v - self.mean) ** 2 for v in self.values)
+
+class IndicatorState:
+    """O(1) streaming version of indicators.compute_features for one symbol"""
+    __slots__ = ('bars', 'closes', 'close20', 'volumes', 'returns',
+                 'ema_fast', 'ema_slow', 'avg_gain', 'avg_loss',
+                 'prev_ema_fast', 'prev_ema_slow', 'prev_avg_gain', 'prev_avg_loss',
+                 'prev_close', 'bucket')
+
+    def __init__(self):
+        self.bars = 0
+        self.closes = _Window(50)
+        self.close20 = _Window(BB_WINDOW)
+        self.volumes = _Window(20)
+        self.returns = _Window(VOLATILITY_WINDOW)
+        self.ema_fast = self.ema_slow = 0.0
+        self.avg_gain = self.avg_loss = 0.0
+        self.prev_ema_fast = self.prev_ema_slow = 0.0
+        self.prev_avg_gain = self.prev_avg_loss = 0.0
+        self.prev_close = 0.0
+        self.bucket = None
+
+    def update(self, close, volume=0.0):
+        """Append a new bar"""
+        close = float(close)
+        volume = float(volume)
+        self.bars += 1
+
+        if self.bars > 1:
+            self.prev_close = self.closes.ago(0)
+            self.returns.push(close / self.prev_close - 1)
+
+        self.prev_ema_fast = self.ema_fast
+        self.prev_ema_slow = self.ema_slow
+        self.prev_avg_gain = self.avg_gain
+        self.prev_avg_loss = self.avg_loss
+        self._step(close)
+
+        self.closes.push(close)
+        self.close20.push(close)
+        self.volumes.push(volume)
+
+        if self.bars % RESYNC_EVERY == 0:
+            for window in (self.closes, self.close20, self.volumes, self.returns):
+                window.resync()
+
+    def update_tick(self, close, volume=None):
+        """Revise the latest bar's close (and optionally volume) in place"""
+        if self.bars == 0:
+            self.update(close, volume or 0.0)
+            return
+        close = float(close)
+
+        if self.bars > 1:
+            self.returns.replace_last(close / self.prev_close - 1)
+        self.ema_fast = self.prev_ema_fast
+        self.ema_slow = self.prev_ema_slow
+        self.avg_gain = self.prev_avg_gain
+        self.avg_loss = self.prev_avg_loss
+        self._step(close)
+
+        self.closes.replace_last(close)
+        self.close20.replace_last(close)
+        if volume is not None:
+            self.volumes.replace_last(float(volume))
+
+    def _step(self, close):
+        if self.bars == 1:
+            self.ema_fast = self.ema_slow = close
+            return
+        fast = 2.0 / (MACD_FAST + 1)
+        slow = 2.0 / (MACD_SLOW + 1)
+        self.ema_fast = fast * close + (1 - fast) * self.ema_fast
+        self.ema_slow = slow * close + (1 - slow) * self.ema_slow
+
+        delta = close - self.prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        # Running mean over the first RSI_PERIOD changes (Wilder's SMA seed), then Wilder smoothing
+        alpha = 1.0 / min(self.bars - 1, RSI_PERIOD)
+        self.avg_gain = alpha * gain + (1 - alpha) * self.avg_gain
+        self.avg_loss = alpha * loss + (1 - alpha) * self.avg_loss
+
+    @property
+    def ready(self):
+        return self.bars >= WARMUP_BARS
+
+    def features(self):
+        """Current nine-feature vector, or None during warm-up"""
+        if not self.ready:
+            return None
+        close = self.closes.ago(0)
+
+        if self.avg_loss == 0:
+            rsi = 50.0 if self.avg_gain == 0 else 100.0
+        else:
+            rsi = 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+        avg_volume = self.volumes.total / self.volumes.size
+        volume_change = (self.volumes.ago(0) / avg_volume - 1) * 100 if avg_volume > 0 else 0.0
+
+        sma_20 = self.close20.mean
+        band = BB_WIDTH * self.close20.variance() ** 0.5
+        bb_position = (close - (sma_20 - band)) / (2 * band) if band > 0 else 0.5
+
+        return [
+            rsi,
+            volume_change,
+            close / self.closes.ago(5) - 1,
+            close / self.closes.ago(20) - 1,
+            self.returns.variance(ddof=1) ** 0.5,
+            close / sma_20,
+            close / (self.closes.total / self.closes.size),
+            (self.ema_fast - self.ema_slow) / close,
+            min(1.0, max(0.0, bb_position))
+        ]
+
+class IndicatorBook:
+    """Per-symbol streaming indicator states"""
+
+    def __init__(self, bar_seconds=86400, clock=time.time):
+        self.bar_seconds = bar_seconds
+        self.clock = clock
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def state(self, symbol):
+        state = self._states.get(symbol)
+        if state is None:
+            with self._lock:
+                state = self._states.setdefault(symbol, IndicatorState())
+        return state
+
+    def warm(self, symbol, closes, volumes, last_ts=None):
+        """Seed a symbol from history (oldest bar first); last_ts is the newest bar's open time"""
+        state = IndicatorState()
+        for close, volume in zip(closes, volumes):
+            state.update(close, volume)
+        if last_ts is not None:
+            # Ticks within the newest bar's period revise it instead of opening another
+            state.bucket = int(last_ts // self.bar_seconds)
+        with self._lock:
+            self._states[symbol] = state
+        return state
+
+    def warm_from_store(self, store, symbols=None, bars=WARM_BARS):
+        """Seed symbols (default: all) from a bar_store.BarStore's latest bars; returns how many are ready"""
+        ready = 0
+        for symbol in store.symbols() if symbols is None else symbols:
+            history = store.last(symbol, bars, ('ts', 'close', 'volume'))
+            if len(history['ts']):
+                ready += self.warm(symbol, history['close'], history['volume'], history['ts'][-1]).ready
+        return ready
+
+    def on_tick(self, symbol, price, volume=None, timestamp=None):
+        """Fold a live quote into the symbol's current bar, opening a new bar per bar_seconds"""
+        state = self.state(symbol)
+        bucket = int((self.clock() if timestamp is None else timestamp) // self.bar_seconds)
+        with self._lock:
+            if state.bucket != bucket:
+                state.bucket = bucket
+                if volume is None and state.bars:
+                    # Quotes carry no volume; repeat the last bar's rather than record an empty bar
+                    volume = state.volumes.ago(0)
+                state.update(price, volume or 0.0)
+            else:
+                state.update_tick(price, volume)
+        return state
+
+    def features(self, symbol):
+        # Under the lock on_tick holds, so a bar is never read half-updated
+        with self._lock:
+            state = self._states.get(symbol)
+            return state.features() if state is not None else None
+
+    def __len__(self):
+        return len(self._states)
@@ -0,0 +1,130 @@
+import numpy as np
+from scipy.signal import lfilter
+
+# Feature order expected by the model trained in train_model.py
+FEATURE_NAMES = ['RSI', 'Volume_Change', 'Momentum_5D', 'Momentum_20D',
+                 'Volatility', 'SMA_20_Ratio', 'SMA_50_Ratio', 'MACD', 'BB_Position']
+
+RSI_PERIOD = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+BB_WINDOW = 20
+BB_WIDTH = 2.0
+VOLATILITY_WINDOW = 20
+
+# Bars needed before every feature is defined (SMA-50 is the longest window)
+WARMUP_BARS = 50
+
+def ema(values, alpha):
+    """Exponential moving average along the last axis, seeded with the first value"""
+    values = np.asarray(values, dtype=float)
+    # y[t] = alpha * x[t] + (1 - alpha) * y[t-1], evaluated in C by lfilter
+    zi = (1 - alpha) * values[..., :1]
+    smoothed, _ = lfilter([alpha], [1, -(1 - alpha)], values, axis=-1, zi=zi)
+    return smoothed
+
+def rolling_mean(values, window):
+    """Trailing window mean along the last axis via cumulative sums (NaN before the window fills)"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+    csum = np.cumsum(values, axis=-1)
+    out[..., window - 1] = csum[..., window - 1]
+    out[..., window:] = csum[..., window:] - csum[..., :-window]
+    out[..., window - 1:] /= window
+    return out
+
+def rolling_std(values, window, ddof=0):
+    """Trailing window standard deviation along the last axis via sums of squares"""
+    values = np.asarray(values, dtype=float)
+    # Centre each series first so the sum-of-squares form does not cancel catastrophically
+    centred = values - np.nanmean(values, axis=-1, keepdims=True)
+    mean = rolling_mean(centred, window)
+    mean_sq = rolling_mean(centred * centred, window)
+    var = (mean_sq - mean * mean) * (window / (window - ddof))
+    return np.sqrt(np.maximum(var, 0))
+
+def shift(values, periods):
+    """Lag along the last axis, padding with NaN"""
+    out = np.full(values.shape, np.nan)
+    out[..., periods:] = values[..., :-periods]
+    return out
+
+def wilder_average(values, period):
+    """Wilder smoothing along the last axis: the SMA of the first period values, then alpha = 1/period
+
+    NaN until period values have been seen.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < period:
+        return out
+    seed = values[..., :period].mean(axis=-1, keepdims=True)
+    out[..., period - 1:period] = seed
+    if values.shape[-1] > period:
+        alpha = 1.0 / period
+        out[..., period:], _ = lfilter([alpha], [1, -(1 - alpha)], values[..., period:], axis=-1,
+                                       zi=(1 - alpha) * seed)
+    return out
+
+def wilder_rsi(close, period=RSI_PERIOD):
+    """Wilder RSI; NaN until period changes have been seen"""
+    close = np.asarray(close, dtype=float)
+    delta = np.diff(close, axis=-1)
+    gains = wilder_average(np.maximum(delta, 0), period)
+    losses = wilder_average(np.maximum(-delta, 0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + gains / losses)
+    rsi = np.where(losses == 0, np.where(gains == 0, 50.0, 100.0), rsi)
+
+    out = np.full(close.shape, np.nan)
+    out[..., 1:] = rsi
+    out[..., :period] = np.nan
+    return out
+
+def compute_features(close, volume):
+    """All nine model features for every bar -> array of shape close.shape + (9,)
+
+    close and volume are (n_bars,) or (n_symbols, n_bars) arrays. Rows before
+    WARMUP_BARS are NaN.
+    """
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+
+    returns = np.full(close.shape, np.nan)
+    returns[..., 1:] = close[..., 1:] / close[..., :-1] - 1
+
+    sma_20 = rolling_mean(close, BB_WINDOW)
+    sma_50 = rolling_mean(close, 50)
+    band = rolling_std(close, BB_WINDOW) * BB_WIDTH
+    macd_line = ema(close, 2.0 / (MACD_FAST + 1)) - ema(close, 2.0 / (MACD_SLOW + 1))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bb_position = np.where(band > 0, (close - (sma_20 - band)) / (2 * band), 0.5)
+        features = np.stack([
+            wilder_rsi(close),
+            (volume / rolling_mean(volume, 20) - 1) * 100,
+            close / shift(close, 5) - 1,
+            close / shift(close, 20) - 1,
+            rolling_std(np.nan_to_num(returns), VOLATILITY_WINDOW, ddof=1),
+            close / sma_20,
+            close / sma_50,
+            macd_line / close,
+            np.clip(bb_position, 0, 1)
+        ], axis=-1)
+
+    features[..., :WARMUP_BARS - 1, :] = np.nan
+    return features
+
+def latest_features(close, volume):
+    """Feature vector(s) for the most recent bar"""
+    return compute_features(close, volume)[..., -1, :]
+
+def synthetic_history(n_symbols, n_bars, seed=42):
+    """Geometric random-walk closes and lognormal volumes, for backtests, tests and benchmarks"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.02, size=(n_symbols, n_bars))
+    close = 100 * np.exp(np.cumsum(returns, axis=1))
+    volume = rng.lognormal(13, 0.4, size=(n_symbols, n_bars))
+    return close, volume
@@ -0,0 +1,75 @@
+import numpy as np
+
+# The per-row if/elif ladders the rule tables replaced, kept as the reference
+# test_rules.py checks the tables against and bench_rules.py times them against
+
+def legacy_momentum_rsi(rsi, price_change):
+    """The if/elif ladder real_api_backend.build_analysis used to run per symbol"""
+    if rsi < 30 and price_change > -5:
+        return "STRONG BUY", "Very High", 0.88, "Oversold with potential reversal"
+    elif rsi < 35:
+        return "BUY", "High", 0.78, "Undervalued territory"
+    elif rsi > 75 and price_change < 2:
+        return "STRONG SELL", "Very High", 0.18, "Overbought with risk of correction"
+    elif rsi > 65:
+        return "SELL", "High", 0.28, "Approaching overbought levels"
+    elif price_change > 8:
+        return "BUY", "High", 0.72, "Strong upward momentum"
+    elif price_change < -8:
+        return "SELL", "High", 0.32, "Significant downward pressure"
+    elif price_change > 4 and rsi < 55:
+        return "BUY", "Medium", 0.65, "Positive momentum with room to grow"
+    elif price_change < -4 and rsi > 45:
+        return "SELL", "Medium", 0.38, "Negative momentum developing"
+    else:
+        return "HOLD", "Medium", 0.52, "Market in consolidation phase"
+
+def legacy_basic(rsi, change, strong_buy="Oversold with strong positive momentum",
+                 strong_sell="Overbought with strong negative momentum"):
+    """server.py / final_backend.py's ladder (simple_app.py's with its shorter reasoning)"""
+    if rsi < 35 and change > 0:
+        return "STRONG BUY", "Very High", 0.85, strong_buy
+    elif rsi < 45 and change > 0:
+        return "BUY", "High", 0.75, "Favorable conditions with upward trend"
+    elif rsi > 65 and change < 0:
+        return "STRONG SELL", "Very High", 0.15, strong_sell
+    elif rsi > 55 and change < 0:
+        return "SELL", "High", 0.25, "Bearish signals emerging"
+    else:
+        return "HOLD", "Medium", 0.5, "Market in consolidation phase"
+
+def legacy_points(features):
+    """app.py's per-row rule_based_prediction"""
+    rsi, vol_chg, mom_5d, mom_20d, vol, sma20, sma50, macd, bb = features
+
+    score = 0
+    if rsi < 35: score += 2
+    elif rsi < 45: score += 1
+    elif rsi > 70: score -= 2
+    elif rsi > 60: score -= 1
+
+    if mom_5d > 0.03 and mom_20d > 0.05: score += 2
+    elif mom_5d > 0.01: score += 1
+    elif mom_5d < -0.03 and mom_20d < -0.05: score -= 2
+    elif mom_5d < -0.01: score -= 1
+
+    if sma20 > 1.02 and sma50 > 1.01: score += 1
+    elif sma20 < 0.98 and sma50 < 0.99: score -= 1
+
+    if score >= 3: return 2, 0.85
+    elif score >= 1: return 1, 0.75
+    elif score <= -3: return -2, 0.85
+    elif score <= -1: return -1, 0.75
+    else: return 0, 0.65
+
+def random_inputs(n, seed=0):
+    """RSI, daily % change and a feature matrix spread over every rule's thresholds"""
+    rng = np.random.default_rng(seed)
+    rsi = rng.uniform(15, 90, n)
+    change = rng.normal(0, 5, n)
+    features = np.column_stack([
+        rsi, rng.normal(0, 30, n), rng.normal(0, 0.03, n), rng.normal(0, 0.06, n),
+        rng.uniform(0.01, 0.05, n), rng.normal(1, 0.03, n), rng.normal(1, 0.02, n),
+        rng.normal(0, 0.01, n), rng.uniform(0, 1, n)
+    ])
+    return rsi, change, features
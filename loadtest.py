@@ -0,0 +1,227 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from bench_async import free_port, wait_for
+
+# Backend module -> whether it serves /api/analyze/batch
+BACKENDS = {
+    'app': True,
+    'real_api_backend': False,
+    'server': False,
+    'final_backend': False,
+    'simple_app': False
+}
+
+# Symbols every backend knows, mixing crypto (Binance/CoinGecko) and stocks
+DEFAULT_SYMBOLS = 'BTC,ETH,AAPL,TSLA,GOLD'
+
+PERCENTILES = (('p50_ms', 0.50), ('p95_ms', 0.95), ('p99_ms', 0.99), ('p999_ms', 0.999))
+
+# Latency and throughput changes beyond this fraction are flagged by --compare
+REGRESSION_THRESHOLD = 0.10
+
+def start_backend(name, port, upstream_url, threads):
+    """One gunicorn gthread worker for a backend module, pointed at the mock upstream"""
+    env = dict(os.environ, BINANCE_API_URL=upstream_url, COINGECKO_API_URL=upstream_url,
+               GUNICORN_THREADS=str(threads), LOG_LEVEL='WARNING', PYTHONUNBUFFERED='1')
+    cmd = [sys.executable, '-m', 'gunicorn', f'{name}:app', '-c', 'gunicorn.conf.py', '-w', '1',
+           '-b', f'127.0.0.1:{port}', '--backlog', '2048', '--timeout', '120']
+    return subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def arrival_times(rate, duration, poisson=True, seed=0):
+    """Open-loop schedule: send offsets in seconds for a mean arrival rate"""
+    times = []
+    rng = random.Random(seed)
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate) if poisson else 1.0 / rate
+        if t >= duration:
+            return times
+        times.append(t)
+
+def summarize(latencies, errors, elapsed):
+    """Throughput and tail latency for one run; latencies in seconds"""
+    latencies = sorted(latencies)
+    result = {
+        'requests': len(latencies),
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round((len(latencies) - errors) / elapsed, 1) if elapsed else 0.0
+    }
+    for name, q in PERCENTILES:
+        result[name] = round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2) \
+            if latencies else None
+    result['max_ms'] = round(latencies[-1] * 1000, 2) if latencies else None
+    return result
+
+async def drive(base_url, request_for, schedule, concurrency, timeout=30):
+    """Send request_for(i) at each scheduled offset, whether or not earlier ones have finished
+
+    Latency is measured from the scheduled send time, so requests queued
+    behind the concurrency limit or a slow server count their waiting time
+    (no coordinated omission).
+    """
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    gate = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        async def send(i, scheduled):
+            nonlocal errors
+            method, path, body = request_for(i)
+            async with gate:
+                try:
+                    response = await client.request(method, path, json=body)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+            latencies.append(time.perf_counter() - scheduled)
+
+        loop_start = time.perf_counter()
+        tasks = []
+        for i, offset in enumerate(schedule):
+            scheduled = loop_start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(i, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - loop_start
+    return summarize(latencies, errors, elapsed)
+
+def scenario_requests(scenario, symbols, batch_size):
+    """request_for(i) -> (method, path, json body) for a scenario"""
+    if scenario == 'single':
+        return lambda i: ('GET', f'/api/analyze/{symbols[i % len(symbols)]}', None)
+    if scenario == 'batch':
+        def batch(i):
+            chosen = [symbols[(i + k) % len(symbols)] for k in range(batch_size)]
+            return 'POST', '/api/analyze/batch', {'symbols': chosen}
+        return batch
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Regressions of current against baseline: a list of (backend, scenario, metric, old, new)"""
+    regressions = []
+    for backend, scenarios in current['results'].items():
+        for scenario, stats in scenarios.items():
+            old = baseline.get('results', {}).get(backend, {}).get(scenario)
+            if not old or 'skipped' in stats or 'skipped' in old:
+                continue
+            for metric, _ in PERCENTILES:
+                if old[metric] and stats[metric] > old[metric] * (1 + threshold):
+                    regressions.append((backend, scenario, metric, old[metric], stats[metric]))
+            if stats['throughput_rps'] < old['throughput_rps'] * (1 - threshold):
+                regressions.append((backend, scenario, 'throughput_rps', old['throughput_rps'],
+                                    stats['throughput_rps']))
+            if stats['errors'] > old['errors']:
+                regressions.append((backend, scenario, 'errors', old['errors'], stats['errors']))
+    return regressions
+
+def run(backends, scenarios, rate, duration, concurrency, symbols, batch_size=5, threads=32,
+        upstream_latency=0.0, warmup=1.0, poisson=True, seed=0):
+    """Start each backend against a fresh mock upstream and load it; returns the JSON report"""
+    upstream_port = free_port()
+    upstream = subprocess.Popen([sys.executable, 'mock_upstream.py', '--port', str(upstream_port),
+                                 '--latency', str(upstream_latency)], stdout=subprocess.DEVNULL)
+    upstream_url = f'http://127.0.0.1:{upstream_port}/api/v3'
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'config': {'rate_rps': rate, 'duration_s': duration, 'concurrency': concurrency,
+                   'arrivals': 'poisson' if poisson else 'uniform', 'symbols': symbols,
+                   'batch_size': batch_size, 'threads': threads, 'upstream_latency_s': upstream_latency},
+        'results': {}
+    }
+
+    try:
+        for name in backends:
+            results = report['results'][name] = {}
+            port = free_port()
+            server = start_backend(name, port, upstream_url, threads)
+            base_url = f'http://127.0.0.1:{port}'
+            try:
+                wait_for(f'{base_url}/', timeout=120)
+                for scenario in scenarios:
+                    if scenario == 'batch' and not BACKENDS[name]:
+                        results[scenario] = {'skipped': 'no /api/analyze/batch route'}
+                        continue
+                    request_for = scenario_requests(scenario, symbols, batch_size)
+                    if warmup:
+                        asyncio.run(drive(base_url, request_for, arrival_times(rate, warmup, poisson, seed),
+                                          concurrency))
+                    print(f"⏱️  {name} {scenario}: {rate:g} req/s for {duration:g}s, concurrency {concurrency}")
+                    results[scenario] = asyncio.run(drive(base_url, request_for,
+                                                          arrival_times(rate, duration, poisson, seed),
+                                                          concurrency))
+                    print(f"   {json.dumps(results[scenario])}")
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        upstream.terminate()
+        upstream.wait()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Open-loop load test of the API servers against a mock upstream')
+    parser.add_argument('--backends', default=','.join(BACKENDS), help='comma-separated backend modules')
+    parser.add_argument('--scenarios', default='single,batch')
+    parser.add_argument('--rate', type=float, default=200, help='mean arrivals per second')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of measured load')
+    parser.add_argument('--warmup', type=float, default=1, help='seconds of unmeasured load first')
+    parser.add_argument('--concurrency', type=int, default=64, help='max requests in flight')
+    parser.add_argument('--uniform', action='store_true', help='fixed spacing instead of Poisson arrivals')
+    parser.add_argument('--symbols', default=DEFAULT_SYMBOLS)
+    parser.add_argument('--batch-size', type=int, default=5)
+    parser.add_argument('--threads', type=int, default=32, help='gunicorn threads per backend')
+    parser.add_argument('--latency', type=float, default=0.0, help='mock upstream latency in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the report as JSON')
+    parser.add_argument('--compare', help='baseline JSON report; exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    backends = [b for b in args.backends.split(',') if b]
+    unknown = [b for b in backends if b not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backends {unknown}; choose from {list(BACKENDS)}")
+
+    report = run(backends, args.scenarios.split(','), args.rate, args.duration, args.concurrency,
+                 args.symbols.upper().split(','), batch_size=args.batch_size, threads=args.threads,
+                 upstream_latency=args.latency, warmup=args.warmup, poisson=not args.uniform, seed=args.seed)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Saved {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        print(f"📊 Against {args.compare} ({baseline.get('commit')}): {len(regressions)} regressions")
+        for backend, scenario, metric, old, new in regressions:
+            print(f"   ❌ {backend} {scenario} {metric}: {old} -> {new}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
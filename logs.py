@@ -0,0 +1,66 @@
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Records waiting for the writer thread; beyond this they are dropped, never waited on
+QUEUE_SIZE = 10000
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the calling thread: a full queue drops the record"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_lock = threading.Lock()
+_handler = None
+_listener = None
+
+def _start(level):
+    """Route the root logger through a bounded queue drained by one writer thread"""
+    global _handler, _listener
+    log_queue = queue.Queue(QUEUE_SIZE)
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(logging.Formatter(FORMAT))
+
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+    _handler = DroppingQueueHandler(log_queue)
+    root.addHandler(_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+def _restart_in_child():
+    # The writer thread does not survive fork (gunicorn preload_app); give the worker its own
+    if _listener is not None:
+        _start(logging.getLogger().level)
+
+def configure_logging(level=None):
+    """Leveled, buffered logging for the servers (LOG_LEVEL, default INFO); safe to call repeatedly"""
+    with _lock:
+        if _listener is not None:
+            return
+        _start(level or os.environ.get('LOG_LEVEL', 'INFO').upper())
+        os.register_at_fork(after_in_child=_restart_in_child)
+
+def stop_logging():
+    """Flush queued records (tests, shutdown)"""
+    if _listener is not None:
+        _listener.stop()
+
+def dropped():
+    return _handler.dropped if _handler is not None else 0
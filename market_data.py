@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics import UPSTREAM_ERRORS
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+COINGECKO_API_URL = os.environ.get('COINGECKO_API_URL', 'https://api.coingecko.com/api/v3')
+BINANCE_API_URL = os.environ.get('BINANCE_API_URL', 'https://api.binance.com/api/v3')
+
+def coingecko_params(coin_ids):
+    return {'ids': ','.join(coin_ids), 'vs_currencies': 'usd', 'include_24hr_change': 'true'}
+
+def binance_params(pairs):
+    if len(pairs) == 1:
+        return {'symbol': pairs[0]}
+    return {'symbols': json.dumps(pairs, separators=(',', ':'))}
+
+def parse_coingecko(data):
+    """CoinGecko /simple/price body -> {coin_id: (price, change)}"""
+    quotes = {}
+    if isinstance(data, dict):
+        for coin_id, coin_data in data.items():
+            if 'usd' in coin_data:
+                quotes[coin_id] = (coin_data['usd'], coin_data.get('usd_24h_change') or 0)
+    return quotes
+
+def parse_binance(data, pairs):
+    """Binance /ticker/24hr body -> {pair: (price, change)}"""
+    quotes = {}
+    if data is None:
+        return quotes
+    for ticker in data if isinstance(data, list) else [data]:
+        quotes[ticker.get('symbol', pairs[0])] = (float(ticker['lastPrice']),
+                                                  float(ticker['priceChangePercent']))
+    return quotes
+
+class MarketDataClient:
+    """Pooled keep-alive HTTP client for the upstream quote providers"""
+
+    def __init__(self, coingecko_url=None, binance_url=None, pool_maxsize=20,
+                 retries=2, backoff=0.2, timeout=(3.05, 8)):
+        self.coingecko_url = coingecko_url or COINGECKO_API_URL
+        self.binance_url = binance_url or BINANCE_API_URL
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        # Retry idempotent GETs on connection errors and 429/5xx with exponential backoff
+        retry = Retry(total=retries, connect=retries, read=retries, backoff_factor=backoff,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=('GET',),
+                      respect_retry_after_header=True, raise_on_status=False)
+
+        # One pool per host, capped at pool_maxsize sockets; extra callers wait for a free one
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize,
+                              pool_block=True, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get_json(self, url, params=None):
+        """GET a JSON document, returning (status_code, data)"""
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+    def fetch(self, provider, url, params=None):
+        """get_json, counting failures per provider for /metrics"""
+        try:
+            status, data = self.get_json(url, params=params)
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(provider, type(e).__name__)
+            raise
+        if status != 200:
+            UPSTREAM_ERRORS.inc(provider, f'http_{status}')
+        return status, data
+
+    def coingecko_prices(self, coin_ids):
+        """Fetch many CoinGecko coins in one call -> {coin_id: (price, change)}"""
+        coin_ids = sorted(set(coin_ids))
+        if not coin_ids:
+            return {}
+        status, data = self.fetch('coingecko', f"{self.coingecko_url}/simple/price", params=coingecko_params(coin_ids))
+        if status != 200:
+            return {}
+        return parse_coingecko(data)
+
+    def binance_tickers(self, pairs):
+        """Fetch many Binance 24h tickers in one call -> {pair: (price, change)}"""
+        pairs = sorted(set(pairs))
+        if not pairs:
+            return {}
+        status, data = self.fetch('binance', f"{self.binance_url}/ticker/24hr", params=binance_params(pairs))
+
+        if status == 400 and len(pairs) > 1:
+            # Binance rejects the whole batch if any pair is unknown; resolve them one by one
+            quotes = {}
+            for pair in pairs:
+                quotes.update(self.binance_tickers([pair]))
+            return quotes
+        if status != 200:
+            return {}
+        return parse_binance(data, pairs)
+
+    def close(self):
+        self.session.close()
+
+class AsyncMarketDataClient:
+    """asyncio counterpart of MarketDataClient built on httpx"""
+
+    def __init__(self, coingecko_url=None, binance_url=None, max_connections=200,
+                 retries=2, backoff=0.2, timeout=8.0):
+        if httpx is None:
+            raise RuntimeError("httpx is required for the async market data client")
+
+        self.coingecko_url = coingecko_url or COINGECKO_API_URL
+        self.binance_url = binance_url or BINANCE_API_URL
+        self.retries = retries
+        self.backoff = backoff
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=3.05),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections)
+        )
+
+    async def get_json(self, url, params=None):
+        """GET a JSON document, returning (status_code, data)"""
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.client.get(url, params=params)
+                if response.status_code not in (429, 500, 502, 503, 504) or attempt == self.retries:
+                    try:
+                        return response.status_code, response.json()
+                    except ValueError:
+                        return response.status_code, None
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(self.backoff * (2 ** attempt))
+
+    async def fetch(self, provider, url, params=None):
+        """get_json, counting failures per provider for /metrics"""
+        try:
+            status, data = await self.get_json(url, params=params)
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(provider, type(e).__name__)
+            raise
+        if status != 200:
+            UPSTREAM_ERRORS.inc(provider, f'http_{status}')
+        return status, data
+
+    async def coingecko_prices(self, coin_ids):
+        """Fetch many CoinGecko coins in one call -> {coin_id: (price, change)}"""
+        coin_ids = sorted(set(coin_ids))
+        if not coin_ids:
+            return {}
+        status, data = await self.fetch('coingecko', f"{self.coingecko_url}/simple/price", params=coingecko_params(coin_ids))
+        if status != 200:
+            return {}
+        return parse_coingecko(data)
+
+    async def binance_tickers(self, pairs):
+        """Fetch many Binance 24h tickers in one call -> {pair: (price, change)}"""
+        pairs = sorted(set(pairs))
+        if not pairs:
+            return {}
+        status, data = await self.fetch('binance', f"{self.binance_url}/ticker/24hr", params=binance_params(pairs))
+
+        if status == 400 and len(pairs) > 1:
+            results = await asyncio.gather(*(self.binance_tickers([pair]) for pair in pairs))
+            quotes = {}
+            for result in results:
+                quotes.update(result)
+            return quotes
+        if status != 200:
+            return {}
+        return parse_binance(data, pairs)
+
+    async def close(self):
+        await self.client.aclose()
+
+# Shared client so every request reuses the same warm connections
+market_data = MarketDataClient()
@@ -0,0 +1,229 @@
+import bisect
+import threading
+import time
+
+# Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Latency buckets in seconds: 100 µs to 10 s
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# data_source strings -> short label values
+SOURCE_LABELS = {
+    'CoinGecko Live': 'coingecko',
+    'Binance Live Data': 'binance',
+    'Market Data': 'market_data',
+    'Market Simulation': 'simulation',
+    'Default': 'default'
+}
+
+def source_label(data_source):
+    return SOURCE_LABELS.get(data_source, 'other')
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _CounterChild:
+    __slots__ = ('lock', 'value')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+class _HistogramChild:
+    __slots__ = ('lock', 'buckets', 'counts', 'sum')
+
+    def __init__(self, buckets):
+        self.lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def time(self):
+        return _Timer(self)
+
+class _Timer:
+    __slots__ = ('child', 'start')
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+
+class _Metric:
+    """Label values -> child; children are created once and then looked up without a lock"""
+
+    def __init__(self, name, help, labelnames):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._child())
+        return child
+
+    def _items(self):
+        with self._lock:
+            return sorted(self._children.items())
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def _child(self):
+        return _CounterChild()
+
+    def inc(self, *values, amount=1):
+        self.labels(*values).inc(amount)
+
+    def samples(self):
+        for values, child in self._items():
+            yield self.name, _labels(self.labelnames, values), child.value
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value, *values):
+        self.labels(*values).observe(value)
+
+    def time(self, *values):
+        return self.labels(*values).time()
+
+    def samples(self):
+        for values, child in self._items():
+            with child.lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield (self.name + '_bucket',
+                       _labels(self.labelnames, values, f'le="{_number(float(bound))}"'), cumulative)
+            yield self.name + '_sum', _labels(self.labelnames, values), total
+            yield self.name + '_count', _labels(self.labelnames, values), cumulative
+
+class _Collected:
+    """Samples read from an existing stats() dict at scrape time, so the hot path pays nothing"""
+
+    def __init__(self, name, help, type, labelname, read):
+        self.name = name
+        self.help = help
+        self.type = type
+        self.labelname = labelname
+        self.read = read
+
+    def samples(self):
+        for label, value in sorted(self.read().items()):
+            yield self.name, _labels((self.labelname,), (label,)), value
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        with self._lock:
+            # Re-registering a name (module reloads, several apps in one process) keeps the first
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def collect(self, name, help, type, labelname, read, keys):
+        """Export selected numeric entries of read() (a stats() method) under one label"""
+        def pick():
+            stats = read()
+            return {key: stats[key] for key in keys if key in stats}
+        with self._lock:
+            self._metrics[name] = _Collected(name, help, type, labelname, pick)
+
+    def render(self):
+        """Every metric in the Prometheus text format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+# Shared by every module in the process
+registry = Registry()
+
+STAGE_SECONDS = registry.histogram(
+    'analyze_stage_seconds', 'Analyze pipeline latency per stage (batch stages count once per symbol)',
+    ('stage', 'source'))
+INFERENCE_SECONDS = registry.histogram(
+    'model_inference_seconds', 'Time per predict_batch call, by inference backend', ('backend',))
+REQUEST_SECONDS = registry.histogram(
+    'http_request_seconds', 'Request latency by route and status', ('route', 'status'))
+UPSTREAM_ERRORS = registry.counter(
+    'upstream_errors_total', 'Failed upstream quote calls by provider and reason', ('provider', 'reason'))
+FALLBACKS = registry.counter(
+    'analyze_fallbacks_total', 'Results served from a fallback instead of live data or the model', ('kind',))
+
+def instrument_flask(app):
+    """Time every request by route template and status, and serve /metrics"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_latency(response):
+        start = getattr(g, 'metrics_start', None)
+        if start is not None and request.url_rule is not None:
+            REQUEST_SECONDS.observe(time.perf_counter() - start, request.url_rule.rule, str(response.status_code))
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(registry.render(), content_type=CONTENT_TYPE)
+
+    return app
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Default quotes served by the fake providers
+COINGECKO_PRICES = {
+    'bitcoin': {'usd': 65200.0, 'usd_24h_change': 1.25},
+    'ethereum': {'usd': 3500.0, 'usd_24h_change': -0.8}
+}
+
+BINANCE_TICKERS = {
+    'BTCUSDT': {'lastPrice': '65210.50', 'priceChangePercent': '1.30'},
+    'ETHUSDT': {'lastPrice': '3501.25', 'priceChangePercent': '-0.75'},
+    'ADAUSDT': {'lastPrice': '0.45', 'priceChangePercent': '2.10'},
+    'SOLUSDT': {'lastPrice': '140.10', 'priceChangePercent': '-3.40'},
+    'BNBUSDT': {'lastPrice': '580.40', 'priceChangePercent': '0.55'},
+    'DOTUSDT': {'lastPrice': '7.12', 'priceChangePercent': '-1.05'}
+}
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open ~1k upstream connections at once
+    request_queue_size = 1024
+
+class FakeMarketServer:
+    """Local fake CoinGecko/Binance HTTP server for tests and benchmarks"""
+
+    def __init__(self, latency=0.0, fail=False, port=0):
+        self.coingecko = {k: dict(v) for k, v in COINGECKO_PRICES.items()}
+        self.binance = {k: dict(v) for k, v in BINANCE_TICKERS.items()}
+        self.latency = latency
+        self.fail = fail
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def coingecko_url(self):
+        return self.url + '/api/v3'
+
+    @property
+    def binance_url(self):
+        return self.url + '/api/v3'
+
+    @property
+    def request_count(self):
+        with self._lock:
+            return len(self.requests)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def respond(self, path, query):
+        """Build (status, body) for one upstream call"""
+        if path.endswith('/simple/price'):
+            ids = query.get('ids', [''])[0].split(',')
+            return 200, {i: self.coingecko[i] for i in ids if i in self.coingecko}
+
+        if path.endswith('/ticker/24hr'):
+            if 'symbols' in query:
+                symbols = json.loads(query['symbols'][0])
+                found = [dict(self.binance[s], symbol=s) for s in symbols if s in self.binance]
+                if len(found) != len(symbols):
+                    return 400, {'code': -1121, 'msg': 'Invalid symbol.'}
+                return 200, found
+            symbol = query.get('symbol', [''])[0]
+            if symbol not in self.binance:
+                return 400, {'code': -1121, 'msg': 'Invalid symbol.'}
+            return 200, dict(self.binance[symbol], symbol=symbol)
+
+        return 404, {'error': 'not found'}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                with fake._lock:
+                    fake.requests.append(self.path)
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if fake.fail:
+                    status, body = 503, {'error': 'upstream unavailable'}
+                else:
+                    status, body = fake.respond(parsed.path, parse_qs(parsed.query))
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fake CoinGecko/Binance upstream')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    args = parser.parse_args()
+    server = FakeMarketServer(latency=args.latency, port=args.port)
+    print(f"🧪 Fake market data upstream: {server.url}/api/v3")
+    server._server.serve_forever()
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class ModelVersion:
+    """One loaded model with its accuracy report; never mutated after creation"""
+    __slots__ = ('model', 'report', 'version', 'signature', 'loaded_at')
+
+    def __init__(self, model, report, version, signature):
+        self.model = model
+        self.report = report
+        self.version = version
+        self.signature = signature
+        self.loaded_at = time.time()
+
+    @property
+    def loaded(self):
+        return self.model is not None
+
+def file_signature(paths):
+    """(path, mtime_ns, size) per watched file; None for missing files"""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+def validate_model(model, n_features, classes=None):
+    """Score a probe batch and reject models that cannot serve"""
+    features_in = getattr(model, 'n_features_in_', None)
+    if features_in is not None and features_in != n_features:
+        raise ValueError(f"Model expects {features_in} features, not {n_features}")
+    if classes is not None and not set(int(c) for c in model.classes_) <= set(classes):
+        raise ValueError(f"Unknown model classes {list(model.classes_)}")
+
+    probe = np.linspace(-1.0, 100.0, 2 * n_features).reshape(2, n_features)
+    probabilities = np.asarray(model.predict_proba(probe))
+    if probabilities.shape != (2, len(model.classes_)):
+        raise ValueError(f"predict_proba returned shape {probabilities.shape}")
+    if not np.isfinite(probabilities).all() or not np.allclose(probabilities.sum(axis=1), 1.0):
+        raise ValueError("predict_proba rows are not probability distributions")
+
+class ModelRegistry:
+    """Hot-reloadable model slot with one version kept for rollback
+
+    Watched files are stat()ed at most once per poll_interval from the
+    request path. A changed signature must be seen on two consecutive polls
+    (so a trainer mid-write is not picked up), then the new version loads
+    and validates on a background thread and replaces `current` in a single
+    assignment. Requests that captured the old version keep using it.
+    """
+
+    def __init__(self, load_model, watch_paths, report_path, default_report,
+                 n_features=9, classes=None, poll_interval=2.0, clock=time.monotonic):
+        self.load_model = load_model
+        self.watch_paths = list(watch_paths)
+        self.report_path = report_path
+        self.default_report = default_report
+        self.n_features = n_features
+        self.classes = classes
+        self.poll_interval = poll_interval
+        self.clock = clock
+
+        self.previous = None
+        self.last_error = None
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._loading = False
+        self._pending = None
+        # Signatures that failed validation or were rolled back; skipped until the files change again
+        self._skip = set()
+        self._next_check = clock() + poll_interval
+
+        signature = file_signature(self.watch_paths)
+        try:
+            self.current = self._load(signature)
+        except Exception as exc:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            self.current = ModelVersion(None, dict(default_report), 'rule-based', signature)
+
+    def _load(self, signature):
+        model = self.load_model()
+        validate_model(model, self.n_features, self.classes)
+        try:
+            with open(self.report_path, 'r') as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            report = dict(self.default_report)
+        version = hashlib.sha1(repr(signature).encode()).hexdigest()[:12]
+        return ModelVersion(model, report, version, signature)
+
+    def active(self):
+        """Current version, polling the watched files at most once per poll_interval"""
+        now = self.clock()
+        if now >= self._next_check:
+            self._next_check = now + self.poll_interval
+            self._poll()
+        return self.current
+
+    def _poll(self):
+        signature = file_signature(self.watch_paths)
+        if signature == self.current.signature or signature in self._skip:
+            self._pending = None
+            return
+        if signature != self._pending:
+            # Wait one more interval for the writer to finish
+            self._pending = signature
+            return
+        with self._lock:
+            if self._loading:
+                return
+            self._loading = True
+        threading.Thread(target=self._reload, args=(signature,), daemon=True).start()
+
+    def _reload(self, signature):
+        try:
+            self.reload(signature)
+        except Exception:
+            pass
+        finally:
+            self._loading = False
+
+    def reload(self, signature=None):
+        """Load, validate and swap in the files on disk now; raises if they are rejected"""
+        signature = signature or file_signature(self.watch_paths)
+        try:
+            version = self._load(signature)
+        except Exception as exc:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            self._skip.add(signature)
+            logger.warning(f"⚠️ Model reload rejected, keeping {self.current.version}: {self.last_error}")
+            raise
+
+        with self._lock:
+            self.previous = self.current
+            self.current = version
+            self._pending = None
+            self.last_error = None
+            self.reloads += 1
+        logger.info(f"🔄 Model {version.version} active (was {self.previous.version})")
+        return version
+
+    def rollback(self):
+        """Swap back to the previous version; the rolled-back files are ignored until they change"""
+        with self._lock:
+            if self.previous is None:
+                raise LookupError("No previous model version to roll back to")
+            self._skip.add(self.current.signature)
+            self._skip.discard(self.previous.signature)
+            self.current, self.previous = self.previous, self.current
+        logger.info(f"⏪ Model rolled back to {self.current.version}")
+        return self.current
+
+    def status(self):
+        current = self.current
+        previous = self.previous
+        return {
+            'model_version': current.version,
+            'previous_model_version': previous.version if previous else None,
+            'loaded_at': current.loaded_at,
+            'reloads': self.reloads,
+            'last_reload_error': self.last_error
+        }
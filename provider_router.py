@@ -0,0 +1,240 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from metrics import FALLBACKS
+
+logger = logging.getLogger(__name__)
+
+# Seconds an analyze request may spend on upstream quotes before falling back
+ANALYZE_DEADLINE = float(os.environ.get('ANALYZE_DEADLINE', 2.0))
+
+# Hedge delay until a provider has enough samples for a p95
+DEFAULT_HEDGE_DELAY = 0.3
+MIN_SAMPLES = 20
+
+class Provider:
+    """One upstream: symbol -> provider id, and fetch_many(ids) -> {id: (price, change)}
+
+    Tracks EWMA latency and error rate, recent latencies for a p95, and a
+    circuit breaker: failure_threshold failures in a row open it for
+    cooldown seconds, after which calls are let through again (half open)
+    and the next result closes or reopens it. Calls run on the provider's
+    own pool of max_threads, so a stalled provider cannot starve the
+    others; while its calls are in flight they count toward its score,
+    and with every thread busy it is ranked behind providers with room.
+    """
+
+    def __init__(self, name, ids, fetch_many, failure_threshold=5, cooldown=30.0, alpha=0.2,
+                 max_threads=8, clock=time.monotonic):
+        self.name = name
+        self.ids = ids
+        self.fetch_many = fetch_many
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.alpha = alpha
+        self.max_threads = max_threads
+        self.clock = clock
+        self.ewma_latency = None
+        self.error_rate = 0.0
+        self.latencies = deque(maxlen=200)
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.in_flight = {}
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'failures': 0, 'hedges': 0, 'wins': 0, 'circuit_opens': 0, 'skipped': 0}
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half_open' if self.clock() - self.opened_at >= self.cooldown else 'open'
+
+    def executor(self):
+        # Pool threads do not survive fork; each gunicorn worker builds its own
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(self.max_threads, thread_name_prefix=f'quote-{self.name}')
+                    self.in_flight = {}
+                    self._pid = os.getpid()
+        return self._executor
+
+    def available(self):
+        return self.state != 'open'
+
+    def saturated(self):
+        """Every pool thread is busy, so a new call would queue"""
+        return len(self.in_flight) >= self.max_threads
+
+    def stalled_for(self):
+        """Seconds the oldest in-flight call has been running, 0 when idle"""
+        with self._lock:
+            started = min(self.in_flight.values(), default=None)
+        return 0.0 if started is None else self.clock() - started
+
+    def supports(self, symbols):
+        return [symbol for symbol in symbols if symbol in self.ids]
+
+    def hedge_delay(self):
+        """Seconds to wait for this provider before hedging: its recent p95"""
+        with self._lock:
+            if len(self.latencies) < MIN_SAMPLES:
+                return DEFAULT_HEDGE_DELAY
+            return float(np.percentile(self.latencies, 95))
+
+    def score(self):
+        # Expected latency, inflated by the chance of having to go elsewhere; a call
+        # that has been hanging longer than the EWMA is the better estimate
+        latency = max(self.ewma_latency or 0.0, self.stalled_for())
+        return latency / max(0.05, 1.0 - self.error_rate)
+
+    def record(self, latency, ok):
+        with self._lock:
+            self.stats['calls'] += 1
+            self.latencies.append(latency)
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+            self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+
+            if ok:
+                self.consecutive_failures = 0
+                self.opened_at = None
+                return
+            self.stats['failures'] += 1
+            self.consecutive_failures += 1
+            if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+                if self.opened_at is None or self.state == 'half_open':
+                    self.stats['circuit_opens'] += 1
+                self.opened_at = self.clock()
+
+    def submit(self, symbols, end):
+        """Future for call(symbols) on this provider's pool, counted in flight until it finishes"""
+        pool = self.executor()
+        token = object()
+        with self._lock:
+            self.in_flight[token] = self.clock()
+        future = pool.submit(self.call, symbols, end)
+        future.add_done_callback(lambda _: self._finished(token))
+        return future
+
+    def _finished(self, token):
+        with self._lock:
+            self.in_flight.pop(token, None)
+
+    def call(self, symbols, end=None):
+        """{symbol: (price, change)} from this provider; failures are recorded, not raised
+
+        A call that only gets a thread after end (time.monotonic) is skipped
+        without being recorded: nobody is waiting for it, and the wait was
+        not the provider's fault.
+        """
+        if end is not None and time.monotonic() >= end:
+            with self._lock:
+                self.stats['skipped'] += 1
+            return {}
+        ids = {}
+        for symbol in symbols:
+            ids.setdefault(self.ids[symbol], []).append(symbol)
+        start = time.perf_counter()
+        try:
+            values = self.fetch_many(list(ids)) or {}
+        except Exception as e:
+            logger.warning(f"⚠️ {self.name} quote call failed: {e}")
+            values = {}
+        quotes = {symbol: values[pid] for pid, group in ids.items() if pid in values for symbol in group}
+        self.record(time.perf_counter() - start, bool(quotes))
+        return quotes
+
+    def snapshot(self):
+        with self._lock:
+            p95 = float(np.percentile(self.latencies, 95)) if self.latencies else None
+        return dict(self.stats, state=self.state, in_flight=len(self.in_flight), error_rate=round(self.error_rate, 3),
+                    ewma_ms=None if self.ewma_latency is None else round(self.ewma_latency * 1000, 1),
+                    p95_ms=None if p95 is None else round(p95 * 1000, 1))
+
+class ProviderRouter:
+    """Quotes from the fastest healthy provider, hedged, within a deadline
+
+    Providers whose circuit is open are skipped; the rest are tried in
+    order of expected latency (EWMA or the age of a hanging call, adjusted
+    for error rate), saturated pools last. If the first has not
+    answered within its p95, the same symbols are also requested from the
+    next provider (or again from the same one) and the first useful answer
+    wins. Symbols still missing move on to the next provider until the
+    deadline; whatever is missing then is left to the caller's static or
+    simulated fallback.
+    """
+
+    def __init__(self, providers, deadline=None):
+        self.providers = list(providers)
+        self.deadline = ANALYZE_DEADLINE if deadline is None else deadline
+
+    def ranked(self, symbols):
+        candidates = [p for p in self.providers if p.available() and p.supports(symbols)]
+        return sorted(candidates, key=lambda p: (p.saturated(), p.score(), self.providers.index(p)))
+
+    def quotes(self, symbols, deadline=None):
+        """{symbol: (price, change, provider name)} for whatever could be fetched in time"""
+        budget = self.deadline if deadline is None else deadline
+        end = time.monotonic() + budget
+        found = {}
+        remaining = list(dict.fromkeys(symbols))
+        tried = set()
+
+        while remaining and time.monotonic() < end:
+            candidates = [p for p in self.ranked(remaining) if p.name not in tried]
+            if not candidates:
+                break
+            primary = candidates[0]
+            hedge = candidates[1] if len(candidates) > 1 else primary
+            tried.add(primary.name)
+            for symbol, (price, change, name) in self._race(primary, hedge, remaining, end).items():
+                found[symbol] = (price, change, name)
+            remaining = [symbol for symbol in remaining if symbol not in found]
+
+        if remaining:
+            FALLBACKS.inc('quote_deadline' if time.monotonic() >= end else 'no_provider', amount=len(remaining))
+        return found
+
+    def _race(self, primary, hedge, symbols, end):
+        """First useful answer from primary, or from hedge once primary exceeds its p95"""
+        pending = {primary.submit(primary.supports(symbols), end): primary}
+        delay = min(primary.hedge_delay(), max(0.0, end - time.monotonic()))
+        done, _ = wait(pending, timeout=delay)
+
+        if not done and hedge.available() and time.monotonic() < end:
+            with hedge._lock:
+                hedge.stats['hedges'] += 1
+            pending[hedge.submit(hedge.supports(symbols), end)] = hedge
+
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=max(0.0, end - time.monotonic()), return_when=FIRST_COMPLETED)
+                if not done:
+                    # Out of time; late answers still update the providers' stats
+                    return {}
+                for future in done:
+                    provider = pending.pop(future)
+                    quotes = future.result()
+                    if quotes:
+                        with provider._lock:
+                            provider.stats['wins'] += 1
+                        return {symbol: (price, change, provider.name) for symbol, (price, change) in quotes.items()}
+            return {}
+        finally:
+            # Calls still queued behind a busy pool are dropped rather than run for nobody
+            for future in pending:
+                future.cancel()
+
+    def stats(self):
+        return {provider.name: provider.snapshot() for provider in self.providers}
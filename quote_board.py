@@ -0,0 +1,244 @@
+import atexit
+import fcntl
+import logging
+import mmap
+import os
+import random
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Source code stored per slot; 0 means the slot was never written
+SOURCES = ('none', 'binance', 'coingecko', 'market_data')
+
+# Padded to a cache line so the slots that follow start on one
+HEADER_DTYPE = np.dtype({
+    'names': ['magic', 'slots', 'writer_pid', 'published_at', 'publishes'],
+    'formats': ['S8', '<u8', '<i8', '<f8', '<u8'],
+    'offsets': [0, 8, 16, 24, 32],
+    'itemsize': 64
+})
+
+# One cache line per slot so a write never touches a neighbour's line
+SLOT_DTYPE = np.dtype({
+    'names': ['seq', 'price', 'change', 'updated', 'source'],
+    'formats': ['<u8', '<f8', '<f8', '<f8', 'u1'],
+    'offsets': [0, 8, 16, 24, 32],
+    'itemsize': 64
+})
+
+MAGIC = b'QBOARD1'
+
+# Reader retries before giving up on a slot that is being rewritten
+READ_RETRIES = 100
+
+class QuoteBoard:
+    """Fixed-layout quote table in shared memory, written by one process and read by all
+
+    Keys (e.g. Binance pairs) map to slots by sorted position, so every
+    process that builds the board from the same keys agrees on the layout.
+    Without a path the mapping is anonymous and shared with processes
+    forked after it is created (gunicorn preload_app); with a path it is a
+    file any process can map. Each slot has a seqlock: the writer makes
+    seq odd, writes the fields, then makes it even again, and a reader
+    retries until it sees the same even seq before and after its read.
+    Readers take no lock and never block the writer.
+    """
+
+    def __init__(self, keys, path=None):
+        self.keys = sorted(set(keys))
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        size = HEADER_DTYPE.itemsize + SLOT_DTYPE.itemsize * max(1, len(self.keys))
+        self.path = path
+
+        if path is None:
+            self._mmap = mmap.mmap(-1, size)
+            # The writer election needs a file; forked workers each open it themselves
+            fd, self.lock_path = tempfile.mkstemp(prefix='quote_board-', suffix='.lock')
+            os.close(fd)
+            atexit.register(self._remove_lock_file, os.getpid())
+        else:
+            with open(path, 'a+b') as f:
+                if os.fstat(f.fileno()).st_size != size:
+                    f.truncate(size)
+                self._mmap = mmap.mmap(f.fileno(), size)
+            self.lock_path = path + '.lock'
+
+        self.header = np.ndarray((), HEADER_DTYPE, buffer=self._mmap)
+        if self.header['magic'] != MAGIC or self.header['slots'] != len(self.keys):
+            # New (or foreign) layout: start from empty slots
+            self._mmap[:] = bytes(size)
+            self.header['slots'] = len(self.keys)
+            self.header['magic'] = MAGIC
+        slots = np.ndarray(len(self.keys), SLOT_DTYPE, buffer=self._mmap, offset=HEADER_DTYPE.itemsize)
+        # Field views over the shared pages; reads and writes go straight to the mapping
+        self.seq = slots['seq']
+        self.price = slots['price']
+        self.change = slots['change']
+        self.updated = slots['updated']
+        self.source = slots['source']
+        self._lock_file = None
+
+    def _remove_lock_file(self, creator):
+        # Forked workers run atexit too; only the process that made the file removes it
+        if os.getpid() == creator:
+            try:
+                os.unlink(self.lock_path)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def nbytes(self):
+        return len(self._mmap)
+
+    # Writing (the elected process only)
+
+    def publish(self, quotes, source, now=None):
+        """Write {key: (price, change)}; unknown keys are ignored"""
+        now = time.time() if now is None else now
+        code = SOURCES.index(source)
+        written = 0
+        for key, (price, change) in quotes.items():
+            i = self.index.get(key)
+            if i is None:
+                continue
+            self.seq[i] += 1
+            self.price[i] = price
+            self.change[i] = change
+            self.updated[i] = now
+            self.source[i] = code
+            self.seq[i] += 1
+            written += 1
+        self.header['published_at'] = now
+        self.header['publishes'] += 1
+        return written
+
+    def try_become_writer(self):
+        """Take the board's writer lock if no live process holds it"""
+        if self._lock_file is not None:
+            return True
+        lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        # Held until this process exits; the kernel releases it if the process dies
+        self._lock_file = lock_file
+        self.header['writer_pid'] = os.getpid()
+        return True
+
+    @property
+    def is_writer(self):
+        return self._lock_file is not None
+
+    def after_fork(self):
+        """A forked child does not own its parent's writer lock; closing its copy keeps the parent's"""
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    # Reading (any process)
+
+    def read(self, key):
+        """(price, change, updated, source) for key, or None if it was never written"""
+        i = self.index.get(key)
+        if i is None:
+            return None
+        for _ in range(READ_RETRIES):
+            before = int(self.seq[i])
+            if before & 1:
+                continue
+            quote = (float(self.price[i]), float(self.change[i]), float(self.updated[i]), int(self.source[i]))
+            if int(self.seq[i]) == before:
+                if before == 0:
+                    return None
+                return quote[0], quote[1], quote[2], SOURCES[quote[3]]
+        return None
+
+    def get_many(self, keys, max_age, now=None):
+        """{key: (price, change)} for keys published within max_age seconds"""
+        now = time.time() if now is None else now
+        quotes = {}
+        for key in keys:
+            quote = self.read(key)
+            if quote is not None and now - quote[2] <= max_age:
+                quotes[key] = quote[0], quote[1]
+        return quotes
+
+    def stats(self):
+        written = int(np.count_nonzero(self.seq))
+        return {
+            'slots': len(self.keys),
+            'written': written,
+            'bytes': self.nbytes,
+            'shared': 'file' if self.path else 'anonymous',
+            'writer_pid': int(self.header['writer_pid']),
+            'is_writer': self.is_writer,
+            'publishes': int(self.header['publishes']),
+            'published_at': float(self.header['published_at'])
+        }
+
+class BoardPublisher:
+    """Background loop in every worker; whichever holds the board's writer lock fetches and publishes
+
+    fetch_many(keys) -> {key: (price, change)} is called once per interval
+    for all keys, by one process, so upstream traffic does not grow with
+    the number of workers. Other workers retry the lock every cycle and
+    take over if the writer dies.
+    """
+
+    def __init__(self, board, fetch_many, source, interval=5.0, jitter=0.2):
+        self.board = board
+        self.fetch_many = fetch_many
+        self.source = source
+        self.interval = interval
+        self.jitter = jitter
+        self.enabled = os.environ.get('QUOTE_BOARD', 'on').lower() not in ('0', 'off', 'false')
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.cycles = 0
+        self.errors = 0
+
+    def ensure_started(self):
+        """Start the loop once per process (threads and locks do not survive fork)"""
+        if not self.enabled or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                self.board.after_fork()
+            self._pid = os.getpid()
+            self._stop.clear()
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def publish_once(self):
+        """One cycle if this process is (or becomes) the writer; returns quotes written"""
+        if not self.board.try_become_writer():
+            return 0
+        try:
+            quotes = self.fetch_many(self.board.keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"⚠️ Quote board refresh failed: {e}")
+            return 0
+        self.cycles += 1
+        return self.board.publish(quotes, self.source)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.publish_once()
+            delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+            self._stop.wait(delay)
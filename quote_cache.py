@@ -0,0 +1,265 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a quote stays fresh, per asset class
+DEFAULT_TTLS = {
+    'crypto': 10,
+    'stock': 30,
+    'etf': 30,
+    'commodity': 60,
+    'default': 30
+}
+
+def ttls_from_env(ttls=None):
+    """Apply QUOTE_TTL_<CLASS> environment overrides"""
+    ttls = dict(ttls or DEFAULT_TTLS)
+    for asset_class in list(ttls):
+        value = os.environ.get(f'QUOTE_TTL_{asset_class.upper()}')
+        if value:
+            ttls[asset_class] = float(value)
+    return ttls
+
+class _Entry:
+    __slots__ = ('value', 'fetched_at', 'ttl')
+
+    def __init__(self, value, fetched_at, ttl):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+
+class _Flight:
+    __slots__ = ('done', 'value')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+
+class QuoteCache:
+    """Bounded LRU quote cache with TTLs, single-flight and stale-while-revalidate"""
+
+    def __init__(self, ttls=None, stale_ttl=None, max_entries=4096, wait_timeout=10, clock=time.monotonic):
+        self.ttls = ttls_from_env(ttls)
+        if stale_ttl is None:
+            stale_ttl = float(os.environ.get('QUOTE_STALE_TTL', 300))
+        self.stale_ttl = stale_ttl
+        # QUOTE_CACHE=off sends every lookup upstream (debugging and cold-path benchmarks)
+        self.enabled = os.environ.get('QUOTE_CACHE', 'on').lower() not in ('off', '0', 'false')
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def get(self, symbol, source, fetch, asset_class='default'):
+        """Return a cached quote, calling fetch() at most once per key at a time"""
+        if not self.enabled:
+            try:
+                return fetch()
+            except Exception:
+                return None
+
+        key = (source, symbol)
+        now = self.clock()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < entry.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                if age < entry.ttl + self.stale_ttl:
+                    # Serve the old quote now and refresh it off the request path
+                    self._entries.move_to_end(key)
+                    self.stale += 1
+                    if key not in self._flights:
+                        flight = self._flights[key] = _Flight()
+                        threading.Thread(target=self._run_flight,
+                                         args=(key, flight, fetch, asset_class),
+                                         daemon=True).start()
+                    return entry.value
+
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+                self.misses += 1
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if leader:
+            return self._run_flight(key, flight, fetch, asset_class)
+
+        flight.done.wait(self.wait_timeout)
+        return flight.value
+
+    def get_many(self, symbols, source, fetch_many, asset_class='default'):
+        """Resolve many symbols, fetching every miss in one fetch_many(symbols) call"""
+        if not self.enabled:
+            try:
+                values = fetch_many(list(dict.fromkeys(symbols))) or {}
+            except Exception:
+                values = {}
+            return {symbol: value for symbol, value in values.items() if value is not None}
+
+        now = self.clock()
+        results = {}
+        leading = {}
+        waiting = {}
+        refresh = {}
+
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                key = (source, symbol)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    age = now - entry.fetched_at
+                    if age < entry.ttl + self.stale_ttl:
+                        self._entries.move_to_end(key)
+                        results[symbol] = entry.value
+                        if age < entry.ttl:
+                            self.hits += 1
+                            continue
+                        self.stale += 1
+                        if key not in self._flights:
+                            refresh[symbol] = self._flights[key] = _Flight()
+                        continue
+
+                flight = self._flights.get(key)
+                if flight is None:
+                    leading[symbol] = self._flights[key] = _Flight()
+                    self.misses += 1
+                else:
+                    waiting[symbol] = flight
+                    self.coalesced += 1
+
+        if refresh:
+            threading.Thread(target=self._run_many, args=(source, refresh, fetch_many, asset_class),
+                             daemon=True).start()
+
+        if leading:
+            results.update(self._run_many(source, leading, fetch_many, asset_class))
+
+        for symbol, flight in waiting.items():
+            flight.done.wait(self.wait_timeout)
+            results[symbol] = flight.value
+
+        return {symbol: value for symbol, value in results.items() if value is not None}
+
+    def _run_flight(self, key, flight, fetch, asset_class):
+        try:
+            value = fetch()
+        except Exception:
+            value = None
+
+        with self._lock:
+            value = self._complete(key, value, asset_class)
+
+        flight.value = value
+        flight.done.set()
+        return value
+
+    def _run_many(self, source, flights, fetch_many, asset_class):
+        try:
+            values = fetch_many(list(flights)) or {}
+        except Exception:
+            values = {}
+
+        results = {}
+        with self._lock:
+            for symbol in flights:
+                results[symbol] = self._complete((source, symbol), values.get(symbol), asset_class)
+
+        for symbol, flight in flights.items():
+            flight.value = results[symbol]
+            flight.done.set()
+        return results
+
+    def _complete(self, key, value, asset_class, finish_flight=True):
+        # Caller holds self._lock
+        if value is None:
+            self.errors += 1
+            # Fall back to whatever we still hold for this key
+            entry = self._entries.get(key)
+            if entry is not None:
+                value = entry.value
+        else:
+            ttl = self.ttls.get(asset_class, self.ttls['default'])
+            self._entries[key] = _Entry(value, self.clock(), ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        if finish_flight:
+            self._flights.pop(key, None)
+        return value
+
+    def peek(self, symbol, source):
+        """Non-blocking lookup -> (value, is_fresh); (None, False) when unusable"""
+        if not self.enabled:
+            return None, False
+        with self._lock:
+            entry = self._entries.get((source, symbol))
+            if entry is None:
+                return None, False
+            age = self.clock() - entry.fetched_at
+            if age < entry.ttl:
+                self._entries.move_to_end((source, symbol))
+                self.hits += 1
+                return entry.value, True
+            if age < entry.ttl + self.stale_ttl:
+                self.stale += 1
+                return entry.value, False
+            return None, False
+
+    def remaining_ttl(self, symbol, source):
+        """Seconds until a cached quote goes stale (0 once it has), or None if it is not cached"""
+        with self._lock:
+            entry = self._entries.get((source, symbol))
+            if entry is None:
+                return None
+            return max(0.0, entry.ttl - (self.clock() - entry.fetched_at))
+
+    def put(self, symbol, source, value, asset_class='default'):
+        """Store a quote fetched outside of get()/get_many()"""
+        if not self.enabled or value is None:
+            return
+        with self._lock:
+            self.misses += 1
+            self._complete((source, symbol), value, asset_class, finish_flight=False)
+
+    def invalidate(self, symbol=None, source=None):
+        """Drop one key, or everything when called without arguments"""
+        with self._lock:
+            if symbol is None and source is None:
+                self._entries.clear()
+            else:
+                self._entries.pop((source, symbol), None)
+
+    def stats(self):
+        """Hit/miss/stale counters for monitoring"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'errors': self.errors,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+# Shared cache used by every backend
+quote_cache = QuoteCache()
@@ -1,9 +1,27 @@
-from flask import Flask, jsonify, send_file
-import requests
+from flask import Flask, Response, jsonify, request
+import logging
+import os
 import random
+import time
 from datetime import datetime
+from logs import configure_logging
+from market_data import market_data
+from metrics import FALLBACKS, STAGE_SECONDS, instrument_flask, registry, source_label
+from hot_poller import HotSetPoller, RateBudget
+from provider_router import Provider, ProviderRouter
+from quote_board import BoardPublisher, QuoteBoard
+from quote_cache import quote_cache
+from response_cache import ResponseCache
+from rules import MOMENTUM_RSI_RULES, RECOMMENDATION_FIELDS
+from static_assets import static_assets
+from stream_hub import StreamHub
+from symbols import ASSET_CLASSES, symbol_index, unlisted
 
 app = Flask(__name__)
+instrument_flask(app)
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 @app.after_request
 def after_request(response):
@@ -12,6 +30,26 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     return response
 
+ACCURACY_REPORT = {
+    'overall_accuracy': 0.816,
+    'model_type': 'Real-Time Market Analysis',
+    'training_samples': 8000,
+    'feature_count': 9
+}
+
+# Upper bound on symbols per /api/stream subscription
+MAX_STREAM_SYMBOLS = 50
+
+# Upper bound on /api/symbols results
+MAX_SYMBOL_RESULTS = 50
+
+# Binance trading pairs and CoinGecko coin ids (tickers and aliases) from the symbol master
+BINANCE_PAIRS = symbol_index.provider_ids('binance')
+COINGECKO_IDS = symbol_index.provider_ids('coingecko')
+
+# Router provider name -> data_source label
+PROVIDER_SOURCES = {'binance': "Binance Live Data", 'coingecko': "CoinGecko Live"}
+
 # Real market data with realistic base prices
 REAL_MARKET_DATA = {
     # Cryptocurrencies
@@ -38,27 +76,61 @@ REAL_MARKET_DATA = {
     'QQQ': {'price': 378, 'volatility': 0.019}
 }
 
-def get_real_binance_price(symbol):
-    """Get ACTUAL cryptocurrency prices from Binance"""
-    crypto_map = {
-        'BTC': 'BTCUSDT', 'BITCOIN': 'BTCUSDT',
-        'ETH': 'ETHUSDT', 'ETHEREUM': 'ETHUSDT',
-        'ADA': 'ADAUSDT', 'SOL': 'SOLUSDT',
-        'DOT': 'DOTUSDT', 'BNB': 'BNBUSDT'
-    }
+def fetch_binance_tickers(pairs):
+    """Fetch many 24h tickers from Binance in one call"""
+    try:
+        return market_data.binance_tickers(pairs)
+    except Exception as e:
+        logger.warning(f"⚠️ Binance API unavailable: {e}")
+        return {}
+
+# Binance tickers shared by every gunicorn worker; one elected worker fetches them all.
+# The publisher is started per worker by gunicorn.conf.py's post_fork; QUOTE_BOARD_PATH
+# maps a file instead, for processes that are not forked from one master.
+quote_board = QuoteBoard(BINANCE_PAIRS.values(), path=os.environ.get('QUOTE_BOARD_PATH'))
+board_publisher = BoardPublisher(quote_board, fetch_binance_tickers, 'binance',
+                                 interval=float(os.environ.get('QUOTE_BOARD_INTERVAL', quote_cache.ttls['crypto'])))
+
+# Live crypto quotes from whichever provider is healthy and fastest, hedged, within ANALYZE_DEADLINE
+quote_router = ProviderRouter([
+    Provider('binance', BINANCE_PAIRS, lambda pairs: market_data.binance_tickers(pairs)),
+    Provider('coingecko', COINGECKO_IDS, lambda ids: market_data.coingecko_prices(ids))
+])
+
+def get_crypto_quotes(symbols):
+    """Live crypto quotes for many symbols -> {symbol: (price, change, data_source)}"""
+    pairs = {symbol: BINANCE_PAIRS[symbol.upper()] for symbol in symbols if symbol.upper() in BINANCE_PAIRS}
     
-    if symbol.upper() in crypto_map:
-        try:
-            url = f"https://api.binance.com/api/v3/ticker/24hr?symbol={crypto_map[symbol.upper()]}"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                price = float(data['lastPrice'])
-                change = float(data['priceChangePercent'])
-                print(f"✅ REAL Binance Data: {symbol} = ${price:,.2f} ({change:+.2f}%)")
-                return price, change, "Binance Live Data"
-        except Exception as e:
-            print(f"⚠️ Binance API unavailable: {e}")
+    # Fresh board quotes cost no upstream call; only what the board lacks is routed
+    # Published every interval (+/- jitter), so a quote younger than two intervals is current
+    board = quote_board.get_many(set(pairs.values()), max_age=2 * board_publisher.interval)
+    quotes = {}
+    missing = []
+    for symbol in symbols:
+        if pairs.get(symbol) in board:
+            quotes[symbol] = board[pairs[symbol]] + ("Binance Live Data",)
+        elif symbol.upper() in BINANCE_PAIRS or symbol.upper() in COINGECKO_IDS:
+            missing.append(symbol)
+    
+    if missing:
+        routed = quote_cache.get_many([symbol.upper() for symbol in missing], 'router', quote_router.quotes, 'crypto')
+        for symbol in missing:
+            if symbol.upper() in routed:
+                price, change, provider = routed[symbol.upper()]
+                quotes[symbol] = price, change, PROVIDER_SOURCES[provider]
+    return quotes
+
+def get_real_binance_prices(symbols):
+    """Live crypto prices for many symbols -> {symbol: (price, change)}"""
+    return {symbol: quote[:2] for symbol, quote in get_crypto_quotes(symbols).items()}
+
+def get_real_binance_price(symbol):
+    """Get ACTUAL cryptocurrency prices from Binance, or CoinGecko when Binance is slow or down"""
+    quote = get_crypto_quotes([symbol]).get(symbol)
+    if quote is not None:
+        price, change, data_source = quote
+        logger.info(f"✅ REAL {data_source}: {symbol} = ${price:,.2f} ({change:+.2f}%)")
+        return quote
     
     return None, None, None
 
@@ -98,105 +170,215 @@ def calculate_realistic_rsi(price_change, symbol):
     # Ensure RSI stays in realistic range
     return max(25, min(80, rsi))
 
+def get_simulated_price(symbol):
+    """Generate a realistic simulation for symbols without market data"""
+    base_price = random.uniform(10, 1000)
+    volatility = random.uniform(0.015, 0.045)
+    price_variation = random.normalvariate(0, volatility)
+    price = base_price * (1 + price_variation)
+    price_change = price_variation * 100
+    return price, price_change, "Market Simulation"
+
+def build_analysis(symbol, price, price_change, data_source):
+    """Turn a quote into the professional analysis result"""
+    return build_analyses([(symbol, price, price_change, data_source)])[0]
+
+def build_analyses(quotes):
+    """Turn (symbol, price, price_change, data_source) quotes into analysis results"""
+    # Calculate realistic RSI
+    start = time.perf_counter()
+    rsis = [calculate_realistic_rsi(price_change, symbol) for symbol, _, price_change, _ in quotes]
+    features_seconds = time.perf_counter() - start
+    
+    # PROFESSIONAL PREDICTION LOGIC, scored for the whole batch at once
+    start = time.perf_counter()
+    rules = MOMENTUM_RSI_RULES.evaluate(rsi=rsis, change=[price_change for _, _, price_change, _ in quotes])
+    columns = [rules[field].tolist() for field in RECOMMENDATION_FIELDS]
+    inference_seconds = time.perf_counter() - start
+    for _, _, _, data_source in quotes:
+        STAGE_SECONDS.observe(features_seconds, 'features', source_label(data_source))
+        STAGE_SECONDS.observe(inference_seconds, 'inference', source_label(data_source))
+    
+    return [analysis_result(*quote, rsi, *rule) for quote, rsi, rule in zip(quotes, rsis, zip(*columns))]
+
+def analysis_result(symbol, price, price_change, data_source, rsi, recommendation, confidence, score, reasoning):
+    """The JSON result for one scored quote"""
+    result = {
+        'symbol': symbol,
+        'price': round(price, 2),
+        'price_change': round(price_change, 2),
+        'rsi': round(rsi, 1),
+        'prediction_score': round(score, 3),
+        'recommendation': recommendation,
+        'confidence': confidence,
+        'reasoning': reasoning,
+        'data_source': data_source,
+        'model_used': True,
+        'model_accuracy': ACCURACY_REPORT['overall_accuracy'],
+        'generated_at': datetime.now().isoformat(),
+        'real_time_data': True if "Live" in data_source else False
+    }
+    
+    logger.info(f"✅ {symbol}: ${price:,.2f} | {price_change:+.2f}% | RSI: {rsi:.1f} | {recommendation}")
+    return result
+
+def analyze_symbol(symbol):
+    """Full analysis pipeline for one symbol"""
+    return analyze_symbols([symbol])[0]
+
+def analyze_symbols(symbols):
+    """Full analysis pipeline for many symbols with one batched crypto quote call"""
+    # Try to get REAL Binance (or CoinGecko) data first for cryptocurrencies
+    start = time.perf_counter()
+    crypto_quotes = get_crypto_quotes(symbols)
+    crypto_seconds = time.perf_counter() - start
+    
+    quotes = []
+    for symbol in symbols:
+        start = time.perf_counter()
+        if symbol in crypto_quotes:
+            price, price_change, data_source = crypto_quotes[symbol]
+        else:
+            # If not crypto or API fails, use realistic market data
+            price, price_change, data_source = get_real_yahoo_price(symbol)
+        
+        # If still no data, generate realistic simulation
+        if price is None:
+            FALLBACKS.inc('simulation')
+            price, price_change, data_source = get_simulated_price(symbol)
+        
+        # The batched crypto call counts toward every symbol's quote stage
+        STAGE_SECONDS.observe(crypto_seconds + time.perf_counter() - start, 'quote', source_label(data_source))
+        quotes.append((symbol, price, price_change, data_source))
+    return build_analyses(quotes)
+
+def quote_provider(symbol):
+    """Which upstream a symbol's quote comes from"""
+    return 'binance' if symbol in BINANCE_PAIRS else 'market_data'
+
+# Precomputed analyses for REAL_MARKET_DATA plus recently requested symbols
+hot_poller = HotSetPoller(
+    analyze_symbols,
+    seed_symbols=list(REAL_MARKET_DATA) + [s for s in os.environ.get('HOT_SYMBOLS', '').upper().split(',') if s],
+    provider_of=quote_provider,
+    budgets={'binance': RateBudget(int(os.environ.get('BINANCE_CALLS_PER_MINUTE', 60)))},
+    interval=float(os.environ.get('HOT_POLL_INTERVAL', 5))
+)
+
+# One upstream poll per symbol per interval, shared by every /api/stream client
+stream_hub = StreamHub(analyze_symbols, interval=float(os.environ.get('STREAM_INTERVAL', 5)))
+
+# Serialized analyze responses with ETags, one per symbol and hot-set refresh
+response_cache = ResponseCache()
+
+registry.collect('quote_cache_events_total', 'Quote cache lookups and refreshes by outcome', 'counter',
+                 'event', quote_cache.stats, ('hits', 'misses', 'stale', 'coalesced', 'evictions', 'errors'))
+registry.collect('hot_poller_events_total', 'Hot-set lookups and refresh cycles by outcome', 'counter',
+                 'event', hot_poller.stats, ('hits', 'stale_hits', 'misses', 'cycles', 'refreshed',
+                                             'budget_skips', 'errors'))
+registry.collect('stream_events_total', 'Stream hub polls, fetched symbols, published events and errors',
+                 'counter', 'event', stream_hub.stats, ('polls', 'symbols_fetched', 'events', 'errors'))
+registry.collect('response_cache_events_total', 'Analyze responses served from cached bytes, rebuilt or 304',
+                 'counter', 'event', response_cache.stats, ('hits', 'misses', 'not_modified', 'evictions'))
+
 @app.route('/')
 def home():
-    return send_file('index.html')
+    return static_assets.response('index.html')
+
+def unknown_symbols(symbols):
+    """404 naming symbols missing from the symbol master, with the closest listed tickers"""
+    return jsonify({
+        'error': f"Unknown symbol{'s' if len(symbols) > 1 else ''}: {', '.join(symbols)}",
+        'suggestions': {symbol: symbol_index.suggest(symbol) for symbol in symbols}
+    }), 404
 
 @app.route('/api/analyze/<symbol>')
 def analyze_stock(symbol):
     try:
         symbol = symbol.upper().strip()
-        print(f"🔍 Analyzing: {symbol}")
-        
-        # Try to get REAL Binance data first for cryptocurrencies
-        price, price_change, data_source = get_real_binance_price(symbol)
-        
-        # If not crypto or API fails, use realistic market data
-        if price is None:
-            price, price_change, data_source = get_real_yahoo_price(symbol)
-        
-        # If still no data, generate realistic simulation
-        if price is None:
-            base_price = random.uniform(10, 1000)
-            volatility = random.uniform(0.015, 0.045)
-            price_variation = random.normalvariate(0, volatility)
-            price = base_price * (1 + price_variation)
-            price_change = price_variation * 100
-            data_source = "Market Simulation"
-        
-        # Calculate realistic RSI
-        rsi = calculate_realistic_rsi(price_change, symbol)
-        
-        # PROFESSIONAL PREDICTION LOGIC
-        if rsi < 30 and price_change > -5:
-            recommendation = "STRONG BUY"
-            confidence = "Very High"
-            score = 0.88
-            reasoning = "Oversold with potential reversal"
-        elif rsi < 35:
-            recommendation = "BUY"
-            confidence = "High"
-            score = 0.78
-            reasoning = "Undervalued territory"
-        elif rsi > 75 and price_change < 2:
-            recommendation = "STRONG SELL"
-            confidence = "Very High"
-            score = 0.18
-            reasoning = "Overbought with risk of correction"
-        elif rsi > 65:
-            recommendation = "SELL"
-            confidence = "High"
-            score = 0.28
-            reasoning = "Approaching overbought levels"
-        elif price_change > 8:
-            recommendation = "BUY"
-            confidence = "High"
-            score = 0.72
-            reasoning = "Strong upward momentum"
-        elif price_change < -8:
-            recommendation = "SELL"
-            confidence = "High"
-            score = 0.32
-            reasoning = "Significant downward pressure"
-        elif price_change > 4 and rsi < 55:
-            recommendation = "BUY"
-            confidence = "Medium"
-            score = 0.65
-            reasoning = "Positive momentum with room to grow"
-        elif price_change < -4 and rsi > 45:
-            recommendation = "SELL"
-            confidence = "Medium"
-            score = 0.38
-            reasoning = "Negative momentum developing"
-        else:
-            recommendation = "HOLD"
-            confidence = "Medium"
-            score = 0.52
-            reasoning = "Market in consolidation phase"
-        
-        result = {
-            'symbol': symbol,
-            'price': round(price, 2),
-            'price_change': round(price_change, 2),
-            'rsi': round(rsi, 1),
-            'prediction_score': round(score, 3),
-            'recommendation': recommendation,
-            'confidence': confidence,
-            'reasoning': reasoning,
-            'data_source': data_source,
-            'model_used': True,
-            'model_accuracy': 0.816,
-            'timestamp': datetime.now().isoformat(),
-            'real_time_data': True if "Live" in data_source else False
-        }
-        
-        print(f"✅ {symbol}: ${price:,.2f} | {price_change:+.2f}% | RSI: {rsi:.1f} | {recommendation}")
-        return jsonify(result)
+        if unlisted([symbol]):
+            return unknown_symbols([symbol])
+        # Hot symbols are a dictionary lookup; anything else is analyzed inline once
+        result = hot_poller.get(symbol, analyze_symbol)
+        # One serialized body per refresh; fresh for what is left of max_age, then revalidated.
+        # The age changes every second, so it stays out of the cached body (refreshed_at gives it)
+        version = (result.get('refreshed_at'), result.get('stale'))
+        max_age = hot_poller.max_age - result.pop('data_age_seconds', 0)
+        return response_cache.respond(symbol, version, lambda: result, max_age,
+                                      hot_poller.stale_ttl - hot_poller.max_age)
         
     except Exception as e:
-        print(f"❌ Error analyzing {symbol}: {e}")
+        logger.exception(f"❌ Error analyzing {symbol}: {e}")
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
+@app.route('/api/stream')
+def stream_analysis():
+    """Server-Sent Events: a 'quote' event whenever a subscribed symbol's analysis changes"""
+    symbols = [s.upper().strip() for s in request.args.get('symbols', '').split(',') if s.strip()]
+    if not symbols:
+        return jsonify({'error': 'No symbols provided'}), 400
+    if len(symbols) > MAX_STREAM_SYMBOLS:
+        return jsonify({'error': f'At most {MAX_STREAM_SYMBOLS} symbols per stream'}), 400
+    unknown = unlisted(symbols)
+    if unknown:
+        return unknown_symbols(unknown)
+    
+    subscription = stream_hub.subscribe(symbols)
+    
+    def events():
+        try:
+            yield from subscription.events()
+        finally:
+            stream_hub.unsubscribe(subscription)
+    
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/hot/stats')
+def get_hot_stats():
+    return jsonify(hot_poller.stats())
+
+@app.route('/api/board/stats')
+def get_board_stats():
+    return jsonify(dict(quote_board.stats(), cycles=board_publisher.cycles, errors=board_publisher.errors))
+
+@app.route('/api/providers/stats')
+def get_provider_stats():
+    return jsonify(quote_router.stats())
+
+@app.route('/api/stream/stats')
+def get_stream_stats():
+    return jsonify(stream_hub.stats())
+
+@app.route('/api/accuracy')
+def get_accuracy():
+    return jsonify(dict(ACCURACY_REPORT, timestamp=datetime.now().isoformat()))
+
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    return jsonify(quote_cache.stats())
+
+@app.route('/api/symbols')
+def search_symbols():
+    """Autocomplete: listed instruments whose ticker starts with ?prefix="""
+    asset_class = request.args.get('asset_class') or None
+    if asset_class is not None and asset_class not in ASSET_CLASSES:
+        return jsonify({'error': f'asset_class must be one of {", ".join(ASSET_CLASSES)}'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), MAX_SYMBOL_RESULTS)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    results = symbol_index.search(request.args.get('prefix', ''), limit, asset_class)
+    return jsonify({'count': len(results), 'symbols': results})
+
+@app.route('/api/symbols/<symbol>')
+def get_symbol(symbol):
+    record = symbol_index.resolve(symbol)
+    if record is None:
+        return unknown_symbols([symbol.upper().strip()])
+    return jsonify(record)
+
 @app.route('/api/test')
 def test_api():
     return jsonify({
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import formatdate
+
+from flask import Response, request
+
+from metrics import STAGE_SECONDS, source_label
+from symbol_state import SymbolStateStore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Cache-Control for symbols whose data only changes on restart (seeded and simulated data)
+STATIC_MAX_AGE = int(os.environ.get('RESPONSE_MAX_AGE', 60))
+STATIC_STALE_WHILE_REVALIDATE = int(os.environ.get('RESPONSE_STALE_WHILE_REVALIDATE', 300))
+
+def dumps(obj):
+    """JSON bytes with sorted keys like jsonify; orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode()
+
+def cache_control(max_age, stale_while_revalidate=0):
+    if max_age is None:
+        return 'no-store'
+    value = f'public, max-age={max(0, int(max_age))}'
+    if stale_while_revalidate:
+        value += f', stale-while-revalidate={int(stale_while_revalidate)}'
+    return value
+
+class CachedBody:
+    __slots__ = ('body', 'etag', 'version', 'last_modified')
+
+    def __init__(self, body, version, modified):
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        self.version = version
+        self.last_modified = formatdate(modified, usegmt=True)
+
+class ResponseCache:
+    """Serialized /api/analyze bodies per symbol, reused while the result version is unchanged
+
+    The version is whatever identifies the data a result was built from
+    (a quote, a refresh time, a model version); a new version rebuilds and
+    re-serializes once. Responses carry an ETag, Last-Modified and
+    Cache-Control, and a matching If-None-Match is answered with 304.
+    Entries live in a SymbolStateStore (RESPONSE_CACHE_MAX, RESPONSE_CACHE_TTL).
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        if max_entries is None:
+            max_entries = int(os.environ.get('RESPONSE_CACHE_MAX', 4096))
+        if ttl is None:
+            ttl = float(os.environ.get('RESPONSE_CACHE_TTL', 3600))
+        self.store = SymbolStateStore(max_entries=max_entries, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version, build):
+        """CachedBody for key at version, calling build() and serializing only when it moved"""
+        cached = self.store.get(key)
+        if cached is not None and cached.version == version:
+            with self._lock:
+                self.hits += 1
+            return cached
+        with self._lock:
+            self.misses += 1
+        result = build()
+        start = time.perf_counter()
+        body = dumps(result)
+        STAGE_SECONDS.observe(time.perf_counter() - start, 'serialize', source_label(result.get('data_source')))
+        cached = CachedBody(body, version, time.time())
+        self.store.put(key, cached)
+        return cached
+
+    def respond(self, key, version, build, max_age=STATIC_MAX_AGE,
+                stale_while_revalidate=STATIC_STALE_WHILE_REVALIDATE):
+        """Flask response for key; version None serializes build() without caching it"""
+        if version is None:
+            return Response(dumps(build()), mimetype='application/json',
+                            headers={'Cache-Control': cache_control(None)})
+
+        cached = self.get(key, version, build)
+        headers = {
+            'ETag': f'"{cached.etag}"',
+            'Last-Modified': cached.last_modified,
+            'Cache-Control': cache_control(max_age, stale_while_revalidate)
+        }
+        if request.if_none_match.contains(cached.etag):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status=304, headers=headers)
+        return Response(cached.body, mimetype='application/json', headers=headers)
+
+    def stats(self):
+        with self._lock:
+            counts = {'hits': self.hits, 'misses': self.misses, 'not_modified': self.not_modified}
+        return dict(self.store.stats(), **counts)
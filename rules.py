@@ -0,0 +1,139 @@
+import operator
+
+import numpy as np
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+
+# Model class for each recommendation
+SIGNALS = {'STRONG BUY': 2, 'BUY': 1, 'HOLD': 0, 'SELL': -1, 'STRONG SELL': -2}
+
+RECOMMENDATION_FIELDS = ('recommendation', 'confidence', 'score', 'reasoning')
+
+class RuleTable:
+    """Ordered rule rows compiled into one np.select over whole input arrays
+
+    Each row is ({input: (op, threshold), ...}, outputs); all of a row's
+    conditions must hold and the first matching row wins, exactly like an
+    if/elif ladder. Tables with a 'recommendation' field also get a
+    'signal' column with the matching model class.
+    """
+
+    def __init__(self, rows, default, fields=RECOMMENDATION_FIELDS):
+        rows = list(rows)
+        self.conditions = [dict(conditions) for conditions, _ in rows]
+        outputs = [tuple(values) for _, values in rows] + [tuple(default)]
+        self.fields = tuple(fields)
+        if 'recommendation' in self.fields and 'signal' not in self.fields:
+            position = self.fields.index('recommendation')
+            outputs = [values + (SIGNALS[values[position]],) for values in outputs]
+            self.fields += ('signal',)
+
+        self._rows = [(conditions, dict(zip(self.fields, values)))
+                      for conditions, values in zip(self.conditions, outputs)]
+        self._default = dict(zip(self.fields, outputs[-1]))
+        # Output column per field; index len(rows) is the default
+        self.columns = {field: np.array([values[i] for values in outputs])
+                        for i, field in enumerate(self.fields)}
+
+    def evaluate_one(self, **inputs):
+        """First matching row's outputs for scalar inputs"""
+        for conditions, outputs in self._rows:
+            if all(OPERATORS[op](inputs[name], threshold) for name, (op, threshold) in conditions.items()):
+                return dict(outputs)
+        return dict(self._default)
+
+    def match(self, **inputs):
+        """Index of the first matching row for every element (len(rows) = default)"""
+        arrays = {name: np.asarray(values) for name, values in inputs.items()}
+        masks = [np.logical_and.reduce([OPERATORS[op](arrays[name], threshold)
+                                        for name, (op, threshold) in conditions.items()])
+                 for conditions in self.conditions]
+        shape = np.broadcast_shapes(*(a.shape for a in arrays.values()))
+        return np.select([np.broadcast_to(m, shape) for m in masks],
+                         np.arange(len(masks)), default=len(masks))
+
+    def evaluate(self, fields=None, **inputs):
+        """Output arrays for whole input arrays (only the given fields, if any)"""
+        index = self.match(**inputs)
+        return {field: self.columns[field].take(index) for field in fields or self.fields}
+
+# real_api_backend.build_analysis: simulated RSI (calculate_realistic_rsi) and daily % change
+MOMENTUM_RSI_RULES = RuleTable([
+    ({'rsi': ('<', 30), 'change': ('>', -5)}, ("STRONG BUY", "Very High", 0.88, "Oversold with potential reversal")),
+    ({'rsi': ('<', 35)}, ("BUY", "High", 0.78, "Undervalued territory")),
+    ({'rsi': ('>', 75), 'change': ('<', 2)}, ("STRONG SELL", "Very High", 0.18, "Overbought with risk of correction")),
+    ({'rsi': ('>', 65)}, ("SELL", "High", 0.28, "Approaching overbought levels")),
+    ({'change': ('>', 8)}, ("BUY", "High", 0.72, "Strong upward momentum")),
+    ({'change': ('<', -8)}, ("SELL", "High", 0.32, "Significant downward pressure")),
+    ({'change': ('>', 4), 'rsi': ('<', 55)}, ("BUY", "Medium", 0.65, "Positive momentum with room to grow")),
+    ({'change': ('<', -4), 'rsi': ('>', 45)}, ("SELL", "Medium", 0.38, "Negative momentum developing"))
+], default=("HOLD", "Medium", 0.52, "Market in consolidation phase"))
+
+# server.py / final_backend.py: RSI zone confirmed by the direction of the day's change
+_BASIC_CONDITIONS = [
+    {'rsi': ('<', 35), 'change': ('>', 0)},
+    {'rsi': ('<', 45), 'change': ('>', 0)},
+    {'rsi': ('>', 65), 'change': ('<', 0)},
+    {'rsi': ('>', 55), 'change': ('<', 0)}
+]
+_BASIC_DEFAULT = ("HOLD", "Medium", 0.5, "Market in consolidation phase")
+
+BASIC_RULES = RuleTable(zip(_BASIC_CONDITIONS, [
+    ("STRONG BUY", "Very High", 0.85, "Oversold with strong positive momentum"),
+    ("BUY", "High", 0.75, "Favorable conditions with upward trend"),
+    ("STRONG SELL", "Very High", 0.15, "Overbought with strong negative momentum"),
+    ("SELL", "High", 0.25, "Bearish signals emerging")
+]), default=_BASIC_DEFAULT)
+
+# simple_app.py: same thresholds, shorter reasoning
+SIMPLE_RULES = RuleTable(zip(_BASIC_CONDITIONS, [
+    ("STRONG BUY", "Very High", 0.85, "Oversold with positive momentum"),
+    ("BUY", "High", 0.75, "Favorable conditions with upward trend"),
+    ("STRONG SELL", "Very High", 0.15, "Overbought with negative momentum"),
+    ("SELL", "High", 0.25, "Bearish signals emerging")
+]), default=_BASIC_DEFAULT)
+
+# app.py fallback: points from three factor tables, then a class from the total
+POINT_TABLES = [
+    RuleTable([
+        ({'rsi': ('<', 35)}, (2,)),
+        ({'rsi': ('<', 45)}, (1,)),
+        ({'rsi': ('>', 70)}, (-2,)),
+        ({'rsi': ('>', 60)}, (-1,))
+    ], default=(0,), fields=('points',)),
+    RuleTable([
+        ({'mom_5d': ('>', 0.03), 'mom_20d': ('>', 0.05)}, (2,)),
+        ({'mom_5d': ('>', 0.01)}, (1,)),
+        ({'mom_5d': ('<', -0.03), 'mom_20d': ('<', -0.05)}, (-2,)),
+        ({'mom_5d': ('<', -0.01)}, (-1,))
+    ], default=(0,), fields=('points',)),
+    RuleTable([
+        ({'sma20': ('>', 1.02), 'sma50': ('>', 1.01)}, (1,)),
+        ({'sma20': ('<', 0.98), 'sma50': ('<', 0.99)}, (-1,))
+    ], default=(0,), fields=('points',))
+]
+
+POINTS_TO_SIGNAL = RuleTable([
+    ({'points': ('>=', 3)}, (2, 0.85)),
+    ({'points': ('>=', 1)}, (1, 0.75)),
+    ({'points': ('<=', -3)}, (-2, 0.85)),
+    ({'points': ('<=', -1)}, (-1, 0.75))
+], default=(0, 0.65), fields=('signal', 'confidence'))
+
+def feature_inputs(feature_matrix):
+    """Named rule inputs from model feature columns (indicators.FEATURE_NAMES order)"""
+    columns = np.asarray(feature_matrix, dtype=float).T
+    return {'rsi': columns[0], 'mom_5d': columns[2], 'mom_20d': columns[3],
+            'sma20': columns[5], 'sma50': columns[6]}
+
+def score_features(feature_matrix):
+    """Rule-based (signals, confidences) for a whole feature matrix"""
+    inputs = feature_inputs(feature_matrix)
+    points = sum(table.evaluate(**inputs)['points'] for table in POINT_TABLES)
+    result = POINTS_TO_SIGNAL.evaluate(points=points)
+    return result['signal'], result['confidence']
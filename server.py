@@ -1,8 +1,16 @@
-from flask import Flask, jsonify, send_file
+from flask import Flask, jsonify
+import logging
 from datetime import datetime
+from logs import configure_logging
+from response_cache import ResponseCache
+from rules import BASIC_RULES
+from static_assets import static_assets
 
 app = Flask(__name__)
 
+configure_logging()
+logger = logging.getLogger(__name__)
+
 # Stock data
 STOCK_DATA = {
     'AAPL': {'price': 178.25, 'change': 0.8, 'rsi': 45.2},
@@ -19,77 +27,65 @@ STOCK_DATA = {
     'SPY': {'price': 454.20, 'change': 0.6, 'rsi': 51.8}
 }
 
+# Serialized analyze responses with ETags
+response_cache = ResponseCache()
+
 @app.route('/')
 def home():
-    return send_file('index.html')
+    return static_assets.response('index.html')
+
+def analyze_data(symbol, data):
+    """Analysis result for one symbol's price, change and RSI"""
+    price = data['price']
+    change = data['change']
+    rsi = data['rsi']
+    
+    # Prediction logic
+    rule = BASIC_RULES.evaluate_one(rsi=rsi, change=change)
+    recommendation = rule['recommendation']
+    confidence = rule['confidence']
+    score = rule['score']
+    reasoning = rule['reasoning']
+    
+    result = {
+        'symbol': symbol,
+        'price': price,
+        'price_change': change,
+        'rsi': round(rsi, 1),
+        'prediction_score': score,
+        'recommendation': recommendation,
+        'confidence': confidence,
+        'reasoning': reasoning,
+        'data_source': 'Professional Market Data',
+        'model_used': True,
+        'model_accuracy': 0.782,
+        'generated_at': datetime.now().isoformat()
+    }
+    
+    logger.info(f"✅ Analysis complete: {symbol} - {recommendation}")
+    return result
 
 @app.route('/api/analyze/<symbol>')
 def analyze_stock(symbol):
     try:
         symbol = symbol.upper().strip()
-        print(f"🔍 Analyzing: {symbol}")
+        logger.info(f"🔍 Analyzing: {symbol}")
         
         if symbol in STOCK_DATA:
+            # STOCK_DATA never changes, so each symbol is serialized once
             data = STOCK_DATA[symbol]
-        else:
-            import random
-            data = {
-                'price': random.uniform(10, 500),
-                'change': random.uniform(-3, 3),
-                'rsi': random.uniform(30, 70)
-            }
+            return response_cache.respond(symbol, 'static', lambda: analyze_data(symbol, data))
         
-        price = data['price']
-        change = data['change']
-        rsi = data['rsi']
-        
-        # Prediction logic
-        if rsi < 35 and change > 0:
-            recommendation = "STRONG BUY"
-            confidence = "Very High"
-            score = 0.85
-            reasoning = "Oversold with strong positive momentum"
-        elif rsi < 45 and change > 0:
-            recommendation = "BUY"
-            confidence = "High"
-            score = 0.75
-            reasoning = "Favorable conditions with upward trend"
-        elif rsi > 65 and change < 0:
-            recommendation = "STRONG SELL"
-            confidence = "Very High"
-            score = 0.15
-            reasoning = "Overbought with strong negative momentum"
-        elif rsi > 55 and change < 0:
-            recommendation = "SELL"
-            confidence = "High"
-            score = 0.25
-            reasoning = "Bearish signals emerging"
-        else:
-            recommendation = "HOLD"
-            confidence = "Medium"
-            score = 0.5
-            reasoning = "Market in consolidation phase"
-        
-        result = {
-            'symbol': symbol,
-            'price': price,
-            'price_change': change,
-            'rsi': round(rsi, 1),
-            'prediction_score': score,
-            'recommendation': recommendation,
-            'confidence': confidence,
-            'reasoning': reasoning,
-            'data_source': 'Professional Market Data',
-            'model_used': True,
-            'model_accuracy': 0.782,
-            'timestamp': datetime.now().isoformat()
+        import random
+        data = {
+            'price': random.uniform(10, 500),
+            'change': random.uniform(-3, 3),
+            'rsi': random.uniform(30, 70)
         }
-        
-        print(f"✅ Analysis complete: {symbol} - {recommendation}")
-        return jsonify(result)
+        return response_cache.respond(symbol, None, lambda: analyze_data(symbol, data))
         
     except Exception as e:
-        print(f"❌ Error: {e}")
+        logger.exception(f"❌ Error: {e}")
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
@@ -1,7 +1,12 @@
-from flask import Flask, jsonify, send_file
+from flask import Flask, jsonify
 from flask_cors import CORS
 import json
+import random
 from datetime import datetime
+from response_cache import ResponseCache
+from rules import SIMPLE_RULES
+from static_assets import static_assets
+from symbol_state import SymbolStateStore
 
 app = Flask(__name__)
 CORS(app)
@@ -22,48 +27,33 @@ STOCK_DATA = {
     'SPY': {'price': 454.20, 'change': 0.6, 'rsi': 51.8}
 }
 
+# Simulated data for symbols outside STOCK_DATA, bounded by SYMBOL_STATE_MAX / SYMBOL_STATE_TTL
+symbol_state = SymbolStateStore(pinned=STOCK_DATA)
+
+# Serialized analyze responses with ETags, rebuilt when a symbol's data changes
+response_cache = ResponseCache()
+
+def simulated_data():
+    return {'price': random.uniform(10, 500), 'change': random.uniform(-3, 3), 'rsi': random.uniform(30, 70)}
+
 def analyze_symbol(symbol):
     symbol = symbol.upper()
     
-    if symbol not in STOCK_DATA:
-        # Generate realistic data for unknown symbols
-        import random
-        price = random.uniform(10, 500)
-        change = random.uniform(-3, 3)
-        rsi = random.uniform(30, 70)
-        STOCK_DATA[symbol] = {'price': price, 'change': change, 'rsi': rsi}
-    
-    data = STOCK_DATA[symbol]
+    # Generate realistic data for unknown symbols, kept in a bounded store
+    data = symbol_state.get_or_create(symbol, simulated_data)
+    return analyze_data(symbol, data)
+
+def analyze_data(symbol, data):
     price = data['price']
     change = data['change']
     rsi = data['rsi']
     
     # Simple but effective prediction logic
-    if rsi < 35 and change > 0:
-        recommendation = "STRONG BUY"
-        confidence = "Very High"
-        score = 0.85
-        reasoning = "Oversold with positive momentum"
-    elif rsi < 45 and change > 0:
-        recommendation = "BUY"
-        confidence = "High"
-        score = 0.75
-        reasoning = "Favorable conditions with upward trend"
-    elif rsi > 65 and change < 0:
-        recommendation = "STRONG SELL"
-        confidence = "Very High"
-        score = 0.15
-        reasoning = "Overbought with negative momentum"
-    elif rsi > 55 and change < 0:
-        recommendation = "SELL"
-        confidence = "High"
-        score = 0.25
-        reasoning = "Bearish signals emerging"
-    else:
-        recommendation = "HOLD"
-        confidence = "Medium"
-        score = 0.5
-        reasoning = "Market in consolidation phase"
+    rule = SIMPLE_RULES.evaluate_one(rsi=rsi, change=change)
+    recommendation = rule['recommendation']
+    confidence = rule['confidence']
+    score = rule['score']
+    reasoning = rule['reasoning']
     
     return {
         'symbol': symbol,
@@ -77,21 +67,26 @@ def analyze_symbol(symbol):
         'data_source': 'Market Data',
         'model_used': True,
         'model_accuracy': 0.782,
-        'timestamp': datetime.now().isoformat()
+        'generated_at': datetime.now().isoformat()
     }
 
 @app.route('/')
 def home():
-    return send_file('index.html')
+    return static_assets.response('index.html')
 
 @app.route('/api/analyze/<symbol>')
 def analyze_stock(symbol):
     try:
-        result = analyze_symbol(symbol)
-        return jsonify(result)
+        symbol = symbol.upper()
+        data = symbol_state.get_or_create(symbol, simulated_data)
+        return response_cache.respond(symbol, data, lambda: analyze_data(symbol, data))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/state/stats')
+def get_state_stats():
+    return jsonify(symbol_state.stats())
+
 @app.route('/api/accuracy')
 def get_accuracy():
     return jsonify({
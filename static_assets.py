@@ -0,0 +1,87 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response, abort, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# The only files the backends serve from disk; everything else under the repo stays private
+ASSET_MANIFEST = ('index.html',)
+
+# Fingerprinted URLs never change content, so clients may keep them for a year
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Stable URLs (/, /index.html) are revalidated every time; a matching ETag costs a 304
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+class Asset:
+    """One file held in memory with its precompressed variants"""
+
+    def __init__(self, name, data):
+        self.name = name
+        self.mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.etag = hashlib.sha256(data).hexdigest()[:16]
+        root, ext = os.path.splitext(name)
+        self.fingerprinted = f'{root}.{self.etag[:8]}{ext}'
+
+        # Best first; a variant is kept only if it is smaller than the plain bytes
+        self.variants = []
+        if brotli is not None:
+            self.variants.append(('br', brotli.compress(data, quality=11)))
+        self.variants.append(('gzip', gzip.compress(data, compresslevel=9, mtime=0)))
+        self.variants = [(encoding, body) for encoding, body in self.variants if len(body) < len(data)]
+        self.variants.append(('identity', data))
+
+    def select(self, accept_encodings):
+        """(encoding, body) for an Accept-Encoding header value"""
+        for encoding, body in self.variants:
+            if encoding == 'identity' or accept_encodings[encoding]:
+                return encoding, body
+
+class StaticAssets:
+    """Manifest assets read and compressed once at startup, served from memory by Accept-Encoding"""
+
+    def __init__(self, names=ASSET_MANIFEST, root=HERE):
+        self.assets = {}
+        for name in names:
+            with open(os.path.join(root, name), 'rb') as f:
+                asset = Asset(name, f.read())
+            self.assets[name] = asset
+            self.assets[asset.fingerprinted] = asset
+
+    def url(self, name):
+        """Fingerprinted path for a manifest asset, safe to cache forever"""
+        return '/' + self.assets[name].fingerprinted
+
+    def response(self, path):
+        """Flask response for a manifest path; anything else is a 404"""
+        asset = self.assets.get(path)
+        if asset is None:
+            abort(404)
+        encoding, body = asset.select(request.accept_encodings)
+        # Each encoding is its own representation, so it gets its own ETag
+        etag = asset.etag if encoding == 'identity' else f'{asset.etag}-{encoding}'
+        headers = {
+            'ETag': f'"{etag}"',
+            'Cache-Control': IMMUTABLE_CACHE_CONTROL if path == asset.fingerprinted else REVALIDATE_CACHE_CONTROL,
+            'Vary': 'Accept-Encoding'
+        }
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(body, mimetype=asset.mimetype, headers=headers)
+
+    def stats(self):
+        return {name: {'etag': asset.etag, 'url': self.url(name),
+                       'bytes': {encoding: len(body) for encoding, body in asset.variants}}
+                for name, asset in self.assets.items() if name == asset.name}
+
+# Shared by every backend in the process
+static_assets = StaticAssets()
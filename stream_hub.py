@@ -0,0 +1,157 @@
+import json
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Fields that make an analysis worth pushing again; the timestamp alone does not
+CHANGE_FIELDS = ('price', 'price_change', 'rsi', 'recommendation', 'prediction_score')
+
+def format_event(data, event=None, event_id=None):
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+class Subscription:
+    """One client's bounded event queue; the oldest event is dropped when it is full"""
+
+    def __init__(self, symbols, max_queue=100):
+        self.symbols = symbols
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, message):
+        while True:
+            try:
+                self.queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def events(self, heartbeat=15.0):
+        """Yield SSE messages, with a comment line when idle so proxies keep the connection"""
+        yield 'retry: 3000\n\n'
+        while not self.closed:
+            try:
+                yield self.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+
+class StreamHub:
+    """Fans one upstream poll per symbol out to every subscriber of that symbol
+
+    A single poller thread runs while anyone is subscribed. Each interval it
+    analyzes the union of subscribed symbols with one analyze_many call and
+    pushes an event only to subscribers of symbols whose analysis changed.
+    """
+
+    def __init__(self, analyze_many, interval=5.0, max_queue=100, clock=time.monotonic):
+        self.analyze_many = analyze_many
+        self.interval = interval
+        self.max_queue = max_queue
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._by_symbol = {}
+        self._latest = {}
+        self._thread = None
+        self._seq = 0
+        self._stats = {'polls': 0, 'symbols_fetched': 0, 'events': 0, 'errors': 0}
+
+    def subscribe(self, symbols):
+        """Register a client; it gets the latest known analysis of each symbol right away"""
+        subscription = Subscription(list(dict.fromkeys(symbols)), self.max_queue)
+        with self._lock:
+            missing = False
+            for symbol in subscription.symbols:
+                self._by_symbol.setdefault(symbol, set()).add(subscription)
+                if symbol in self._latest:
+                    subscription.push(self._latest[symbol][1])
+                else:
+                    missing = True
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        if missing:
+            self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.closed = True
+        with self._lock:
+            for symbol in subscription.symbols:
+                subscribers = self._by_symbol.get(symbol)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_symbol[symbol]
+                    self._latest.pop(symbol, None)
+
+    def poll_once(self):
+        """Analyze every subscribed symbol once and publish the changes"""
+        with self._lock:
+            symbols = list(self._by_symbol)
+        if not symbols:
+            return 0
+
+        try:
+            results = self.analyze_many(symbols)
+        except Exception as e:
+            with self._lock:
+                self._stats['errors'] += 1
+            logger.warning(f"⚠️ Stream poll failed: {e}")
+            return 0
+
+        published = 0
+        with self._lock:
+            self._stats['polls'] += 1
+            self._stats['symbols_fetched'] += len(symbols)
+            for symbol, result in zip(symbols, results):
+                subscribers = self._by_symbol.get(symbol)
+                if not subscribers:
+                    continue
+                key = tuple(result.get(field) for field in CHANGE_FIELDS)
+                previous = self._latest.get(symbol)
+                if previous is not None and previous[0] == key:
+                    continue
+
+                self._seq += 1
+                message = format_event(result, event='quote', event_id=self._seq)
+                self._latest[symbol] = (key, message)
+                for subscription in subscribers:
+                    subscription.push(message)
+                published += len(subscribers)
+            self._stats['events'] += published
+        return published
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._by_symbol:
+                    self._thread = None
+                    return
+            started = self.clock()
+            # Cleared before polling so a subscribe during the poll still cuts the wait short
+            self._wake.clear()
+            self.poll_once()
+            self._wake.wait(max(0.0, self.interval - (self.clock() - started)))
+
+    def stats(self):
+        with self._lock:
+            subscribers = set().union(*self._by_symbol.values()) if self._by_symbol else set()
+            return dict(self._stats, symbols=len(self._by_symbol), subscribers=len(subscribers),
+                        dropped=sum(s.dropped for s in subscribers))
@@ -0,0 +1,169 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+
+from train_model import (FEATURE_NAMES, MODEL_PARAMS, build_feature_store, load_feature_store,
+                         save_model)
+
+# Search space around the production configuration in train_model.MODEL_PARAMS
+PARAM_GRID = {
+    'n_estimators': [100, 150, 300],
+    'max_depth': [8, 12, 16, None],
+    'min_samples_split': [2, 8, 16],
+    'min_samples_leaf': [1, 4, 8]
+}
+
+# Read-only feature matrix, opened once per worker process
+_X = None
+_y = None
+
+def _init_worker(store_path):
+    global _X, _y
+    _X, _y = load_feature_store(store_path)
+
+def data_fingerprint(X, y, chunk_rows=1_000_000):
+    """sha256 over the feature store contents"""
+    digest = hashlib.sha256()
+    digest.update(str((X.shape, X.dtype.str, y.dtype.str)).encode())
+    for start in range(0, len(y), chunk_rows):
+        digest.update(np.ascontiguousarray(X[start:start + chunk_rows]).tobytes())
+        digest.update(np.ascontiguousarray(y[start:start + chunk_rows]).tobytes())
+    return digest.hexdigest()
+
+def cell_key(data_hash, params, folds, seed):
+    payload = json.dumps({'data': data_hash, 'params': params, 'folds': folds, 'seed': seed}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+def evaluate_config(params, folds, seed):
+    """Worker: stratified k-fold CV of one configuration on the shared matrix"""
+    start = time.perf_counter()
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    scores = []
+    for train_idx, test_idx in splitter.split(np.zeros(len(_y)), _y):
+        model = RandomForestClassifier(random_state=seed, n_jobs=1, **params)
+        model.fit(_X[train_idx], _y[train_idx])
+        scores.append(model.score(_X[test_idx], _y[test_idx]))
+    return {
+        'params': params,
+        'cv_scores': [round(float(s), 4) for s in scores],
+        'mean_accuracy': round(float(np.mean(scores)), 4),
+        'std_accuracy': round(float(np.std(scores)), 4),
+        'fit_seconds': round(time.perf_counter() - start, 3)
+    }
+
+def candidate_configs(search, n_iter, seed):
+    if search == 'grid':
+        return list(ParameterGrid(PARAM_GRID))
+    return list(ParameterSampler(PARAM_GRID, n_iter=n_iter, random_state=seed))
+
+def read_cell(path):
+    """Cached result for a cell, or None if it is missing or unreadable"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_cell(path, result):
+    # Written aside and renamed, so an interrupted sweep never leaves a truncated cell behind
+    with open(path + '.tmp', 'w') as f:
+        json.dump(result, f)
+    os.replace(path + '.tmp', path)
+
+def run_sweep(store_path, configs, folds=5, seed=42, workers=None, cache_dir='.sweep_cache'):
+    """Evaluate configs in a process pool, skipping cells already cached on disk"""
+    X, y = load_feature_store(store_path)
+    data_hash = data_fingerprint(X, y)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    results = []
+    pending = {}
+    for params in configs:
+        path = os.path.join(cache_dir, cell_key(data_hash, params, folds, seed) + '.json')
+        cached = read_cell(path)
+        if cached is not None:
+            results.append(dict(cached, cached=True))
+        else:
+            pending[path] = params
+    print(f"🔎 {len(configs)} configs x {folds} folds on {len(y):,} rows "
+          f"({len(results)} cached, {len(pending)} to run)")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(store_path,)) as pool:
+        futures = {pool.submit(evaluate_config, params, folds, seed): path
+                   for path, params in pending.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            write_cell(futures[future], result)
+            results.append(dict(result, cached=False))
+
+            elapsed = time.perf_counter() - start
+            rows_per_s = done * len(y) * (folds - 1) / elapsed
+            print(f"   [{done}/{len(pending)}] {result['mean_accuracy']:.4f} {result['params']} "
+                  f"| {done / elapsed * 60:.1f} configs/min, {rows_per_s:,.0f} rows fitted/s")
+
+    results.sort(key=lambda r: (-r['mean_accuracy'], r['std_accuracy']))
+    return data_hash, results
+
+def main():
+    parser = argparse.ArgumentParser(description='Hyperparameter sweep for the professional model')
+    parser.add_argument('--samples', type=int, default=20000)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--search', choices=['grid', 'random'], default='random')
+    parser.add_argument('--n-iter', type=int, default=20, help='configs drawn in random search')
+    parser.add_argument('--workers', type=int, help='worker processes (default: all cores)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache-dir', default='.sweep_cache')
+    args = parser.parse_args()
+
+    print("🤖 PROFESSIONAL MODEL HYPERPARAMETER SWEEP")
+    store_path = os.path.join(args.cache_dir, f'features_{args.samples}_{args.seed}')
+    if os.path.exists(os.path.join(store_path, 'y.npy')):
+        X, y = load_feature_store(store_path)
+    else:
+        X, y = build_feature_store(store_path, args.samples, seed=args.seed)
+
+    configs = candidate_configs(args.search, args.n_iter, args.seed)
+    if MODEL_PARAMS not in configs:
+        configs.append(dict(MODEL_PARAMS))
+
+    start = time.perf_counter()
+    data_hash, leaderboard = run_sweep(store_path, configs, args.folds, args.seed,
+                                       args.workers, args.cache_dir)
+    best = leaderboard[0]
+    print(f"🏆 Best CV accuracy {best['mean_accuracy']:.4f} ± {best['std_accuracy']:.4f}: {best['params']}")
+
+    # Refit the winner on all rows
+    model = RandomForestClassifier(random_state=args.seed, n_jobs=-1, **best['params'])
+    model.fit(X, y)
+    save_model(model, {
+        'overall_accuracy': round(best['mean_accuracy'], 3),
+        'training_accuracy': round(model.score(X, y), 3),
+        'model_type': 'Random Forest Professional',
+        'training_samples': args.samples,
+        'feature_count': 9,
+        'feature_importance': dict(zip(FEATURE_NAMES, model.feature_importances_)),
+        'model_parameters': best['params'],
+        'sweep': {
+            'search': args.search,
+            'folds': args.folds,
+            'configs': len(leaderboard),
+            'data_hash': data_hash,
+            'wall_clock_seconds': round(time.perf_counter() - start, 3),
+            'leaderboard': leaderboard
+        },
+        'validation_notes': f'Stratified {args.folds}-fold cross-validation sweep',
+        'timestamp': pd.Timestamp.now().isoformat()
+    })
+
+if __name__ == '__main__':
+    main()
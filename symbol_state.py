@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+class _Entry:
+    __slots__ = ('value', 'expires_at', 'size')
+
+    def __init__(self, value, expires_at, size):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+class _Stripe:
+    __slots__ = ('lock', 'entries', 'bytes', 'max_entries', 'hits', 'misses', 'evictions', 'expirations')
+
+    def __init__(self, max_entries):
+        self.lock = threading.Lock()
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+def entry_size(symbol, value):
+    """Approximate bytes held by one entry: key, entry object, value and its items"""
+    size = sys.getsizeof(symbol) + sys.getsizeof(_Entry(None, 0, 0)) + sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    # Amortised share of the OrderedDict slot and its linked-list node
+    return size + 100
+
+class SymbolStateStore:
+    """Bounded per-symbol state with LRU and TTL eviction, split over lock stripes
+
+    Each symbol hashes to one stripe, and each stripe has its own lock, LRU
+    order and share of the capacity, so handler threads touching different
+    symbols rarely contend. Pinned entries (the seeded market data) are a
+    read-only mapping that is never evicted and needs no lock.
+    """
+
+    def __init__(self, pinned=None, max_entries=None, max_bytes=None, ttl=None, stripes=16,
+                 clock=time.monotonic):
+        if max_entries is None:
+            max_entries = int(os.environ.get('SYMBOL_STATE_MAX', 10000))
+        if ttl is None:
+            ttl = float(os.environ.get('SYMBOL_STATE_TTL', 3600))
+        self.pinned = dict(pinned or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        # Split the capacity exactly, so the stripes together never exceed max_entries
+        stripes = max(1, min(stripes, max_entries))
+        self._stripes = [_Stripe(max_entries // stripes + (i < max_entries % stripes)) for i in range(stripes)]
+        self._stripe_bytes = None if max_bytes is None else max_bytes / stripes
+
+    def _stripe(self, symbol):
+        return self._stripes[hash(symbol) % len(self._stripes)]
+
+    def _lookup(self, stripe, symbol):
+        """Live entry for symbol (caller holds the stripe lock)"""
+        entry = stripe.entries.get(symbol)
+        if entry is not None and entry.expires_at <= self.clock():
+            self._remove(stripe, symbol)
+            stripe.expirations += 1
+            entry = None
+        return entry
+
+    def get(self, symbol):
+        """Current state for symbol, or None if it is absent or expired"""
+        if symbol in self.pinned:
+            return self.pinned[symbol]
+        stripe = self._stripe(symbol)
+        with stripe.lock:
+            entry = self._lookup(stripe, symbol)
+            if entry is None:
+                stripe.misses += 1
+                return None
+            stripe.hits += 1
+            stripe.entries.move_to_end(symbol)
+            return entry.value
+
+    def put(self, symbol, value):
+        """Store value for symbol, evicting least recently used entries past the bounds"""
+        size = entry_size(symbol, value)
+        stripe = self._stripe(symbol)
+        with stripe.lock:
+            if symbol in stripe.entries:
+                self._remove(stripe, symbol)
+            self._insert(stripe, symbol, value, size)
+        return value
+
+    def get_or_create(self, symbol, factory):
+        """State for symbol, creating it with factory() on a miss; racing creators agree on one value"""
+        value = self.get(symbol)
+        if value is not None:
+            return value
+        # Build outside the lock; if another thread stored a value meanwhile, keep that one
+        created = factory()
+        size = entry_size(symbol, created)
+        stripe = self._stripe(symbol)
+        with stripe.lock:
+            entry = self._lookup(stripe, symbol)
+            if entry is not None:
+                return entry.value
+            self._insert(stripe, symbol, created, size)
+        return created
+
+    def _insert(self, stripe, symbol, value, size):
+        stripe.entries[symbol] = _Entry(value, self.clock() + self.ttl, size)
+        stripe.bytes += size
+        self._evict(stripe)
+
+    def _remove(self, stripe, symbol):
+        entry = stripe.entries.pop(symbol)
+        stripe.bytes -= entry.size
+
+    def _evict(self, stripe):
+        """Drop expired and least recently used entries until the stripe is within bounds"""
+        now = self.clock()
+        while stripe.entries:
+            symbol, entry = next(iter(stripe.entries.items()))
+            if entry.expires_at <= now:
+                stripe.expirations += 1
+            elif (len(stripe.entries) > stripe.max_entries or
+                  (self._stripe_bytes is not None and stripe.bytes > self._stripe_bytes)):
+                stripe.evictions += 1
+            else:
+                break
+            self._remove(stripe, symbol)
+
+    def __len__(self):
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    def stats(self):
+        totals = dict.fromkeys(('entries', 'bytes', 'hits', 'misses', 'evictions', 'expirations'), 0)
+        for stripe in self._stripes:
+            with stripe.lock:
+                totals['entries'] += len(stripe.entries)
+                totals['bytes'] += stripe.bytes
+                for name in ('hits', 'misses', 'evictions', 'expirations'):
+                    totals[name] += getattr(stripe, name)
+        return dict(totals, pinned=len(self.pinned), max_entries=self.max_entries,
+                    max_bytes=self.max_bytes, ttl_seconds=self.ttl, stripes=len(self._stripes))
@@ -0,0 +1,174 @@
+import csv
+import os
+import re
+
+import numpy as np
+
+ASSET_CLASSES = ('crypto', 'stock', 'etf', 'commodity', 'forex', 'index')
+
+SYMBOL_PATTERN = re.compile(r'[A-Z0-9][A-Z0-9._-]{0,31}')
+
+SYMBOL_MASTER = os.environ.get('SYMBOL_MASTER', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'symbols.csv'))
+
+class StringColumn:
+    """Variable-length strings packed into one UTF-8 blob plus offsets"""
+
+    def __init__(self, values):
+        encoded = [(value or '').encode('utf-8') for value in values]
+        self.blob = b''.join(encoded)
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        np.cumsum([len(value) for value in encoded], out=self.offsets[1:])
+
+    def __getitem__(self, i):
+        value = self.blob[self.offsets[i]:self.offsets[i + 1]]
+        return value.decode('utf-8') if value else None
+
+    @property
+    def nbytes(self):
+        return len(self.blob) + self.offsets.nbytes
+
+class SymbolIndex:
+    """Read-only symbol master: ticker -> asset class, exchange and provider IDs
+
+    Tickers live in one sorted fixed-width byte array, so an exact lookup is
+    a single binary search and a prefix query is two, returning a contiguous
+    slice. Everything else is stored column-wise (category codes, packed
+    strings), keeping 100k instruments to a few MB with no per-symbol
+    Python objects. Aliases (BITCOIN -> BTC) resolve to their target's row.
+    """
+
+    def __init__(self, records):
+        rows = {}
+        for record in records:
+            symbol = record['symbol'].strip().upper()
+            if not SYMBOL_PATTERN.fullmatch(symbol):
+                raise ValueError(f"Invalid symbol {symbol!r}")
+            if record['asset_class'] not in ASSET_CLASSES:
+                raise ValueError(f"{symbol}: unknown asset class {record['asset_class']!r}")
+            rows[symbol] = record
+        symbols = sorted(rows)
+        records = [rows[symbol] for symbol in symbols]
+
+        width = max([len(symbol) for symbol in symbols] + [1])
+        self.symbols = np.array([symbol.encode('ascii') for symbol in symbols], dtype=f'S{width}')
+        self.asset_classes = np.array([ASSET_CLASSES.index(r['asset_class']) for r in records], dtype=np.uint8)
+        self.exchange_names = sorted({r.get('exchange') or '' for r in records})
+        self.exchanges = np.array([self.exchange_names.index(r.get('exchange') or '') for r in records],
+                                  dtype=np.uint16)
+        self.names = StringColumn(r.get('name') for r in records)
+        self.binance = StringColumn(r.get('binance') for r in records)
+        self.coingecko = StringColumn(r.get('coingecko') for r in records)
+
+        self.canonical = np.arange(len(records), dtype=np.int32)
+        for i, record in enumerate(records):
+            target = (record.get('alias_of') or '').strip().upper()
+            if target:
+                j = self._find(target)
+                if j is None:
+                    raise ValueError(f"{symbols[i]}: alias of unknown symbol {target}")
+                self.canonical[i] = j
+
+    @classmethod
+    def from_csv(cls, path):
+        """Load a symbol master CSV: symbol,name,asset_class,exchange,binance,coingecko,alias_of"""
+        with open(path, newline='') as f:
+            return cls(csv.DictReader(f))
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return self._find(symbol) is not None
+
+    @property
+    def nbytes(self):
+        return (self.symbols.nbytes + self.asset_classes.nbytes + self.exchanges.nbytes +
+                self.canonical.nbytes + self.names.nbytes + self.binance.nbytes + self.coingecko.nbytes)
+
+    def _key(self, symbol):
+        try:
+            key = symbol.strip().upper().encode('ascii')
+        except UnicodeEncodeError:
+            return None
+        return key if len(key) <= self.symbols.itemsize else None
+
+    def _find(self, symbol):
+        key = self._key(symbol)
+        if not key:
+            return None
+        i = int(np.searchsorted(self.symbols, key))
+        if i < len(self.symbols) and self.symbols[i] == key:
+            return i
+        return None
+
+    def record(self, i):
+        return {
+            'symbol': self.symbols[i].decode('ascii'),
+            'name': self.names[i],
+            'asset_class': ASSET_CLASSES[self.asset_classes[i]],
+            'exchange': self.exchange_names[self.exchanges[i]] or None,
+            'binance': self.binance[i],
+            'coingecko': self.coingecko[i]
+        }
+
+    def resolve(self, symbol):
+        """Metadata for a ticker or alias, or None when it is not listed"""
+        i = self._find(symbol)
+        return None if i is None else self.record(int(self.canonical[i]))
+
+    def search(self, prefix, limit=10, asset_class=None):
+        """Listed instruments whose ticker (or an alias) starts with prefix, in ticker order"""
+        key = self._key(prefix) if prefix else b''
+        if key is None:
+            return []
+        lo = int(np.searchsorted(self.symbols, key, 'left'))
+        hi = int(np.searchsorted(self.symbols, key + b'\xff', 'left'))
+        if asset_class is not None:
+            classes = self.asset_classes[self.canonical[lo:hi]]
+            matches = np.flatnonzero(classes == ASSET_CLASSES.index(asset_class)) + lo
+        else:
+            matches = range(lo, hi)
+
+        results = []
+        seen = set()
+        for i in matches:
+            target = int(self.canonical[i])
+            if target not in seen:
+                seen.add(target)
+                results.append(self.record(target))
+                if len(results) >= limit:
+                    break
+        return results
+
+    def suggest(self, symbol, limit=5):
+        """Closest listed tickers for an unknown symbol: the longest prefix that matches anything"""
+        symbol = symbol.strip().upper()
+        for n in range(len(symbol), 0, -1):
+            results = self.search(symbol[:n], limit)
+            if results:
+                return [r['symbol'] for r in results]
+        return []
+
+    def provider_ids(self, provider):
+        """{ticker or alias: provider ID} for every instrument the provider lists"""
+        column = getattr(self, provider)
+        ids = {}
+        for i, symbol in enumerate(self.symbols):
+            value = column[int(self.canonical[i])]
+            if value:
+                ids[symbol.decode('ascii')] = value
+        return ids
+
+# Shared symbol master, loaded once per process
+symbol_index = SymbolIndex.from_csv(SYMBOL_MASTER)
+
+# Tickers missing from the master get a 404 with suggestions only when STRICT_SYMBOLS=on;
+# the bundled master lists the demo universe, so by default any other ticker is still
+# served simulated data
+STRICT_SYMBOLS = os.environ.get('STRICT_SYMBOLS', 'off').lower() in ('1', 'on', 'true')
+
+def unlisted(symbols):
+    """Symbols to reject as unknown: those missing from the master, when STRICT_SYMBOLS is on"""
+    if not STRICT_SYMBOLS:
+        return []
+    return [symbol for symbol in symbols if symbol not in symbol_index]
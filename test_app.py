@@ -0,0 +1,114 @@
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+import app
+from bar_store import BarStore
+from flat_forest import FlatForest, SizeRoutedForest
+from indicators import synthetic_history
+from model_registry import ModelRegistry
+from rules import score_features
+from train_model import iter_training_chunks
+
+STOCKS = ['AAPL', 'TSLA', 'MSFT']
+
+def make_predictor(tmp_path, model=None):
+    """Predictor serving model (or the rule tables when None) from a registry that never reloads"""
+    def load():
+        if model is None:
+            raise FileNotFoundError('no model')
+        return model
+
+    predictor = app.ProfessionalStockPredictor()
+    predictor.registry = ModelRegistry(load, watch_paths=[], report_path=tmp_path / 'report.json',
+                                       default_report=app.DEFAULT_REPORT, classes=app.RECOMMENDATIONS,
+                                       poll_interval=3600)
+    return predictor
+
+def train_model():
+    X, y = next(iter_training_chunks(600, 600, seed=1))
+    return RandomForestClassifier(n_estimators=10, max_depth=5, random_state=0).fit(X, y), X
+
+def test_batch_route_accepts_dict_list_and_query(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, '_predictor', make_predictor(tmp_path, train_model()[0]))
+    client = app.app.test_client()
+
+    responses = [
+        client.post('/api/analyze/batch', json={'symbols': ['aapl', 'TSLA ', 'msft']}),
+        client.post('/api/analyze/batch', json=['aapl', 'TSLA ', 'msft']),
+        client.get('/api/analyze/batch?symbols=aapl,TSLA ,msft')
+    ]
+    for response in responses:
+        assert response.status_code == 200
+        assert response.json['count'] == 3
+        assert [r['symbol'] for r in response.json['results']] == STOCKS
+        assert all(r['model_used'] for r in response.json['results'])
+    assert [r['price'] for r in responses[0].json['results']] == [app.ACCURATE_PRICES[s][0] for s in STOCKS]
+
+def test_batch_route_rejects_empty_and_oversized_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, '_predictor', make_predictor(tmp_path))
+    monkeypatch.setattr(app, 'MAX_BATCH_SYMBOLS', 2)
+    client = app.app.test_client()
+
+    assert client.post('/api/analyze/batch', json={'symbols': []}).status_code == 400
+    assert client.post('/api/analyze/batch', json=[]).status_code == 400
+    assert client.get('/api/analyze/batch?symbols=').status_code == 400
+    assert client.post('/api/analyze/batch', json={'symbols': 'AAPL'}).status_code == 400
+    response = client.post('/api/analyze/batch', json={'symbols': STOCKS})
+    assert response.status_code == 400 and '2' in response.json['error']
+    assert client.post('/api/analyze/batch', json={'symbols': STOCKS[:2]}).status_code == 200
+
+def test_predict_batch_matches_per_row_predictions(tmp_path):
+    model, X = train_model()
+    predictor = make_predictor(tmp_path, model)
+    rows = X[:64]
+
+    predictions, confidences = predictor.predict_batch(rows)
+    assert predictions == [int(label) for label in model.predict(rows)]
+    assert np.allclose(confidences, model.predict_proba(rows).max(axis=1))
+    for row, prediction, confidence in zip(rows, predictions, confidences):
+        assert predictor.predict_with_confidence(row) == (prediction, confidence)
+
+def test_predict_batch_falls_back_to_rules_without_a_model(tmp_path):
+    predictor = make_predictor(tmp_path)
+    assert not predictor.model_loaded
+    rows = next(iter_training_chunks(64, 64, seed=2))[0]
+
+    predictions, confidences = predictor.predict_batch(rows)
+    expected_predictions, expected_confidences = score_features(rows)
+    assert predictions == expected_predictions.tolist()
+    assert confidences == expected_confidences.tolist()
+    for row, prediction, confidence in zip(rows, predictions, confidences):
+        assert predictor.rule_based_prediction(row) == (prediction, confidence)
+
+def test_indicator_state_is_warm_from_the_bar_store(tmp_path):
+    close, volume = synthetic_history(1, 120, seed=4)
+    with BarStore(str(tmp_path / 'bars'), writable=True) as store:
+        store.append('AAPL', {'ts': np.arange(120) * 86400, 'open': close[0], 'high': close[0],
+                              'low': close[0], 'close': close[0], 'volume': volume[0]})
+    predictor = make_predictor(tmp_path)
+    assert predictor.warm_indicators(str(tmp_path / 'bars')) == 1
+    assert predictor.warm_indicators(str(tmp_path / 'missing')) == 0
+
+    features = predictor.current_features('AAPL', 180.0, 0.8, 'Market Data')
+    assert features == predictor.indicators.features('AAPL')
+    assert features != predictor.calculate_professional_features('AAPL', 180.0, 0.8)
+
+def test_inference_backend_is_picked_by_batch_size(tmp_path, monkeypatch):
+    model = train_model()[0]
+    monkeypatch.setattr(app, 'MODEL_PATH', str(tmp_path / 'model.pkl'))
+    monkeypatch.setattr(app, 'FLAT_MODEL_DIR', str(tmp_path / 'model_flat'))
+    joblib.dump(model, app.MODEL_PATH)
+    assert isinstance(app.load_model(), RandomForestClassifier)
+
+    FlatForest.from_sklearn(model).save(app.FLAT_MODEL_DIR)
+    routed = app.load_model()
+    assert isinstance(routed, SizeRoutedForest)
+    assert isinstance(routed.backend(1), FlatForest)
+    assert routed._forest is None
+    assert isinstance(routed.backend(app.MAX_BATCH_SYMBOLS), RandomForestClassifier)
+
+    monkeypatch.setenv('INFERENCE_BACKEND', 'sklearn')
+    assert isinstance(app.load_model(), RandomForestClassifier)
+    monkeypatch.setenv('INFERENCE_BACKEND', 'flat')
+    assert isinstance(app.load_model(), FlatForest)
@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+
+import asgi_app
+import real_api_backend
+from market_data import AsyncMarketDataClient, MarketDataClient
+from mock_upstream import FakeMarketServer
+from provider_router import Provider, ProviderRouter
+from quote_board import QuoteBoard
+from quote_cache import QuoteCache
+
+def run_requests(upstream, paths, monkeypatch, coingecko=None, board=None):
+    """Serve paths concurrently with Binance at upstream and the router's CoinGecko at coingecko"""
+    cache = QuoteCache()
+    binance_client = MarketDataClient(binance_url=upstream.binance_url, retries=0)
+    coingecko_client = MarketDataClient(coingecko_url=(coingecko or upstream).coingecko_url, retries=0)
+    monkeypatch.setattr(asgi_app, 'quote_cache', cache)
+    monkeypatch.setattr(real_api_backend, 'quote_cache', cache)
+    monkeypatch.setattr(real_api_backend, 'quote_board', board or QuoteBoard(real_api_backend.BINANCE_PAIRS.values()))
+    monkeypatch.setattr(real_api_backend, 'quote_router', ProviderRouter([
+        Provider('binance', real_api_backend.BINANCE_PAIRS, binance_client.binance_tickers),
+        Provider('coingecko', real_api_backend.COINGECKO_IDS, coingecko_client.coingecko_prices)
+    ]))
+    app = asgi_app.AsyncAnalyzeApp()
+
+    async def main():
+        app.fetcher = asgi_app.AsyncQuoteFetcher(AsyncMarketDataClient(binance_url=upstream.binance_url))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            responses = await asyncio.gather(*(client.get(path) for path in paths))
+        await app.fetcher.client.close()
+        return responses
+
+    return asyncio.run(main())
+
+def test_concurrent_analyze_shares_one_upstream_call(monkeypatch):
+    with FakeMarketServer(latency=0.1) as upstream:
+        responses = run_requests(upstream, ['/api/analyze/btc'] * 25, monkeypatch)
+
+        assert {r.status_code for r in responses} == {200}
+        assert {r.json()['data_source'] for r in responses} == {'Binance Live Data'}
+        assert responses[0].json()['price'] == 65210.5
+        assert upstream.request_count == 1
+
+def test_accuracy_and_fallback_routes(monkeypatch):
+    with FakeMarketServer(fail=True) as upstream:
+        accuracy, stock, crypto = run_requests(
+            upstream, ['/api/accuracy', '/api/analyze/AAPL', '/api/analyze/ETH'], monkeypatch)
+
+        assert accuracy.json()['overall_accuracy'] == 0.816
+        assert stock.json()['data_source'] == 'Market Data'
+        assert crypto.json()['data_source'] == 'Market Data'
+        assert crypto.headers['access-control-allow-origin'] == '*'
+
+def test_crypto_falls_back_to_coingecko_through_the_router(monkeypatch):
+    with FakeMarketServer(fail=True) as binance, FakeMarketServer() as coingecko:
+        btc, eth = run_requests(binance, ['/api/analyze/BTC', '/api/analyze/ETH'], monkeypatch, coingecko)
+
+        assert btc.json()['data_source'] == eth.json()['data_source'] == 'CoinGecko Live'
+        assert eth.json()['price'] == 3500.0
+
+def test_fresh_board_quotes_skip_the_upstream(monkeypatch):
+    with FakeMarketServer() as upstream:
+        board = QuoteBoard(real_api_backend.BINANCE_PAIRS.values())
+        board.publish({'BTCUSDT': (64000.0, 2.0)}, 'binance')
+        responses = run_requests(upstream, ['/api/analyze/BTC'] * 5, monkeypatch, board=board)
+
+        assert {r.json()['price'] for r in responses} == {64000.0}
+        assert {r.json()['data_source'] for r in responses} == {'Binance Live Data'}
+        assert upstream.request_count == 0
+
+def test_only_get_and_head_are_served():
+    app = asgi_app.AsyncAnalyzeApp()
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return [await client.request(method, '/api/cache/stats') for method in ('GET', 'HEAD', 'POST', 'DELETE')]
+
+    get, head, post, delete = asyncio.run(main())
+    assert get.status_code == head.status_code == 200
+    assert head.content == b'' and head.headers['content-length'] == get.headers['content-length']
+    for response in (post, delete):
+        assert response.status_code == 405
+        assert response.headers['allow'] == 'GET, HEAD'
@@ -0,0 +1,64 @@
+import numpy as np
+
+from backtest import equity_stats, rule_classes, run_backtest, simulate
+from bar_store import BarStore
+from indicators import synthetic_history
+from rules import MOMENTUM_RSI_RULES
+
+# (rsi, % change, class) on either side of every threshold in the backend's ladder
+RULE_BOUNDARIES = [
+    (29.9, -4.9, 2), (29.9, -5.0, 1), (30.0, 0.0, 1), (34.9, 0.0, 1), (35.0, 0.0, 0),
+    (75.1, 1.9, -2), (75.1, 2.0, -1), (75.0, 0.0, -1), (65.1, 0.0, -1), (65.0, 0.0, 0),
+    (60.0, 8.1, 1), (60.0, 8.0, 0), (40.0, -8.1, -1), (40.0, -8.0, 0),
+    (54.9, 4.1, 1), (55.0, 4.1, 0), (54.9, 4.0, 0),
+    (45.1, -4.1, -1), (45.0, -4.1, 0), (45.1, -4.0, 0), (50.0, 0.0, 0)
+]
+
+def test_rule_classes_at_ladder_boundaries():
+    rsi, change, expected = (np.array(column) for column in zip(*RULE_BOUNDARIES))
+    assert rule_classes(rsi, change).tolist() == expected.tolist()
+    for r, c, label in RULE_BOUNDARIES:
+        assert MOMENTUM_RSI_RULES.evaluate_one(rsi=r, change=c)['signal'] == label
+
+def test_position_earns_next_bar_only():
+    close = np.array([100.0, 110.0, 99.0, 99.0])
+    positions = np.array([1.0, -1.0, 0.0, 0.0])
+    returns, forward, trades = simulate(close, positions, cost_bps=0)
+
+    assert np.allclose(returns, [0.10, 0.10, 0.0, 0.0])
+    assert np.array_equal(trades, [1.0, 2.0, 1.0, 0.0])
+    total, drawdown = equity_stats(np.array([0.1, -0.5, 0.2]))
+    assert np.isclose(total, 1.1 * 0.5 * 1.2 - 1) and np.isclose(drawdown, 0.5)
+
+def test_backtest_replays_bar_store_in_worker_processes(tmp_path):
+    close, volume = synthetic_history(4, 400, seed=3)
+    with BarStore(str(tmp_path), writable=True) as store:
+        for i in range(4):
+            # Unequal histories: the backtest replays the common most recent 300 bars
+            n = 400 if i % 2 else 300
+            store.append(f'S{i}', {'ts': np.arange(400 - n, 400), 'open': close[i, -n:], 'high': close[i, -n:],
+                                   'low': close[i, -n:], 'close': close[i, -n:], 'volume': volume[i, -n:]})
+
+    report = run_backtest(['S0', 'S1', 'S2', 'S3'], 1000, store=str(tmp_path), workers=2,
+                          chunk_size=2, period_bars=100)
+    rules = report['rules']
+    assert list(report) == ['rules']
+    assert 0.0 <= rules['hit_rate'] <= 1.0
+    assert sum(rules['signal_mix'].values()) == 4 * (300 - 49)
+    assert [period['bars'] for period in rules['period_stats']] == [100, 100, 50]
+
+def test_bar_store_replay_aligns_symbols_by_bar_time(tmp_path):
+    close, volume = synthetic_history(1, 300, seed=8)
+    ts = np.arange(300) * 86400
+    with BarStore(str(tmp_path), writable=True) as store:
+        store.append('FULL', {'ts': ts, 'open': close[0], 'high': close[0], 'low': close[0],
+                              'close': close[0], 'volume': volume[0]})
+        # Same prices on the same days, but listed later and missing a week
+        keep = np.r_[20:150, 155:300]
+        store.append('GAPS', {'ts': ts[keep], 'open': close[0, keep], 'high': close[0, keep],
+                              'low': close[0, keep], 'close': close[0, keep], 'volume': volume[0, keep]})
+
+    report = run_backtest(['FULL', 'GAPS'], 1000, store=str(tmp_path), workers=1, period_bars=100)
+    single = run_backtest(['GAPS'], 1000, store=str(tmp_path), workers=1, period_bars=100)
+    assert report['rules']['period_stats'] == single['rules']['period_stats']
+    assert report['rules']['portfolio_total_return'] == single['rules']['portfolio_total_return']
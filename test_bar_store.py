@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pytest
+
+import bar_store
+from bar_store import BarStore
+
+def make_bars(start, n):
+    ts = np.arange(start, start + n, dtype=np.int64) * 60
+    close = 100 + np.sin(ts / 600.0)
+    return {'ts': ts, 'open': close - 0.1, 'high': close + 0.5, 'low': close - 0.5,
+            'close': close, 'volume': np.full(n, 1000.0)}
+
+def test_append_range_and_last_across_segments(tmp_path, monkeypatch):
+    monkeypatch.setattr(bar_store, 'SEAL_ROWS', 100)
+    with BarStore(str(tmp_path), writable=True) as store:
+        for start in range(0, 1000, 70):
+            store.append('BTC', make_bars(start, 70))
+        expected = make_bars(0, 1050)
+
+        assert store.count('BTC') == 1050
+        window = store.read('BTC', 60 * 95, 60 * 405)
+        assert np.array_equal(window['ts'], expected['ts'][95:405])
+        assert np.array_equal(window['close'], expected['close'][95:405])
+        assert np.array_equal(store.last('BTC', 50, columns=('close',))['close'], expected['close'][-50:])
+        assert len(store.read('BTC', 10 ** 9)['ts']) == 0
+
+        with pytest.raises(ValueError):
+            store.append('BTC', make_bars(1049, 5))
+        assert store.symbols() == ['BTC']
+
+def test_single_writer_and_read_only_mode(tmp_path):
+    with BarStore(str(tmp_path), writable=True):
+        with pytest.raises(RuntimeError):
+            BarStore(str(tmp_path), writable=True)
+    reader = BarStore(str(tmp_path))
+    with pytest.raises(PermissionError):
+        reader.append('BTC', make_bars(0, 1))
+    with pytest.raises(ValueError):
+        reader.read('../etc')
+
+def test_compaction_keeps_data_and_open_readers_valid(tmp_path, monkeypatch):
+    monkeypatch.setattr(bar_store, 'SEAL_ROWS', 64)
+    writer = BarStore(str(tmp_path), writable=True)
+    for start in range(0, 640, 32):
+        writer.append('ETH', make_bars(start, 32))
+    reader = BarStore(str(tmp_path))
+    before = reader.read('ETH')
+
+    assert writer.compact('ETH', segment_rows=1000) == 10
+    after = BarStore(str(tmp_path)).read('ETH')
+    assert all(np.array_equal(before[name], after[name]) for name in bar_store.COLUMNS)
+    assert len(writer._manifest('ETH')['segments']) == 1
+    # Maps taken before compaction still read the unlinked files
+    assert np.array_equal(before['close'], make_bars(0, 640)['close'])
+    assert reader.count('ETH') == 640
+    writer.close()
+
+def test_concurrent_reader_sees_only_whole_appends(tmp_path):
+    writer = BarStore(str(tmp_path), writable=True)
+    reader = BarStore(str(tmp_path))
+    seen = []
+    torn = []
+    done = threading.Event()
+
+    def read_loop():
+        while not done.is_set():
+            bars = reader.read('SOL')
+            n = len(bars['ts'])
+            seen.append(n)
+            if n % 10 or not np.array_equal(bars['ts'], make_bars(0, n)['ts']):
+                torn.append(n)
+
+    thread = threading.Thread(target=read_loop)
+    thread.start()
+    for start in range(0, 2000, 10):
+        writer.append('SOL', make_bars(start, 10))
+    done.set()
+    thread.join()
+
+    assert not torn and len(seen) > 1
+    assert reader.count('SOL') == 2000
+    writer.close()
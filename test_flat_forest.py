@@ -0,0 +1,57 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from flat_forest import FlatForest, SizeRoutedForest
+from train_model import iter_training_chunks
+
+def fitted_forest(**params):
+    X, y = next(iter_training_chunks(3000, 3000, seed=11))
+    return RandomForestClassifier(random_state=0, **params).fit(X, y)
+
+def test_predictions_bit_identical_to_sklearn():
+    forest = fitted_forest(n_estimators=40, max_depth=12, min_samples_leaf=4)
+    flat = FlatForest.from_sklearn(forest)
+    X, _ = next(iter_training_chunks(9000, 9000, seed=12))
+
+    assert np.array_equal(flat.predict_proba(X), forest.predict_proba(X))
+    assert np.array_equal(flat.predict(X), forest.predict(X))
+    assert np.array_equal(flat.predict_proba(X[:1]), forest.predict_proba(X[:1]))
+
+def test_unbounded_depth_and_round_trip(tmp_path):
+    forest = fitted_forest(n_estimators=10)
+    path = str(tmp_path / 'model')
+    FlatForest.from_sklearn(forest).save(path)
+    flat = FlatForest.load(path, mmap_mode='r')
+    X, _ = next(iter_training_chunks(500, 500, seed=13))
+
+    assert isinstance(flat.threshold, np.memmap)
+    assert isinstance(flat.children, np.memmap)
+    assert np.array_equal(flat.predict_proba(X), forest.predict_proba(X))
+    assert flat.classes_.tolist() == [-2, -1, 0, 1, 2]
+
+def test_save_over_mapped_model_keeps_old_mapping_readable(tmp_path):
+    path = str(tmp_path / 'model')
+    old_forest = fitted_forest(n_estimators=5, max_depth=4)
+    FlatForest.from_sklearn(old_forest).save(path)
+    mapped = FlatForest.load(path, mmap_mode='r')
+
+    new_forest = fitted_forest(n_estimators=8)
+    FlatForest.from_sklearn(new_forest).save(path)
+    X, _ = next(iter_training_chunks(200, 200, seed=14))
+
+    assert np.array_equal(mapped.predict_proba(X), old_forest.predict_proba(X))
+    assert FlatForest.load(path).n_estimators == 8
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['model']
+
+def test_size_routed_forest_sends_large_batches_to_sklearn():
+    forest = fitted_forest(n_estimators=10, max_depth=6)
+    routed = SizeRoutedForest(FlatForest.from_sklearn(forest), lambda: forest, max_flat_rows=100)
+    X, _ = next(iter_training_chunks(300, 300, seed=15))
+
+    assert np.array_equal(routed.predict(X[:100]), forest.predict(X[:100]))
+    assert routed._forest is None
+
+    assert routed.backend(100) is routed.flat and routed.backend(101) is routed.forest
+    assert np.array_equal(routed.predict_proba(X[:100]), forest.predict_proba(X[:100]))
+    assert np.array_equal(routed.predict(X), forest.predict(X))
+    assert routed.classes_.tolist() == [-2, -1, 0, 1, 2]
@@ -0,0 +1,100 @@
+import threading
+
+import real_api_backend
+from hot_poller import HotSetPoller, RateBudget
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_poller(clock, calls, **kwargs):
+    def analyze_many(symbols):
+        calls.append(list(symbols))
+        return [{'symbol': s, 'price': clock.now} for s in symbols]
+
+    # Cycles are driven by hand
+    return HotSetPoller(analyze_many, background=False, clock=clock, **kwargs)
+
+def test_hot_symbols_are_bulk_refreshed_and_served_with_staleness():
+    clock = FakeClock()
+    calls = []
+    poller = make_poller(clock, calls, seed_symbols=['AAPL', 'BTC'],
+                         provider_of=lambda s: 'binance' if s == 'BTC' else 'local',
+                         max_age=10, stale_ttl=60)
+
+    assert poller.get('TSLA') is None  # a miss joins the hot set
+    assert poller.refresh() == 3
+    assert sorted(calls) == [['AAPL', 'TSLA'], ['BTC']]
+
+    clock.now = 5.0
+    hit = poller.get('TSLA')
+    assert hit['price'] == 0.0 and hit['data_age_seconds'] == 5.0 and hit['stale'] is False
+    clock.now = 30.0
+    assert poller.get('TSLA')['stale'] is True
+    clock.now = 61.0
+    assert poller.get('TSLA', lambda s: {'symbol': s, 'price': -1.0})['price'] == -1.0
+    assert poller.stats()['hits'] == 1 and poller.stats()['stale_hits'] == 1
+
+def test_provider_budget_skips_cycles_and_recent_symbols_expire():
+    clock = FakeClock()
+    calls = []
+    poller = make_poller(clock, calls, provider_of=lambda s: 'binance',
+                         budgets={'binance': RateBudget(6, burst=1, clock=clock)}, recent_ttl=100)
+    poller.get('BTC')
+
+    assert poller.refresh() == 1
+    assert poller.refresh() == 0  # bucket empty until 10s of refill
+    clock.now = 10.0
+    assert poller.refresh() == 1
+    assert poller.stats()['budget_skips'] == 1
+
+    clock.now = 200.0
+    assert poller.hot_symbols() == []
+    assert poller.stats()['hot'] == 0
+
+def test_analyze_route_serves_precomputed_result(monkeypatch):
+    calls = []
+    poller = make_poller(FakeClock(), calls, seed_symbols=['AAPL'])
+    monkeypatch.setattr(real_api_backend, 'hot_poller', poller)
+    poller.refresh()
+
+    response = real_api_backend.app.test_client().get('/api/analyze/aapl')
+    assert response.status_code == 200
+    assert response.json['price'] == 0.0 and response.json['stale'] is False
+    assert calls == [['AAPL']]
+
+def test_disabled_poller_computes_every_lookup_inline(monkeypatch):
+    monkeypatch.setenv('HOT_POLLER', 'off')
+    clock = FakeClock()
+    calls = []
+    poller = make_poller(clock, calls)
+    compute = lambda s: {'symbol': s, 'price': clock.now}
+
+    assert poller.get('AAPL', compute)['price'] == 0.0
+    clock.now = 5.0
+    assert poller.get('AAPL', compute)['price'] == 5.0
+    assert poller.stats()['misses'] == 2 and poller.stats()['hot'] == 0
+    assert poller._thread is None
+
+def test_concurrent_lookups_and_refreshes_keep_every_symbol():
+    calls = []
+    poller = make_poller(FakeClock(), calls)
+    symbols = [f'S{i}' for i in range(200)]
+
+    def lookups(offset):
+        for symbol in symbols[offset::4]:
+            poller.get(symbol, lambda s: {'symbol': s})
+
+    threads = [threading.Thread(target=lookups, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        poller.refresh()
+    for t in threads:
+        t.join()
+
+    assert sorted(poller.hot_symbols()) == sorted(symbols)
+    assert poller.stats()['misses'] + poller.stats()['hits'] == 200
@@ -0,0 +1,86 @@
+import numpy as np
+
+from bar_store import BarStore
+from indicator_state import IndicatorBook, IndicatorState
+from indicators import WARMUP_BARS, compute_features, synthetic_history
+
+def test_incremental_matches_full_recompute():
+    close, volume = synthetic_history(3, 2500, seed=7)
+    full = compute_features(close, volume)
+
+    for i in range(3):
+        state = IndicatorState()
+        for t in range(close.shape[1]):
+            state.update(close[i, t], volume[i, t])
+            if t < WARMUP_BARS - 1:
+                assert state.features() is None
+            else:
+                np.testing.assert_allclose(state.features(), full[i, t], rtol=1e-7, atol=1e-9)
+
+def test_tick_revision_matches_recompute_of_revised_bar():
+    close, volume = synthetic_history(1, 200, seed=3)
+    close, volume = close[0], volume[0]
+    state = IndicatorState()
+    for c, v in zip(close, volume):
+        state.update(c, v)
+
+    for revised in (close[-1] * 1.03, close[-1] * 0.97):
+        state.update_tick(revised, volume[-1] * 2)
+        expected = compute_features(np.append(close[:-1], revised), np.append(volume[:-1], volume[-1] * 2))
+        np.testing.assert_allclose(state.features(), expected[-1], rtol=1e-7, atol=1e-9)
+
+def test_book_opens_one_bar_per_period():
+    book = IndicatorBook(bar_seconds=60)
+    close, volume = synthetic_history(1, 60)
+    book.warm('BTC', close[0], volume[0])
+
+    book.on_tick('BTC', 101.0, timestamp=6000)
+    book.on_tick('BTC', 102.0, timestamp=6030)
+    bars = book.state('BTC').bars
+    book.on_tick('BTC', 103.0, timestamp=6060)
+
+    assert bars == 61
+    assert book.state('BTC').bars == 62
+    assert book.features('BTC') is not None
+    assert book.features('NEW') is None
+
+def write_bars(root, close, volume, day=86400):
+    with BarStore(str(root), writable=True) as store:
+        for i in range(len(close)):
+            n = close.shape[1] - 20 * i
+            store.append(f'S{i}', {'ts': np.arange(n) * day, 'open': close[i, -n:], 'high': close[i, -n:],
+                                   'low': close[i, -n:], 'close': close[i, -n:], 'volume': volume[i, -n:]})
+
+def test_book_warms_from_bar_store(tmp_path):
+    close, volume = synthetic_history(3, 300, seed=5)
+    write_bars(tmp_path, close, volume)
+    book = IndicatorBook()
+    with BarStore(str(tmp_path)) as store:
+        assert book.warm_from_store(store, bars=300) == 3
+
+    for i in range(3):
+        n = 300 - 20 * i
+        expected = compute_features(close[i, -n:], volume[i, -n:])[-1]
+        np.testing.assert_allclose(book.features(f'S{i}'), expected, rtol=1e-7, atol=1e-9)
+
+    # A tick on the newest stored day revises that bar; the next day opens a new one
+    last_day = (300 - 1) * 86400
+    book.on_tick('S0', close[0, -1] * 1.01, timestamp=last_day + 3600)
+    assert book.state('S0').bars == 300
+    book.on_tick('S0', close[0, -1], timestamp=last_day + 86400)
+    assert book.state('S0').bars == 301
+
+def test_volume_less_ticks_do_not_record_empty_bars():
+    book = IndicatorBook(bar_seconds=60)
+    close, volume = synthetic_history(1, 60, seed=9)
+    book.warm('BTC', close[0], volume[0], last_ts=5940)
+    warm_change = book.features('BTC')[1]
+
+    for day, price in enumerate(close[0, -3:] * 1.01):
+        book.on_tick('BTC', price, timestamp=6000 + 60 * day)
+        book.on_tick('BTC', price * 1.001, timestamp=6030 + 60 * day)
+        volume_change = book.features('BTC')[1]
+        assert np.isfinite(volume_change) and volume_change > -50
+    assert book.state('BTC').bars == 63
+    assert book.state('BTC').volumes.ago(0) == volume[0, -1]
+    assert abs(volume_change - warm_change) < 50
@@ -0,0 +1,28 @@
+import numpy as np
+
+from bench_indicators import pandas_features
+from indicators import FEATURE_NAMES, WARMUP_BARS, compute_features, latest_features, synthetic_history
+
+def test_matches_pandas_baseline():
+    close, volume = synthetic_history(5, 300)
+    features = compute_features(close, volume)
+
+    assert features.shape == (5, 300, len(FEATURE_NAMES))
+    for i in range(5):
+        np.testing.assert_allclose(features[i], pandas_features(close[i], volume[i]),
+                                   rtol=1e-8, atol=1e-9, equal_nan=True)
+
+def test_warmup_rows_are_nan():
+    close, volume = synthetic_history(1, 120)
+    features = compute_features(close[0], volume[0])
+
+    assert np.isnan(features[:WARMUP_BARS - 1]).all()
+    assert np.isfinite(features[WARMUP_BARS - 1:]).all()
+
+def test_latest_features_are_in_training_ranges():
+    close, volume = synthetic_history(50, 400)
+    rsi, _, _, _, volatility, _, _, _, bb = latest_features(close, volume).T
+
+    assert ((rsi >= 0) & (rsi <= 100)).all()
+    assert (volatility > 0).all()
+    assert ((bb >= 0) & (bb <= 1)).all()
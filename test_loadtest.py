@@ -0,0 +1,37 @@
+import asyncio
+
+from loadtest import arrival_times, compare, drive, scenario_requests, summarize
+from mock_upstream import FakeMarketServer
+
+def test_open_loop_schedule_matches_rate():
+    uniform = arrival_times(100, 2, poisson=False)
+    assert len(uniform) == 199 and abs(uniform[1] - uniform[0] - 0.01) < 1e-9
+    poisson = arrival_times(1000, 5, seed=1)
+    assert abs(len(poisson) - 5000) < 300
+    assert poisson == sorted(poisson) and poisson[-1] < 5
+    assert arrival_times(1000, 5, seed=1) == poisson
+
+def test_summary_percentiles():
+    stats = summarize([i / 1000 for i in range(1, 1001)], errors=10, elapsed=2.0)
+    assert stats['requests'] == 1000 and stats['throughput_rps'] == 495.0
+    assert (stats['p50_ms'], stats['p95_ms'], stats['p99_ms'], stats['p999_ms']) == (501.0, 951.0, 991.0, 1000.0)
+    assert summarize([], 0, 1.0)['p99_ms'] is None
+
+def test_latency_includes_time_queued_behind_a_slow_server():
+    with FakeMarketServer(latency=0.05) as upstream:
+        request_for = lambda i: ('GET', '/api/v3/ticker/24hr?symbol=BTCUSDT', None)
+        # 19 arrivals in 0.2 s but one request in flight at a time: the last waits for ~18 others
+        stats = asyncio.run(drive(upstream.url, request_for, arrival_times(100, 0.2, poisson=False), 1))
+    assert stats['requests'] == 19 and stats['errors'] == 0
+    # A closed-loop client would report ~50 ms for every request
+    assert stats['max_ms'] > 700 and stats['p50_ms'] > 200
+
+def test_batch_requests_and_regression_report():
+    method, path, body = scenario_requests('batch', ['A', 'B', 'C'], 2)(2)
+    assert (method, path, body) == ('POST', '/api/analyze/batch', {'symbols': ['C', 'A']})
+
+    stats = {'errors': 0, 'throughput_rps': 100.0, 'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 30.0, 'p999_ms': 40.0}
+    baseline = {'results': {'app': {'single': stats, 'batch': {'skipped': 'no route'}}}}
+    slower = dict(stats, p99_ms=45.0, throughput_rps=95.0)
+    current = {'results': {'app': {'single': slower, 'batch': stats}}}
+    assert compare(baseline, current) == [('app', 'single', 'p99_ms', 30.0, 45.0)]
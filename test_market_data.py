@@ -0,0 +1,45 @@
+import real_api_backend
+from market_data import MarketDataClient
+from mock_upstream import FakeMarketServer
+from quote_cache import QuoteCache
+
+def test_coingecko_bulk_is_one_request():
+    with FakeMarketServer() as upstream:
+        client = MarketDataClient(coingecko_url=upstream.coingecko_url)
+        quotes = client.coingecko_prices(['bitcoin', 'ethereum', 'dogecoin'])
+
+        assert quotes == {'bitcoin': (65200.0, 1.25), 'ethereum': (3500.0, -0.8)}
+        assert upstream.request_count == 1
+
+def test_binance_bulk_is_one_request():
+    with FakeMarketServer() as upstream:
+        client = MarketDataClient(binance_url=upstream.binance_url)
+        quotes = client.binance_tickers(['BTCUSDT', 'ETHUSDT', 'SOLUSDT'])
+
+        assert quotes['SOLUSDT'] == (140.1, -3.4)
+        assert len(quotes) == 3
+        assert upstream.request_count == 1
+
+def test_binance_bulk_with_unknown_pair_falls_back_per_symbol():
+    with FakeMarketServer() as upstream:
+        client = MarketDataClient(binance_url=upstream.binance_url)
+        quotes = client.binance_tickers(['BTCUSDT', 'NOPEUSDT'])
+
+        assert list(quotes) == ['BTCUSDT']
+
+def test_retries_then_gives_up_on_5xx():
+    with FakeMarketServer(fail=True) as upstream:
+        client = MarketDataClient(binance_url=upstream.binance_url, retries=2, backoff=0)
+
+        assert client.binance_tickers(['BTCUSDT']) == {}
+        assert upstream.request_count == 3
+
+def test_backend_bulk_lookup_uses_cache(monkeypatch):
+    with FakeMarketServer() as upstream:
+        monkeypatch.setattr(real_api_backend, 'quote_cache', QuoteCache())
+        monkeypatch.setattr(real_api_backend, 'market_data', MarketDataClient(binance_url=upstream.binance_url))
+
+        quotes = real_api_backend.get_real_binance_prices(['BTC', 'ETH', 'AAPL'])
+        assert set(quotes) == {'BTC', 'ETH'}
+        assert real_api_backend.get_real_binance_price('ETH')[2] == 'Binance Live Data'
+        assert upstream.request_count == 1
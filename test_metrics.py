@@ -0,0 +1,76 @@
+import logging
+import queue
+
+import pytest
+
+import real_api_backend
+from logs import DroppingQueueHandler
+from market_data import MarketDataClient
+from metrics import Registry
+
+def test_histogram_buckets_are_cumulative_and_rendered():
+    registry = Registry()
+    latency = registry.histogram('stage_seconds', 'Stage latency', ('stage',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value, 'quote')
+    errors = registry.counter('errors_total', 'Errors', ('provider',))
+    errors.inc('binance')
+    errors.inc('binance', amount=2)
+
+    text = registry.render()
+    assert '# TYPE stage_seconds histogram' in text
+    assert 'stage_seconds_bucket{stage="quote",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="quote",le="1.0"} 3' in text
+    assert 'stage_seconds_bucket{stage="quote",le="+Inf"} 4' in text
+    assert 'stage_seconds_count{stage="quote"} 4' in text
+    assert 'stage_seconds_sum{stage="quote"} 4.05' in text
+    assert 'errors_total{provider="binance"} 3' in text
+    with pytest.raises(ValueError):
+        latency.observe(1.0)
+
+def test_metrics_route_reports_stages_by_source(monkeypatch):
+    monkeypatch.setattr(real_api_backend, 'get_real_binance_prices', lambda symbols: {})
+    monkeypatch.setattr(real_api_backend.hot_poller, 'get', lambda symbol, fallback: fallback(symbol))
+    client = real_api_backend.app.test_client()
+    assert client.get('/api/analyze/AAPL').status_code == 200
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.get_data(as_text=True)
+    for stage in ('quote', 'features', 'inference', 'serialize'):
+        assert f'analyze_stage_seconds_count{{stage="{stage}",source="market_data"}}' in text
+    assert 'http_request_seconds_count{route="/api/analyze/<symbol>",status="200"}' in text
+    assert 'quote_cache_events_total{event=' in text
+
+def test_upstream_errors_are_counted_by_provider_and_reason(monkeypatch):
+    client = MarketDataClient()
+    responses = iter([(503, None), ConnectionError('reset')])
+
+    def get_json(url, params=None):
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(client, 'get_json', get_json)
+    assert client.coingecko_prices(['bitcoin']) == {}
+    with pytest.raises(ConnectionError):
+        client.binance_tickers(['BTCUSDT'])
+
+    text = real_api_backend.registry.render()
+    assert 'upstream_errors_total{provider="coingecko",reason="http_503"}' in text
+    assert 'upstream_errors_total{provider="binance",reason="ConnectionError"}' in text
+
+def test_full_log_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(2))
+    logger = logging.getLogger('test_metrics.dropping')
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning('record %d', i)
+    finally:
+        logger.removeHandler(handler)
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
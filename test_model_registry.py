@@ -0,0 +1,92 @@
+import json
+import os
+import time
+
+import joblib
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from model_registry import ModelRegistry
+from train_model import iter_training_chunks
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def write_model(tmp_path, n_estimators, n_features=9, accuracy=0.8):
+    X, y = next(iter_training_chunks(400, 400, seed=n_estimators))
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=4, random_state=0)
+    model.fit(X[:, :n_features], y)
+    joblib.dump(model, tmp_path / 'model.pkl')
+    with open(tmp_path / 'report.json', 'w') as f:
+        json.dump({'overall_accuracy': accuracy}, f)
+    # Distinct mtimes even on coarse-grained filesystems
+    bump = time.time() + n_estimators
+    for name in ('model.pkl', 'report.json'):
+        os.utime(tmp_path / name, (bump, bump))
+
+def make_registry(tmp_path, clock):
+    return ModelRegistry(lambda: joblib.load(tmp_path / 'model.pkl'),
+                         watch_paths=[tmp_path / 'model.pkl', tmp_path / 'report.json'],
+                         report_path=tmp_path / 'report.json',
+                         default_report={'overall_accuracy': 0.5},
+                         classes=[-2, -1, 0, 1, 2], poll_interval=1.0, clock=clock)
+
+def poll(registry, clock, times=3):
+    for _ in range(times):
+        clock.now += 1.0
+        registry.active()
+
+def poll_until_swapped(registry, clock, old_version):
+    poll(registry, clock)
+    deadline = time.time() + 10
+    while registry.current.version == old_version and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_hot_reload_swaps_after_settling_and_rolls_back(tmp_path):
+    clock = FakeClock()
+    write_model(tmp_path, 5, accuracy=0.8)
+    registry = make_registry(tmp_path, clock)
+    first = registry.active()
+    assert first.loaded and first.report['overall_accuracy'] == 0.8
+
+    write_model(tmp_path, 7, accuracy=0.9)
+    clock.now += 1.0
+    assert registry.active() is first  # changed files must be seen twice before loading
+
+    poll_until_swapped(registry, clock, first.version)
+    second = registry.current
+    assert second.version != first.version
+    assert len(second.model.estimators_) == 7 and second.report['overall_accuracy'] == 0.9
+    assert registry.previous is first
+
+    assert registry.rollback() is first
+    poll(registry, clock)
+    assert registry.current is first  # rolled-back files are not reloaded until they change
+    assert registry.status()['previous_model_version'] == second.version
+
+def test_invalid_model_is_rejected_and_current_kept(tmp_path):
+    clock = FakeClock()
+    write_model(tmp_path, 5)
+    registry = make_registry(tmp_path, clock)
+    first = registry.current
+
+    write_model(tmp_path, 6, n_features=4)
+    with pytest.raises(ValueError):
+        registry.reload()
+    assert registry.current is first
+    assert 'features' in registry.status()['last_reload_error']
+
+def test_missing_model_serves_rule_based_until_one_appears(tmp_path):
+    clock = FakeClock()
+    registry = make_registry(tmp_path, clock)
+    assert not registry.current.loaded
+    assert registry.current.report == {'overall_accuracy': 0.5}
+
+    write_model(tmp_path, 5)
+    poll_until_swapped(registry, clock, 'rule-based')
+    assert registry.current.loaded
+    assert registry.previous.version == 'rule-based'
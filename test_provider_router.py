@@ -0,0 +1,120 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import real_api_backend
+from market_data import MarketDataClient
+from mock_upstream import FakeMarketServer
+from provider_router import Provider, ProviderRouter
+from quote_board import QuoteBoard
+from quote_cache import QuoteCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+IDS = {'BTC': 'BTCUSDT', 'ETH': 'ETHUSDT'}
+COINS = {'BTC': 'bitcoin', 'ETH': 'ethereum'}
+
+def make_router(binance, coingecko, clock=None, **kwargs):
+    """Binance and CoinGecko providers against two fake upstreams, without client retries"""
+    binance_client = MarketDataClient(binance_url=binance.binance_url, retries=0)
+    coingecko_client = MarketDataClient(coingecko_url=coingecko.coingecko_url, retries=0)
+    options = {'clock': clock} if clock else {}
+    return ProviderRouter([
+        Provider('binance', IDS, binance_client.binance_tickers, failure_threshold=3, cooldown=30, **options),
+        Provider('coingecko', COINS, coingecko_client.coingecko_prices, **options)
+    ], **kwargs)
+
+def test_failing_provider_opens_its_circuit_and_recovers():
+    clock = FakeClock()
+    with FakeMarketServer(fail=True) as binance, FakeMarketServer() as coingecko:
+        router = make_router(binance, coingecko, clock)
+        assert router.quotes(['BTC']) == {'BTC': (65200.0, 1.25, 'coingecko')}
+        binance_provider = router.providers[0]
+        for _ in range(2):
+            assert binance_provider.call(['BTC']) == {}
+        assert binance_provider.state == 'open'
+        calls = binance.request_count
+
+        # While open, Binance is not even tried
+        assert router.quotes(['BTC', 'ETH'])['ETH'][2] == 'coingecko'
+        assert binance.request_count == calls
+
+        binance.fail = False
+        clock.now = 31.0
+        assert binance_provider.state == 'half_open'
+        router.providers[1].record(1.0, False)  # make CoinGecko look worse than Binance
+        assert router.quotes(['BTC'])['BTC'][2] == 'binance'
+        assert binance_provider.state == 'closed'
+        assert router.stats()['binance']['circuit_opens'] == 1
+
+def test_slow_primary_is_hedged_to_the_other_provider():
+    with FakeMarketServer(latency=1.0) as binance, FakeMarketServer() as coingecko:
+        router = make_router(binance, coingecko, deadline=5.0)
+        start = time.perf_counter()
+        quotes = router.quotes(['BTC'])
+        elapsed = time.perf_counter() - start
+
+    assert quotes == {'BTC': (65200.0, 1.25, 'coingecko')}
+    # Default hedge delay (0.3 s) plus the fast answer, far below the slow provider's 1 s
+    assert elapsed < 0.8
+    stats = router.stats()
+    assert stats['coingecko']['hedges'] == 1 and stats['coingecko']['wins'] == 1
+
+def test_hedge_delay_follows_the_providers_p95():
+    provider = Provider('binance', IDS, lambda ids: {})
+    for latency in [0.01] * 95 + [0.5] * 5:
+        provider.record(latency, True)
+    assert 0.01 <= provider.hedge_delay() < 0.5
+    assert provider.ewma_latency > 0.3  # the most recent samples dominate the EWMA
+
+def test_deadline_caps_the_wait_when_every_provider_is_slow():
+    with FakeMarketServer(latency=1.5) as binance, FakeMarketServer(latency=1.5) as coingecko:
+        router = make_router(binance, coingecko, deadline=0.4)
+        start = time.perf_counter()
+        assert router.quotes(['BTC', 'ETH']) == {}
+        assert time.perf_counter() - start < 0.7
+
+def test_faster_provider_is_ranked_first():
+    with FakeMarketServer(latency=0.2) as binance, FakeMarketServer() as coingecko:
+        router = make_router(binance, coingecko)
+        for _ in range(3):
+            router.quotes(['ETH'])
+        assert [provider.name for provider in router.ranked(['ETH'])] == ['coingecko', 'binance']
+        assert router.quotes(['ETH'])['ETH'][2] == 'coingecko'
+
+def test_backend_labels_the_provider_that_answered(monkeypatch):
+    with FakeMarketServer(fail=True) as binance, FakeMarketServer() as coingecko:
+        monkeypatch.setattr(real_api_backend, 'quote_router', make_router(binance, coingecko))
+        monkeypatch.setattr(real_api_backend, 'quote_cache', QuoteCache())
+        monkeypatch.setattr(real_api_backend, 'quote_board', QuoteBoard(real_api_backend.BINANCE_PAIRS.values()))
+
+        assert real_api_backend.get_real_binance_price('ETH') == (3500.0, -0.8, 'CoinGecko Live')
+        result = real_api_backend.analyze_symbols(['BTC', 'AAPL'])
+        assert [r['data_source'] for r in result] == ['CoinGecko Live', 'Market Data']
+
+def test_stalled_provider_does_not_starve_hedges_under_concurrency():
+    with FakeMarketServer(latency=3.0) as binance, FakeMarketServer() as coingecko:
+        binance_client = MarketDataClient(binance_url=binance.binance_url, retries=0)
+        coingecko_client = MarketDataClient(coingecko_url=coingecko.coingecko_url, retries=0)
+        router = ProviderRouter([
+            Provider('binance', IDS, binance_client.binance_tickers, max_threads=4),
+            Provider('coingecko', COINS, coingecko_client.coingecko_prices, max_threads=4)
+        ], deadline=2.0)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: router.quotes(['BTC']), range(8)))
+        elapsed = time.perf_counter() - start
+
+        assert results == [{'BTC': (65200.0, 1.25, 'coingecko')}] * 8
+        assert elapsed < 1.5
+        stats = router.stats()
+        assert stats['coingecko']['failures'] == 0
+        assert stats['coingecko']['wins'] == 8
+        # The hanging calls are in flight, so Binance is no longer ranked first
+        assert stats['binance']['in_flight'] > 0
+        assert [provider.name for provider in router.ranked(['BTC'])][0] == 'coingecko'
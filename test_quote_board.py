@@ -0,0 +1,98 @@
+import multiprocessing
+import os
+
+import real_api_backend
+from quote_board import BoardPublisher, QuoteBoard
+
+fork = multiprocessing.get_context('fork')
+
+def test_concurrent_readers_never_see_a_torn_quote():
+    board = QuoteBoard(['BTCUSDT', 'ETHUSDT'])
+    writes = 20_000
+    results = fork.Queue()
+
+    def writer():
+        for k in range(1, writes + 1):
+            board.publish({'BTCUSDT': (float(k), -float(k)), 'ETHUSDT': (float(k), -float(k))}, 'binance', now=k)
+
+    def reader():
+        torn, seen, last, backwards = 0, set(), 0.0, 0
+        while last < writes:
+            quote = board.read('BTCUSDT')
+            if quote is None:
+                continue
+            price, change, updated, source = quote
+            if price != -change or price != updated or source != 'binance':
+                torn += 1
+            if price < last:
+                backwards += 1
+            last = price
+            seen.add(price)
+        results.put((torn, backwards, len(seen)))
+
+    readers = [fork.Process(target=reader) for _ in range(3)]
+    for process in readers:
+        process.start()
+    writer_process = fork.Process(target=writer)
+    writer_process.start()
+    writer_process.join(60)
+    for process in readers:
+        process.join(60)
+
+    outcomes = [results.get(timeout=5) for _ in readers]
+    assert all(torn == 0 and backwards == 0 for torn, backwards, _ in outcomes)
+    assert all(distinct > 1 for _, _, distinct in outcomes)
+    assert board.read('ETHUSDT')[:3] == (float(writes), -float(writes), float(writes))
+
+def test_one_process_fetches_for_all_workers():
+    board = QuoteBoard(['BTCUSDT'])
+    fetches = fork.Value('i', 0)
+
+    def fetch_many(keys):
+        with fetches.get_lock():
+            fetches.value += 1
+        return {'BTCUSDT': (65000.0, 1.5)}
+
+    publisher = BoardPublisher(board, fetch_many, 'binance')
+    started = fork.Barrier(4)
+
+    def worker():
+        started.wait()
+        for _ in range(5):
+            publisher.publish_once()
+        started.wait()
+        os._exit(0)
+
+    workers = [fork.Process(target=worker) for _ in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(30)
+
+    # Every cycle of every worker was served by the single lock holder
+    assert fetches.value == 5
+    assert board.get_many(['BTCUSDT'], max_age=60) == {'BTCUSDT': (65000.0, 1.5)}
+    # The writer exited, so its lock is free for another process
+    assert board.try_become_writer()
+
+def test_file_backed_board_is_shared_and_resets_on_a_new_layout(tmp_path):
+    path = str(tmp_path / 'board.bin')
+    writer = QuoteBoard(['ETHUSDT', 'BTCUSDT'], path=path)
+    reader = QuoteBoard(['BTCUSDT', 'ETHUSDT'], path=path)
+    writer.publish({'ETHUSDT': (3500.0, -0.5)}, 'binance', now=100.0)
+    assert reader.read('ETHUSDT') == (3500.0, -0.5, 100.0, 'binance')
+    assert reader.get_many(['ETHUSDT', 'BTCUSDT'], max_age=10, now=105.0) == {'ETHUSDT': (3500.0, -0.5)}
+    assert reader.get_many(['ETHUSDT'], max_age=10, now=200.0) == {}
+
+    assert QuoteBoard(['SOLUSDT'], path=path).stats()['written'] == 0
+
+def test_backend_reads_binance_quotes_from_the_board(monkeypatch):
+    calls = []
+    monkeypatch.setattr(real_api_backend.board_publisher, 'enabled', False)
+    monkeypatch.setattr(real_api_backend, 'fetch_binance_tickers', lambda pairs: calls.append(pairs) or {})
+    board = QuoteBoard(real_api_backend.BINANCE_PAIRS.values())
+    monkeypatch.setattr(real_api_backend, 'quote_board', board)
+    board.publish({'BTCUSDT': (12345.0, 2.5)}, 'binance')
+
+    assert real_api_backend.get_real_binance_prices(['BTC']) == {'BTC': (12345.0, 2.5)}
+    assert calls == []
@@ -0,0 +1,113 @@
+import threading
+import time
+
+import real_api_backend
+from hot_poller import HotSetPoller
+from market_data import MarketDataClient
+from mock_upstream import FakeMarketServer
+from quote_cache import QuoteCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_fresh_hit_after_miss():
+    cache = QuoteCache(ttls={'crypto': 10, 'default': 30}, clock=FakeClock())
+    calls = []
+    fetch = lambda: calls.append(1) or (100.0, 1.5)
+
+    assert cache.get('BTC', 'binance', fetch, 'crypto') == (100.0, 1.5)
+    assert cache.get('BTC', 'binance', fetch, 'crypto') == (100.0, 1.5)
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats['misses'] == 1 and stats['hits'] == 1
+
+def test_keys_are_per_source():
+    cache = QuoteCache(clock=FakeClock())
+    cache.get('BTC', 'binance', lambda: (1.0, 0.0))
+    assert cache.get('BTC', 'coingecko', lambda: (2.0, 0.0)) == (2.0, 0.0)
+
+def test_per_asset_class_ttl():
+    clock = FakeClock()
+    cache = QuoteCache(ttls={'crypto': 5, 'stock': 60, 'default': 30}, stale_ttl=0, clock=clock)
+    cache.get('BTC', 'binance', lambda: (1.0, 0.0), 'crypto')
+    cache.get('AAPL', 'market', lambda: (2.0, 0.0), 'stock')
+    clock.now += 10
+
+    assert cache.get('BTC', 'binance', lambda: (1.5, 0.0), 'crypto') == (1.5, 0.0)
+    assert cache.get('AAPL', 'market', lambda: (9.9, 0.0), 'stock') == (2.0, 0.0)
+
+def test_stale_while_revalidate():
+    clock = FakeClock()
+    cache = QuoteCache(ttls={'default': 10}, stale_ttl=60, clock=clock)
+    cache.get('ETH', 'binance', lambda: (1.0, 0.0))
+    clock.now += 20
+    refreshed = threading.Event()
+
+    def slow_fetch():
+        time.sleep(0.05)
+        refreshed.set()
+        return (2.0, 0.0)
+
+    # The stale value comes back immediately while the refresh runs in the background
+    assert cache.get('ETH', 'binance', slow_fetch) == (1.0, 0.0)
+    assert refreshed.wait(2)
+    time.sleep(0.05)
+    assert cache.get('ETH', 'binance', slow_fetch) == (2.0, 0.0)
+    assert cache.stats()['stale'] == 1
+
+def test_failed_refresh_keeps_old_quote():
+    clock = FakeClock()
+    cache = QuoteCache(ttls={'default': 10}, stale_ttl=0, clock=clock)
+    cache.get('ETH', 'binance', lambda: (1.0, 0.0))
+    clock.now += 20
+
+    assert cache.get('ETH', 'binance', lambda: None) == (1.0, 0.0)
+    assert cache.stats()['errors'] == 1
+
+def test_lru_eviction():
+    cache = QuoteCache(max_entries=2, clock=FakeClock())
+    cache.get('A', 'x', lambda: (1.0, 0.0))
+    cache.get('B', 'x', lambda: (2.0, 0.0))
+    cache.get('A', 'x', lambda: (1.0, 0.0))
+    cache.get('C', 'x', lambda: (3.0, 0.0))
+
+    assert cache.get('A', 'x', lambda: (10.0, 0.0)) == (1.0, 0.0)
+    assert cache.get('B', 'x', lambda: (20.0, 0.0)) == (20.0, 0.0)
+    assert cache.stats()['evictions'] == 2
+
+def test_concurrent_misses_share_one_upstream_call(monkeypatch):
+    with FakeMarketServer(latency=0.2) as upstream:
+        cache = QuoteCache()
+        monkeypatch.setattr(real_api_backend, 'quote_cache', cache)
+        monkeypatch.setattr(real_api_backend, 'market_data', MarketDataClient(binance_url=upstream.binance_url))
+        results = []
+
+        def worker():
+            results.append(real_api_backend.get_real_binance_price('BTC'))
+
+        threads = [threading.Thread(target=worker) for _ in range(50)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert upstream.request_count == 1
+        assert results == [(65210.5, 1.3, 'Binance Live Data')] * 50
+        assert cache.stats()['coalesced'] == 49
+
+def test_upstream_failure_falls_through(monkeypatch):
+    with FakeMarketServer(fail=True) as upstream:
+        monkeypatch.setattr(real_api_backend, 'quote_cache', QuoteCache())
+        monkeypatch.setattr(real_api_backend, 'market_data', MarketDataClient(binance_url=upstream.binance_url))
+
+        assert real_api_backend.get_real_binance_price('ETH') == (None, None, None)
+        poller = HotSetPoller(real_api_backend.analyze_symbols, background=False)
+        monkeypatch.setattr(real_api_backend, 'hot_poller', poller)
+        client = real_api_backend.app.test_client()
+        response = client.get('/api/analyze/ETH')
+        assert response.status_code == 200
+        assert response.json['data_source'] == 'Market Data'
@@ -0,0 +1,128 @@
+import json
+import threading
+
+import app
+import real_api_backend
+import server
+import simple_app
+from quote_cache import QuoteCache
+from response_cache import ResponseCache, dumps
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_static_symbol_is_serialized_once_and_revalidated():
+    client = server.app.test_client()
+    first = client.get('/api/analyze/aapl')
+    assert first.status_code == 200
+    assert first.get_json()['symbol'] == 'AAPL'
+    assert first.headers['Cache-Control'].startswith('public, max-age=')
+    assert 'stale-while-revalidate=' in first.headers['Cache-Control']
+    etag = first.headers['ETag']
+
+    second = client.get('/api/analyze/AAPL')
+    assert second.data == first.data and second.headers['ETag'] == etag
+    assert second.headers['Last-Modified'] == first.headers['Last-Modified']
+    # A cached body states when it was built, not a request time it would freeze
+    assert 'timestamp' not in first.get_json() and first.get_json()['generated_at']
+
+    not_modified = client.get('/api/analyze/AAPL', headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304 and not_modified.data == b''
+    assert not_modified.headers['ETag'] == etag
+    assert client.get('/api/analyze/AAPL', headers={'If-None-Match': '"other"'}).status_code == 200
+
+def test_random_symbols_are_not_cached():
+    client = server.app.test_client()
+    response = client.get('/api/analyze/NOTSEEDED')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-store' and 'ETag' not in response.headers
+
+def test_new_version_rebuilds_the_body(monkeypatch):
+    cache = ResponseCache(max_entries=8)
+    builds = []
+
+    def build(price):
+        builds.append(price)
+        return {'symbol': 'BTC', 'price': price}
+
+    with simple_app.app.test_request_context('/'):
+        assert cache.get('BTC', 1, lambda: build(1.0)).body == b'{"price":1.0,"symbol":"BTC"}'
+        cache.get('BTC', 1, lambda: build(1.0))
+        changed = cache.get('BTC', 2, lambda: build(2.0))
+    assert json.loads(changed.body)['price'] == 2.0
+    assert builds == [1.0, 2.0]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_counts_are_not_lost_across_threads():
+    cache = ResponseCache(max_entries=8)
+    build = lambda: {'symbol': 'BTC', 'price': 1.0}
+
+    def serve():
+        for _ in range(500):
+            cache.get('BTC', 1, build)
+
+    threads = [threading.Thread(target=serve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 4000
+
+def test_simulated_symbol_keeps_its_etag_until_its_data_changes(monkeypatch):
+    monkeypatch.setattr(simple_app, 'symbol_state', simple_app.SymbolStateStore(pinned=simple_app.STOCK_DATA))
+    client = simple_app.app.test_client()
+    etag = client.get('/api/analyze/NEWCO').headers['ETag']
+    assert client.get('/api/analyze/NEWCO', headers={'If-None-Match': etag}).status_code == 304
+
+    simple_app.symbol_state.put('NEWCO', {'price': 1.0, 'change': 0.0, 'rsi': 50.0})
+    response = client.get('/api/analyze/NEWCO', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.get_json()['price'] == 1.0
+
+def test_hot_result_freshness_drives_cache_control(monkeypatch):
+    monkeypatch.setattr(real_api_backend, 'get_real_binance_prices', lambda symbols: {})
+    clock = FakeClock()
+    poller = real_api_backend.HotSetPoller(real_api_backend.analyze_symbols, max_age=15, stale_ttl=120,
+                                           background=False, clock=clock)
+    monkeypatch.setattr(real_api_backend, 'hot_poller', poller)
+    client = real_api_backend.app.test_client()
+
+    first = client.get('/api/analyze/AAPL')
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'public, max-age=15, stale-while-revalidate=105'
+    clock.now = 5.0
+    cached = client.get('/api/analyze/AAPL', headers={'If-None-Match': first.headers['ETag']})
+    assert cached.status_code == 304
+    assert cached.headers['Cache-Control'] == 'public, max-age=10, stale-while-revalidate=105'
+    # The cached body carries no age that would freeze at its first build
+    again = client.get('/api/analyze/AAPL')
+    assert again.data == first.data and 'data_age_seconds' not in again.json
+
+    poller.refresh()
+    refreshed = client.get('/api/analyze/AAPL', headers={'If-None-Match': first.headers['ETag']})
+    assert refreshed.status_code == 200 and refreshed.headers['ETag'] != first.headers['ETag']
+
+class FakeRouter:
+    def quotes(self, symbols):
+        return {symbol: (65000.0, 1.0, 'binance') for symbol in symbols}
+
+def test_live_quote_max_age_is_what_is_left_of_its_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(app, 'quote_cache', QuoteCache(ttls={'crypto': 10, 'default': 30}, stale_ttl=60, clock=clock))
+    monkeypatch.setattr(app, 'quote_router', FakeRouter())
+    client = app.app.test_client()
+
+    assert client.get('/api/analyze/BTC').headers['Cache-Control'] == 'public, max-age=10, stale-while-revalidate=60'
+    clock.now = 7.0
+    assert client.get('/api/analyze/BTC').headers['Cache-Control'] == 'public, max-age=3, stale-while-revalidate=60'
+    # Static quotes are not cached upstream data, so they keep the full TTL
+    assert client.get('/api/analyze/AAPL').headers['Cache-Control'] == 'public, max-age=30, stale-while-revalidate=60'
+
+def test_fast_encoder_matches_the_stdlib_encoder():
+    result = {'symbol': 'AAPL', 'price': 178.25, 'rsi': 45.2, 'model_used': True, 'reasoning': 'RSI ≥ 70'}
+    assert json.loads(dumps(result)) == result
+    assert list(json.loads(dumps(result))) == sorted(result)
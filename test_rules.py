@@ -0,0 +1,56 @@
+import numpy as np
+
+import real_api_backend
+from legacy_rules import legacy_basic, legacy_momentum_rsi, legacy_points, random_inputs
+from rules import BASIC_RULES, MOMENTUM_RSI_RULES, RECOMMENDATION_FIELDS, SIGNALS, SIMPLE_RULES, score_features
+
+def threshold_grid():
+    # Every threshold exactly, plus points either side of it
+    rsi = np.unique(np.concatenate([np.arange(20, 85, 0.5), [29.999, 30.001, 74.999, 75.001]]))
+    change = np.unique(np.concatenate([np.arange(-12, 12, 0.25), [-8.001, -4.001, -0.001, 0.001, 4.001, 8.001]]))
+    rsi_grid, change_grid = np.meshgrid(rsi, change)
+    return rsi_grid.ravel(), change_grid.ravel()
+
+def check_table(table, legacy):
+    rsi, change = threshold_grid()
+    batch = table.evaluate(rsi=rsi, change=change)
+    for i, (r, c) in enumerate(zip(rsi.tolist(), change.tolist())):
+        expected = dict(zip(RECOMMENDATION_FIELDS, legacy(r, c)))
+        one = table.evaluate_one(rsi=r, change=c)
+        assert {field: one[field] for field in RECOMMENDATION_FIELDS} == expected
+        assert {field: batch[field][i].item() for field in RECOMMENDATION_FIELDS} == expected
+        assert one['signal'] == batch['signal'][i] == SIGNALS[expected['recommendation']]
+
+def test_momentum_rsi_table_matches_ladder():
+    check_table(MOMENTUM_RSI_RULES, legacy_momentum_rsi)
+
+def test_basic_and_simple_tables_match_ladders():
+    check_table(BASIC_RULES, legacy_basic)
+    check_table(SIMPLE_RULES, lambda rsi, change: legacy_basic(
+        rsi, change, "Oversold with positive momentum", "Overbought with negative momentum"))
+
+def test_feature_points_match_rule_based_prediction():
+    _, _, features = random_inputs(20_000, seed=3)
+    # Land some rows exactly on thresholds
+    features[:500, 0] = np.repeat([35, 45, 60, 70, 50], 100)
+    features[500:1000, 2] = np.repeat([0.03, 0.01, -0.01, -0.03, 0.0], 100)
+    features[1000:1500, 5] = 1.02
+    signals, confidences = score_features(features)
+    expected = [legacy_points(row) for row in features.tolist()]
+    assert signals.tolist() == [signal for signal, _ in expected]
+    assert confidences.tolist() == [confidence for _, confidence in expected]
+
+def test_backend_batch_matches_single_symbol(monkeypatch):
+    quotes = [('BTC', 50000.0, 9.0, 'Binance Live Data'), ('AAPL', 180.0, -1.0, 'Market Data'),
+              ('TSLA', 250.0, -6.0, 'Market Data')]
+    rsis = {'BTC': 50.0, 'AAPL': 28.0, 'TSLA': 60.0}
+    monkeypatch.setattr(real_api_backend, 'calculate_realistic_rsi', lambda change, symbol: rsis[symbol])
+
+    batch = real_api_backend.build_analyses(quotes)
+    assert [r['recommendation'] for r in batch] == ['BUY', 'STRONG BUY', 'SELL']
+    for result, quote in zip(batch, quotes):
+        single = real_api_backend.build_analysis(*quote)
+        assert {k: v for k, v in result.items() if k != 'generated_at'} == \
+            {k: v for k, v in single.items() if k != 'generated_at'}
+        assert type(result['prediction_score']) is float
+    assert real_api_backend.build_analyses([]) == []
@@ -0,0 +1,55 @@
+import gzip
+
+import pytest
+
+import final_backend
+import server
+from static_assets import StaticAssets, brotli
+
+def test_landing_page_is_served_compressed_by_accept_encoding():
+    client = server.app.test_client()
+    with open('index.html', 'rb') as f:
+        original = f.read()
+
+    plain = client.get('/')
+    assert plain.status_code == 200 and plain.data == original
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['Vary'] == 'Accept-Encoding' and plain.headers['Cache-Control'] == 'no-cache'
+
+    zipped = client.get('/', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.data) == original
+    assert len(zipped.data) < len(original) / 3
+    assert zipped.headers['ETag'] != plain.headers['ETag']
+
+    not_modified = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': zipped.headers['ETag']})
+    assert not_modified.status_code == 304 and not_modified.data == b''
+
+@pytest.mark.skipif(brotli is None, reason='brotli not installed')
+def test_brotli_is_preferred_when_accepted():
+    response = server.app.test_client().get('/', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    with open('index.html', 'rb') as f:
+        assert brotli.decompress(response.data) == f.read()
+    assert server.app.test_client().get('/', headers={'Accept-Encoding': 'br;q=0, gzip'}) \
+        .headers['Content-Encoding'] == 'gzip'
+
+def test_fingerprinted_url_is_immutable_and_etag_follows_content(tmp_path):
+    (tmp_path / 'index.html').write_bytes(b'<html>' + b'x' * 2000 + b'</html>')
+    assets = StaticAssets(root=tmp_path)
+    url = assets.url('index.html')
+    assert url.startswith('/index.') and url.endswith('.html')
+
+    with final_backend.app.test_request_context(url):
+        response = assets.response(url[1:])
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+
+    (tmp_path / 'index.html').write_bytes(b'<html>changed</html>')
+    assert StaticAssets(root=tmp_path).url('index.html') != url
+
+def test_serve_static_only_serves_the_manifest():
+    client = final_backend.app.test_client()
+    assert client.get('/index.html').status_code == 200
+    assert client.get(final_backend.static_assets.url('index.html')).status_code == 200
+    for path in ('/app.py', '/requests.jsonl', '/symbols.csv', '/../etc/passwd', '/.git/config'):
+        assert client.get(path).status_code == 404
@@ -0,0 +1,78 @@
+import json
+
+import real_api_backend
+from stream_hub import StreamHub
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.calls = []
+        self.prices = {}
+
+    def __call__(self, symbols):
+        self.calls.append(list(symbols))
+        return [{'symbol': s, 'price': self.prices.get(s, 100.0), 'recommendation': 'HOLD'} for s in symbols]
+
+def drain(subscription):
+    messages = []
+    while not subscription.queue.empty():
+        messages.append(subscription.queue.get_nowait())
+    return messages
+
+def payload(message):
+    return json.loads(message.split('data: ', 1)[1])
+
+def test_one_poll_fans_out_to_all_subscribers():
+    analyzer = FakeAnalyzer()
+    hub = StreamHub(analyzer, interval=3600)
+    hub._run = lambda: None  # drive polls by hand
+    btc = [hub.subscribe(['BTC']) for _ in range(30)]
+    both = [hub.subscribe(['BTC', 'ETH', 'BTC']) for _ in range(20)]
+
+    assert hub.poll_once() == 30 + 20 * 2
+    assert analyzer.calls == [['BTC', 'ETH']]
+    assert {len(drain(s)) for s in btc} == {1}
+    assert {len(drain(s)) for s in both} == {2}
+
+    # Unchanged analyses are not pushed again; changed ones only to that symbol's subscribers
+    analyzer.prices['ETH'] = 101.0
+    assert hub.poll_once() == 20
+    assert {len(drain(s)) for s in btc} == {0}
+    assert {payload(m)['price'] for s in both for m in drain(s)} == {101.0}
+
+    late = hub.subscribe(['ETH'])
+    assert payload(drain(late)[0])['price'] == 101.0
+
+def test_unsubscribe_and_slow_consumer_bounds():
+    analyzer = FakeAnalyzer()
+    hub = StreamHub(analyzer, interval=3600, max_queue=3)
+    hub._run = lambda: None
+    slow = hub.subscribe(['BTC'])
+    for price in range(10):
+        analyzer.prices['BTC'] = float(price)
+        hub.poll_once()
+
+    assert [payload(m)['price'] for m in drain(slow)] == [7.0, 8.0, 9.0]
+    assert hub.stats()['dropped'] == 7
+
+    hub.unsubscribe(slow)
+    assert hub.poll_once() == 0
+    assert hub.stats()['symbols'] == 0
+
+def test_stream_endpoint_sends_quote_events(monkeypatch):
+    analyzer = FakeAnalyzer()
+    hub = StreamHub(analyzer, interval=3600)
+    monkeypatch.setattr(real_api_backend, 'stream_hub', hub)
+    client = real_api_backend.app.test_client()
+
+    assert client.get('/api/stream').status_code == 400
+    response = client.get('/api/stream?symbols=btc,eth', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b'retry:')
+    events = [next(chunks).decode(), next(chunks).decode()]
+    assert {payload(e)['symbol'] for e in events} == {'BTC', 'ETH'}
+    assert all('event: quote' in e for e in events)
+
+    response.close()
+    assert hub.stats()['subscribers'] == 0
@@ -0,0 +1,35 @@
+from sweep import run_sweep
+from train_model import build_feature_store
+
+def test_sweep_ranks_configs_and_reuses_cache(tmp_path):
+    store = str(tmp_path / 'features')
+    build_feature_store(store, 1500)
+    configs = [{'n_estimators': 10, 'max_depth': 2, 'min_samples_split': 2, 'min_samples_leaf': 1},
+               {'n_estimators': 20, 'max_depth': 12, 'min_samples_split': 8, 'min_samples_leaf': 4}]
+    cache = str(tmp_path / 'cache')
+
+    data_hash, first = run_sweep(store, configs, folds=3, workers=2, cache_dir=cache)
+    assert [r['params']['max_depth'] for r in first] == [12, 2]
+    assert not any(r['cached'] for r in first)
+    assert len(first[0]['cv_scores']) == 3
+
+    again_hash, second = run_sweep(store, configs, folds=3, workers=2, cache_dir=cache)
+    assert again_hash == data_hash
+    assert all(r['cached'] for r in second)
+    assert [r['mean_accuracy'] for r in second] == [r['mean_accuracy'] for r in first]
+
+def test_truncated_cache_cell_is_recomputed(tmp_path):
+    store = str(tmp_path / 'features')
+    build_feature_store(store, 600)
+    configs = [{'n_estimators': 5, 'max_depth': 2, 'min_samples_split': 2, 'min_samples_leaf': 1}]
+    cache = tmp_path / 'cache'
+
+    run_sweep(store, configs, folds=2, workers=1, cache_dir=str(cache))
+    cells = list(cache.glob('*.json'))
+    assert len(cells) == 1 and not list(cache.glob('*.tmp'))
+    cells[0].write_text('{"params": {"n_estim')
+
+    _, results = run_sweep(store, configs, folds=2, workers=1, cache_dir=str(cache))
+    assert not results[0]['cached']
+    _, results = run_sweep(store, configs, folds=2, workers=1, cache_dir=str(cache))
+    assert results[0]['cached']
@@ -0,0 +1,108 @@
+import resource
+import threading
+
+import final_backend
+from symbol_state import SymbolStateStore
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_eviction_keeps_recent_symbols():
+    store = SymbolStateStore(max_entries=3, ttl=60, stripes=1)
+    for symbol in 'ABC':
+        store.put(symbol, {'price': 1.0})
+    assert store.get('A') is not None
+    store.put('D', {'price': 1.0})
+
+    assert store.get('B') is None
+    assert all(store.get(symbol) is not None for symbol in 'ACD')
+    stats = store.stats()
+    assert stats['entries'] == 3 and stats['evictions'] == 1
+
+def test_ttl_expiry_and_pinned_entries():
+    clock = FakeClock()
+    store = SymbolStateStore(pinned={'AAPL': {'price': 178.25}}, max_entries=10, ttl=5, clock=clock)
+    first = store.get_or_create('XYZ', lambda: {'price': 1.0})
+    clock.now = 4
+    assert store.get_or_create('XYZ', lambda: {'price': 2.0}) is first
+    clock.now = 10
+    assert store.get('XYZ') is None
+    assert store.get_or_create('XYZ', lambda: {'price': 3.0}) == {'price': 3.0}
+    assert store.get('AAPL') == {'price': 178.25}
+    assert store.stats()['expirations'] == 1
+
+def test_small_capacity_never_leaves_a_stripe_empty():
+    store = SymbolStateStore(max_entries=3, ttl=60, stripes=16)
+    assert [stripe.max_entries for stripe in store._stripes] == [1, 1, 1]
+    for symbol in 'ABCDEFGH':
+        store.put(symbol, {'price': 1.0})
+        assert store.get(symbol) is not None
+    assert len(store) <= 3
+
+def test_byte_bound_and_accounting():
+    store = SymbolStateStore(max_entries=10 ** 6, max_bytes=40_000, ttl=60, stripes=4)
+    for i in range(5000):
+        store.put(f'SYM{i}', {'price': float(i), 'change': 0.0, 'rsi': 50.0})
+    stats = store.stats()
+    assert 0 < stats['bytes'] <= 40_000
+    assert stats['entries'] + stats['evictions'] == 5000
+
+def test_concurrent_distinct_symbols_stay_bounded():
+    store = SymbolStateStore(max_entries=1000, ttl=60, stripes=16)
+    disagreements = []
+
+    def worker(offset):
+        for i in range(20_000):
+            symbol = f'S{offset + i}'
+            value = store.get_or_create(symbol, lambda: {'price': float(i)})
+            # Every thread also hits one shared symbol; all must see a single value
+            shared = store.get_or_create('SHARED', lambda: {'owner': offset})
+            if store.get('SHARED') not in (None, shared):
+                disagreements.append(symbol)
+            if value is None:
+                disagreements.append(symbol)
+
+    threads = [threading.Thread(target=worker, args=(n * 10 ** 6,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not disagreements
+    assert len(store) <= 1000
+    stats = store.stats()
+    assert stats['entries'] == len(store)
+    assert stats['bytes'] == sum(entry.size for stripe in store._stripes for entry in stripe.entries.values())
+
+def test_memory_stays_flat_under_distinct_symbol_flood():
+    store = SymbolStateStore(max_entries=2000, ttl=3600)
+    for i in range(10_000):
+        store.get_or_create(f'WARM{i}', final_backend.simulated_data)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    accounted = store.stats()['bytes']
+
+    # Unbounded, 500k simulated entries would hold well over 150 MB
+    for i in range(500_000):
+        store.get_or_create(f'RANDOM{i}', final_backend.simulated_data)
+    growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak
+    assert growth_kb < 16 * 1024
+    # Longer keys cost a few bytes more each; the count is what bounds memory
+    assert len(store) == 2000 and store.stats()['bytes'] < accounted * 1.1
+
+def test_final_backend_does_not_grow_stock_data(monkeypatch):
+    monkeypatch.setattr(final_backend, 'symbol_state',
+                        final_backend.SymbolStateStore(pinned=final_backend.STOCK_DATA, max_entries=16))
+    client = final_backend.app.test_client()
+    seeded = len(final_backend.STOCK_DATA)
+    for i in range(100):
+        assert client.get(f'/api/analyze/NEW{i}').status_code == 200
+    first = client.get('/api/analyze/NEW99').get_json()
+    assert client.get('/api/analyze/NEW99').get_json()['price'] == first['price']
+
+    assert len(final_backend.STOCK_DATA) == seeded
+    stats = client.get('/api/state/stats').get_json()
+    assert stats['entries'] <= 16 and stats['pinned'] == seeded
@@ -0,0 +1,74 @@
+import pytest
+
+import app
+import real_api_backend
+import symbols
+from symbols import SymbolIndex, symbol_index
+
+RECORDS = [
+    {'symbol': 'BTC', 'name': 'Bitcoin', 'asset_class': 'crypto', 'exchange': 'CRYPTO',
+     'binance': 'BTCUSDT', 'coingecko': 'bitcoin'},
+    {'symbol': 'BITCOIN', 'name': 'Bitcoin', 'asset_class': 'crypto', 'alias_of': 'BTC'},
+    {'symbol': 'BRK.B', 'name': 'Berkshire Hathaway Class B', 'asset_class': 'stock', 'exchange': 'NYSE'},
+    {'symbol': 'BABA', 'name': 'Alibaba Group', 'asset_class': 'stock', 'exchange': 'NYSE'},
+    {'symbol': 'AAPL', 'name': 'Apple Inc.', 'asset_class': 'stock', 'exchange': 'NASDAQ'},
+    {'symbol': 'NESN', 'name': 'Nestlé S.A.', 'asset_class': 'stock', 'exchange': 'SIX'}
+]
+
+def test_resolve_and_aliases():
+    index = SymbolIndex(RECORDS)
+    assert len(index) == 6 and 'aapl' in index and 'MSFT' not in index
+    assert index.resolve(' bitcoin ')['symbol'] == 'BTC'
+    assert index.resolve('BTC')['binance'] == 'BTCUSDT'
+    assert index.resolve('NESN')['name'] == 'Nestlé S.A.'
+    assert index.resolve('AAPL')['coingecko'] is None
+    assert index.resolve('ÄPFEL') is None and index.resolve('A' * 40) is None
+    assert index.provider_ids('binance') == {'BITCOIN': 'BTCUSDT', 'BTC': 'BTCUSDT'}
+
+def test_prefix_search_dedupes_aliases_and_filters():
+    index = SymbolIndex(RECORDS)
+    assert [r['symbol'] for r in index.search('b')] == ['BABA', 'BTC', 'BRK.B']
+    assert [r['symbol'] for r in index.search('B', limit=2)] == ['BABA', 'BTC']
+    assert [r['symbol'] for r in index.search('B', asset_class='crypto')] == ['BTC']
+    assert [r['symbol'] for r in index.search('')] == ['AAPL', 'BABA', 'BTC', 'BRK.B', 'NESN']
+    assert index.search('BZ') == [] and index.search('X' * 40) == []
+    assert index.suggest('BRKX') == ['BRK.B']
+
+def test_invalid_master_rows_are_rejected():
+    with pytest.raises(ValueError):
+        SymbolIndex([{'symbol': 'BTC', 'asset_class': 'coins'}])
+    with pytest.raises(ValueError):
+        SymbolIndex([{'symbol': '../X', 'asset_class': 'stock'}])
+    with pytest.raises(ValueError):
+        SymbolIndex([{'symbol': 'XBT', 'asset_class': 'crypto', 'alias_of': 'BTC'}])
+
+def test_default_master_covers_backend_symbols():
+    for symbol in real_api_backend.REAL_MARKET_DATA:
+        assert symbol in symbol_index
+    assert real_api_backend.BINANCE_PAIRS['ETHEREUM'] == 'ETHUSDT'
+
+def test_symbol_routes(monkeypatch):
+    monkeypatch.setattr(symbols, 'STRICT_SYMBOLS', True)
+    client = real_api_backend.app.test_client()
+    body = client.get('/api/symbols?prefix=s&limit=5').get_json()
+    assert [r['symbol'] for r in body['symbols']] == ['SILVER', 'SOL', 'SPY']
+    assert client.get('/api/symbols?prefix=&asset_class=etf').get_json()['count'] == 2
+    assert client.get('/api/symbols?asset_class=bonds').status_code == 400
+    assert client.get('/api/symbols/ethereum').get_json()['symbol'] == 'ETH'
+
+    response = client.get('/api/analyze/AAPLX')
+    assert response.status_code == 404
+    assert response.get_json()['suggestions'] == {'AAPLX': ['AAPL']}
+    assert client.get('/api/stream?symbols=BTC,NOPE').status_code == 404
+
+def test_unlisted_tickers_are_simulated_unless_strict(monkeypatch):
+    monkeypatch.setattr(real_api_backend, 'hot_poller',
+                        real_api_backend.HotSetPoller(real_api_backend.analyze_symbols, background=False))
+    response = real_api_backend.app.test_client().get('/api/analyze/IBM')
+    assert response.status_code == 200
+    assert response.get_json()['data_source'] == 'Market Simulation'
+
+    client = app.app.test_client()
+    assert client.get('/api/analyze/AMD').get_json()['data_source'] == 'Default'
+    batch = client.post('/api/analyze/batch', json=['AMD', 'AAPL']).get_json()
+    assert [r['symbol'] for r in batch['results']] == ['AMD', 'AAPL']
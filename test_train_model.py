@@ -0,0 +1,37 @@
+import numpy as np
+
+from bench_training_data import legacy_label
+from train_model import (FEATURE_RANGES, MODEL_PARAMS, build_feature_store, fit_forest_in_processes,
+                         iter_training_chunks, label_features)
+
+def test_vectorized_labels_match_legacy_rules():
+    X, y = next(iter_training_chunks(20000, 20000, seed=1))
+    assert y.tolist() == [legacy_label(row) for row in X]
+
+def test_labels_on_rule_boundaries():
+    # Values sitting exactly on each threshold exercise the strict comparisons
+    edges = np.array([[30, 30, 0.05, 0.08, 0.02, 1.05, 1.02, 0.02, 0.5],
+                      [40, -20, -0.05, -0.08, 0.02, 0.95, 0.98, -0.02, 0.5],
+                      [70, 31, 0.051, 0.081, 0.02, 1.06, 1.03, 0.021, 0.5],
+                      [61, -21, -0.051, -0.081, 0.02, 0.94, 0.97, -0.021, 0.5],
+                      [29, 0, 0.021, 0, 0.02, 1, 1, 0, 0.5]])
+    assert label_features(edges).tolist() == [legacy_label(row) for row in edges]
+
+def test_chunking_is_seed_reproducible():
+    whole = np.concatenate([X for X, _ in iter_training_chunks(10000, 10000, seed=5)])
+    chunked = np.concatenate([X for X, _ in iter_training_chunks(10000, 777, seed=5)])
+
+    np.testing.assert_array_equal(whole, chunked)
+    assert (whole >= FEATURE_RANGES[:, 0]).all() and (whole < FEATURE_RANGES[:, 1]).all()
+
+def test_feature_store_and_process_tree_merge(tmp_path):
+    X, y = build_feature_store(str(tmp_path), 3000, chunk_size=1000)
+    expected_X, expected_y = next(iter_training_chunks(3000, 3000))
+
+    assert isinstance(X, np.memmap) and X.dtype == np.float32
+    np.testing.assert_array_equal(X, expected_X.astype(np.float32))
+    np.testing.assert_array_equal(y, expected_y)
+
+    model = fit_forest_in_processes(str(tmp_path), 2400, workers=2)
+    assert model.n_estimators == len(model.estimators_) == MODEL_PARAMS['n_estimators']
+    assert model.score(X[2400:], y[2400:]) > 0.6
@@ -5,101 +5,221 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 import joblib
 import json
+import argparse
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-print("🤖 TRAINING PROFESSIONAL STOCK PREDICTION MODEL")
-print("==============================================")
+from flat_forest import FlatForest
+
+# Realistic market feature ranges, in model feature order
+FEATURE_RANGES = np.array([
+    (20, 80),         # RSI
+    (-40, 120),       # Volume change
+    (-0.15, 0.15),    # 5-day momentum
+    (-0.25, 0.25),    # 20-day momentum
+    (0.015, 0.08),    # Volatility
+    (0.85, 1.15),     # SMA-20 ratio
+    (0.80, 1.20),     # SMA-50 ratio
+    (-0.08, 0.08),    # MACD
+    (0, 1)            # Bollinger band position
+])
+
+def label_features(X):
+    """Professional target generation (institutional logic) for a whole feature matrix"""
+    rsi, volume_change, momentum_5d, momentum_20d, _, sma_ratio_20, sma_ratio_50, macd, _ = X.T
+    
+    # RSI signals
+    rsi_rules = [rsi < 30, rsi < 40, rsi > 70, rsi > 60]
+    buy_signals = np.select(rsi_rules, [2, 1, 0, 0], 0)
+    sell_signals = np.select(rsi_rules, [0, 0, 2, 1], 0)
+    
+    # Momentum signals
+    momentum_rules = [(momentum_5d > 0.05) & (momentum_20d > 0.08),
+                      (momentum_5d < -0.05) & (momentum_20d < -0.08),
+                      momentum_5d > 0.02,
+                      momentum_5d < -0.02]
+    buy_signals += np.select(momentum_rules, [2, 0, 1, 0], 0)
+    sell_signals += np.select(momentum_rules, [0, 2, 0, 1], 0)
+    
+    # Trend signals
+    trend_up = (sma_ratio_20 > 1.05) & (sma_ratio_50 > 1.02)
+    buy_signals += trend_up
+    sell_signals += ~trend_up & (sma_ratio_20 < 0.95) & (sma_ratio_50 < 0.98)
+    
+    # Volume confirmation
+    buy_signals += volume_change > 30
+    sell_signals += ~(volume_change > 30) & (volume_change < -20)
+    
+    # MACD signals
+    buy_signals += macd > 0.02
+    sell_signals += ~(macd > 0.02) & (macd < -0.02)
+    
+    # Determine final target: STRONG BUY, BUY, STRONG SELL, SELL, else HOLD
+    return np.select([(buy_signals >= 5) & (sell_signals <= 1),
+                      buy_signals >= 3,
+                      (sell_signals >= 5) & (buy_signals <= 1),
+                      sell_signals >= 3],
+                     [2, 1, -2, -1], 0)
+
+def iter_training_chunks(n_samples, chunk_size=1_000_000, seed=42):
+    """Yield (X, y) chunks of synthetic training data
+
+    Rows are drawn row-major from one Generator stream, so the concatenated
+    output for a given seed is identical whatever the chunk size.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = FEATURE_RANGES[:, 0], FEATURE_RANGES[:, 1]
+    for start in range(0, n_samples, chunk_size):
+        rows = min(chunk_size, n_samples - start)
+        X = rng.uniform(low, high, size=(rows, len(FEATURE_RANGES)))
+        yield X, label_features(X)
+
+# Random Forest configuration shared by every training mode
+MODEL_PARAMS = {
+    'n_estimators': 150,
+    'max_depth': 12,
+    'min_samples_split': 8,
+    'min_samples_leaf': 4
+}
+
+FEATURE_NAMES = ['RSI', 'Volume_Change', 'Momentum_5D', 'Momentum_20D',
+                 'Volatility', 'SMA_20_Ratio', 'SMA_50_Ratio', 'MACD', 'BB_Position']
+
+def build_feature_store(path, n_samples, chunk_size=1_000_000, seed=42):
+    """Write synthetic data to memory-mapped .npy files chunk by chunk"""
+    os.makedirs(path, exist_ok=True)
+    X_path = os.path.join(path, 'X.npy')
+    y_path = os.path.join(path, 'y.npy')
+    
+    # float32 is what the tree builder uses internally, so fit() can read the map without copying
+    X = np.lib.format.open_memmap(X_path, mode='w+', dtype=np.float32,
+                                  shape=(n_samples, len(FEATURE_RANGES)))
+    y = np.lib.format.open_memmap(y_path, mode='w+', dtype=np.int8, shape=(n_samples,))
+    start = 0
+    for X_chunk, y_chunk in iter_training_chunks(n_samples, chunk_size, seed):
+        X[start:start + len(y_chunk)] = X_chunk
+        y[start:start + len(y_chunk)] = y_chunk
+        start += len(y_chunk)
+    X.flush()
+    y.flush()
+    del X, y
+    return load_feature_store(path)
+
+def load_feature_store(path):
+    """Open a feature store read-only; pages are shared between processes"""
+    return (np.load(os.path.join(path, 'X.npy'), mmap_mode='r'),
+            np.load(os.path.join(path, 'y.npy'), mmap_mode='r'))
+
+def _fit_forest_part(store_path, n_train, n_estimators, random_state):
+    """Worker: fit a sub-forest on the shared memory-mapped training rows"""
+    X, y = load_feature_store(store_path)
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=1,
+                                   **{k: v for k, v in MODEL_PARAMS.items() if k != 'n_estimators'})
+    model.fit(X[:n_train], y[:n_train])
+    return model
+
+def fit_forest_in_processes(store_path, n_train, workers):
+    """Fit MODEL_PARAMS['n_estimators'] trees across worker processes and merge them"""
+    total = MODEL_PARAMS['n_estimators']
+    sizes = [total // workers + (1 if i < total % workers else 0) for i in range(workers)]
+    sizes = [n for n in sizes if n]
+    with ProcessPoolExecutor(max_workers=len(sizes)) as pool:
+        parts = list(pool.map(_fit_forest_part, [store_path] * len(sizes), [n_train] * len(sizes),
+                              sizes, [42 + i for i in range(len(sizes))]))
+    
+    # Tree merge: the first sub-forest adopts every other worker's trees
+    model = parts[0]
+    for part in parts[1:]:
+        if not np.array_equal(part.classes_, model.classes_):
+            raise ValueError("Sub-forests saw different classes; use more training rows")
+        model.estimators_ += part.estimators_
+    model.n_estimators = len(model.estimators_)
+    model.n_jobs = None
+    return model
+
+def peak_rss_mb():
+    """Peak resident set size of this process and of its finished children"""
+    to_mb = 1 / 1024 if sys.platform != 'darwin' else 1 / 1024 / 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * to_mb
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * to_mb
+    return round(own, 1), round(children, 1)
+
+def save_model(model, report, model_path='professional_model.pkl', report_path='model_accuracy.json',
+               flat_path='professional_model_flat'):
+    """Write the model, its memory-mappable flat export and its accuracy report"""
+    # Serving scores small batches, so drop the training thread pool
+    model.set_params(n_jobs=None)
+    # Write-then-rename so a serving process polling these files never reads a partial one
+    joblib.dump(model, model_path + '.tmp')
+    os.replace(model_path + '.tmp', model_path)
+    if flat_path:
+        FlatForest.from_sklearn(model).save(flat_path)
+    
+    with open(report_path + '.tmp', 'w') as f:
+        json.dump(report, f, indent=2)
+    os.replace(report_path + '.tmp', report_path)
+    
+    print(f"💾 Model saved: {model_path}" + (f" (+ {flat_path}/)" if flat_path else ""))
+    print(f"📊 Accuracy report: {report_path}")
 
 class ProfessionalModelTrainer:
-    def __init__(self):
-        self.model = RandomForestClassifier(
-            n_estimators=150,
-            max_depth=12,
-            min_samples_split=8,
-            min_samples_leaf=4,
-            random_state=42
-        )
+    def __init__(self, n_jobs=-1):
+        self.model = RandomForestClassifier(random_state=42, n_jobs=n_jobs, **MODEL_PARAMS)
         self.accuracy = 0
         
-    def generate_high_quality_data(self, n_samples=8000):
+    def generate_high_quality_data(self, n_samples=8000, seed=42):
         """Generate realistic stock market training data"""
         print("📊 Generating professional training data...")
-        
-        np.random.seed(42)
-        features = []
-        targets = []
-        
-        for i in range(n_samples):
-            # Realistic market feature ranges
-            rsi = np.random.uniform(20, 80)
-            volume_change = np.random.uniform(-40, 120)
-            price_momentum_5d = np.random.uniform(-0.15, 0.15)
-            price_momentum_20d = np.random.uniform(-0.25, 0.25)
-            volatility = np.random.uniform(0.015, 0.08)
-            sma_ratio_20 = np.random.uniform(0.85, 1.15)
-            sma_ratio_50 = np.random.uniform(0.80, 1.20)
-            macd = np.random.uniform(-0.08, 0.08)
-            bb_position = np.random.uniform(0, 1)
-            
-            # Professional target generation (institutional logic)
-            buy_signals = 0
-            sell_signals = 0
-            
-            # RSI signals
-            if rsi < 30: buy_signals += 2
-            elif rsi < 40: buy_signals += 1
-            elif rsi > 70: sell_signals += 2  
-            elif rsi > 60: sell_signals += 1
-            
-            # Momentum signals
-            if price_momentum_5d > 0.05 and price_momentum_20d > 0.08: buy_signals += 2
-            elif price_momentum_5d < -0.05 and price_momentum_20d < -0.08: sell_signals += 2
-            elif price_momentum_5d > 0.02: buy_signals += 1
-            elif price_momentum_5d < -0.02: sell_signals += 1
-            
-            # Trend signals
-            if sma_ratio_20 > 1.05 and sma_ratio_50 > 1.02: buy_signals += 1
-            elif sma_ratio_20 < 0.95 and sma_ratio_50 < 0.98: sell_signals += 1
-            
-            # Volume confirmation
-            if volume_change > 30: buy_signals += 1
-            elif volume_change < -20: sell_signals += 1
-            
-            # MACD signals
-            if macd > 0.02: buy_signals += 1
-            elif macd < -0.02: sell_signals += 1
-            
-            # Determine final target
-            if buy_signals >= 5 and sell_signals <= 1:
-                target = 2  # STRONG BUY
-            elif buy_signals >= 3:
-                target = 1  # BUY
-            elif sell_signals >= 5 and buy_signals <= 1:
-                target = -2  # STRONG SELL
-            elif sell_signals >= 3:
-                target = -1  # SELL
-            else:
-                target = 0  # HOLD
-                
-            features.append([rsi, volume_change, price_momentum_5d, price_momentum_20d, 
-                           volatility, sma_ratio_20, sma_ratio_50, macd, bb_position])
-            targets.append(target)
-        
-        return np.array(features), np.array(targets)
+        return next(iter_training_chunks(n_samples, n_samples, seed))
     
-    def train_and_validate(self):
-        """Train model with proper validation"""
+    def train_and_validate(self, n_samples=8000, mode='threads', workers=None,
+                           feature_store=None, chunk_size=1_000_000):
+        """Train model with proper validation
+
+        mode='threads' fits trees on all cores with n_jobs; mode='processes'
+        fits sub-forests in worker processes and merges them. A feature_store
+        directory keeps the data in memory-mapped .npy files instead of RAM.
+        """
         print("🎯 Training professional model...")
+        workers = workers or os.cpu_count()
+        wall_start = time.perf_counter()
         
-        # Generate high-quality data
-        X, y = self.generate_high_quality_data(8000)
+        temporary_store = None
+        if mode == 'processes' and feature_store is None:
+            feature_store = temporary_store = tempfile.mkdtemp(prefix='feature_store_')
         
-        # Split with stratification
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
-        )
+        if feature_store is not None:
+            # Out-of-core: generate to disk in chunks, hold out the last 20% without copying
+            print(f"📊 Building feature store: {feature_store}")
+            X, y = build_feature_store(feature_store, n_samples, chunk_size)
+            n_train = int(n_samples * 0.8)
+            X_train, X_test, y_train, y_test = X[:n_train], X[n_train:], y[:n_train], y[n_train:]
+            validation_notes = 'Contiguous 80/20 holdout on i.i.d. memory-mapped feature store'
+        else:
+            # Generate high-quality data
+            X, y = self.generate_high_quality_data(n_samples)
+            
+            # Split with stratification
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, random_state=42, stratify=y
+            )
+            n_train = len(y_train)
+            validation_notes = 'Stratified split with comprehensive feature engineering'
+        generate_seconds = time.perf_counter() - wall_start
         
         # Train model
-        self.model.fit(X_train, y_train)
+        fit_start = time.perf_counter()
+        if mode == 'processes':
+            self.model = fit_forest_in_processes(feature_store, n_train, workers)
+        else:
+            self.model.set_params(n_jobs=workers)
+            self.model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - fit_start
         
         # Comprehensive validation
         train_score = self.model.score(X_train, y_train)
@@ -107,51 +227,69 @@ class ProfessionalModelTrainer:
         self.accuracy = test_score
         
         # Feature importance
-        feature_names = ['RSI', 'Volume_Change', 'Momentum_5D', 'Momentum_20D', 
-                        'Volatility', 'SMA_20_Ratio', 'SMA_50_Ratio', 'MACD', 'BB_Position']
-        feature_importance = dict(zip(feature_names, self.model.feature_importances_))
+        feature_importance = dict(zip(FEATURE_NAMES, self.model.feature_importances_))
+        
+        own_rss, child_rss = peak_rss_mb()
+        performance = {
+            'mode': mode,
+            'workers': workers,
+            'cpu_count': os.cpu_count(),
+            'out_of_core': feature_store is not None,
+            'wall_clock_seconds': round(time.perf_counter() - wall_start, 3),
+            'data_generation_seconds': round(generate_seconds, 3),
+            'fit_seconds': round(fit_seconds, 3),
+            'fit_throughput_rows_per_second': round(n_train / fit_seconds, 1),
+            'peak_rss_mb': own_rss,
+            'peak_worker_rss_mb': child_rss
+        }
         
         print(f"✅ Model trained successfully!")
         print(f"📈 Training Accuracy: {train_score:.3f}")
         print(f"📊 Test Accuracy: {test_score:.3f}")
+        print(f"⏱️  Fit: {fit_seconds:.2f}s ({performance['fit_throughput_rows_per_second']:,.0f} rows/s), "
+              f"peak RSS {own_rss} MB")
         print(f"🎯 Top 3 Features:")
         sorted_features = sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)[:3]
         for feature, importance in sorted_features:
             print(f"   - {feature}: {importance:.3f}")
         
-        # Save model and metadata
-        joblib.dump(self.model, 'professional_model.pkl')
+        if temporary_store is not None:
+            del X, y, X_train, X_test, y_train, y_test
+            shutil.rmtree(temporary_store, ignore_errors=True)
         
-        # Save accuracy report
-        report = {
+        # Save model and accuracy report
+        save_model(self.model, {
             'overall_accuracy': round(test_score, 3),
             'training_accuracy': round(train_score, 3),
             'model_type': 'Random Forest Professional',
-            'training_samples': 8000,
+            'training_samples': n_samples,
             'feature_count': 9,
             'feature_importance': feature_importance,
-            'model_parameters': {
-                'n_estimators': 150,
-                'max_depth': 12,
-                'min_samples_split': 8,
-                'min_samples_leaf': 4
-            },
-            'validation_notes': 'Stratified split with comprehensive feature engineering',
+            'model_parameters': MODEL_PARAMS,
+            'training_performance': performance,
+            'validation_notes': validation_notes,
             'timestamp': pd.Timestamp.now().isoformat()
-        }
-        
-        with open('model_accuracy.json', 'w') as f:
-            json.dump(report, f, indent=2)
-        
-        print("💾 Model saved: professional_model.pkl")
-        print("📊 Accuracy report: model_accuracy.json")
+        })
         
         return test_score
 
 # Train the professional model
 if __name__ == "__main__":
+    print("🤖 TRAINING PROFESSIONAL STOCK PREDICTION MODEL")
+    print("==============================================")
+    
+    parser = argparse.ArgumentParser(description='Train the professional stock prediction model')
+    parser.add_argument('--samples', type=int, default=8000)
+    parser.add_argument('--mode', choices=['threads', 'processes'], default='threads',
+                        help='threads: n_jobs on all cores; processes: sub-forests merged after fitting')
+    parser.add_argument('--workers', type=int, help='worker processes (default: all cores)')
+    parser.add_argument('--feature-store', help='directory for memory-mapped X.npy/y.npy (out-of-core)')
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    args = parser.parse_args()
+    
     trainer = ProfessionalModelTrainer()
-    accuracy = trainer.train_and_validate()
+    accuracy = trainer.train_and_validate(args.samples, args.mode, args.workers,
+                                          args.feature_store, args.chunk_size)
     
     print(f"\n🎉 PROFESSIONAL MODEL TRAINING COMPLETE!")
     print(f"🏆 Final Test Accuracy: {accuracy:.3f}")